@@ -0,0 +1,430 @@
+
+"""Benchmarks the construction and export pipelines of the parametric
+reactors. Each reactor is built at several sizes (sector angle and number of
+toroidal field coils) and every stage (build, volume, export_stp, export_stl,
+export_h5m and export_2d_image) is timed. The stl and h5m exports are repeated
+for each faceting tolerance.
+
+Results are saved as a JSON file together with metadata describing the
+machine that ran the benchmark. A previously saved results file can be passed
+as a baseline, in which case any stage that is slower than the baseline by
+more than the threshold ratio is reported as a regression and the script
+exits with a non zero status.
+
+Example usage:
+
+    python benchmarks/benchmark_reactors.py --output results.json
+
+    python benchmarks/benchmark_reactors.py --output new_results.json \
+        --baseline results.json --threshold 1.2
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import paramak
+
+
+def make_ball_reactor(rotation_angle: float, number_of_tf_coils: int):
+    return paramak.BallReactor(
+        inner_bore_radial_thickness=50,
+        inboard_tf_leg_radial_thickness=200,
+        center_column_shield_radial_thickness=50,
+        divertor_radial_thickness=100,
+        inner_plasma_gap_radial_thickness=150,
+        plasma_radial_thickness=100,
+        outer_plasma_gap_radial_thickness=50,
+        firstwall_radial_thickness=50,
+        blanket_radial_thickness=100,
+        blanket_rear_wall_radial_thickness=10,
+        elongation=2,
+        triangularity=0.55,
+        number_of_tf_coils=number_of_tf_coils,
+        rotation_angle=rotation_angle,
+        pf_coil_radial_thicknesses=[50, 50, 50, 50],
+        pf_coil_vertical_thicknesses=[50, 50, 50, 50],
+        pf_coil_radial_position=[200, 200, 200, 200],
+        pf_coil_vertical_position=[200, 100, -100, -200],
+        rear_blanket_to_tf_gap=50,
+        outboard_tf_coil_radial_thickness=100,
+        outboard_tf_coil_poloidal_thickness=50,
+    )
+
+
+def make_submersion_tokamak(rotation_angle: float, number_of_tf_coils: int):
+    return paramak.SubmersionTokamak(
+        inner_bore_radial_thickness=10,
+        inboard_tf_leg_radial_thickness=30,
+        center_column_shield_radial_thickness=60,
+        divertor_radial_thickness=50,
+        inner_plasma_gap_radial_thickness=30,
+        plasma_radial_thickness=300,
+        outer_plasma_gap_radial_thickness=30,
+        firstwall_radial_thickness=30,
+        blanket_rear_wall_radial_thickness=30,
+        number_of_tf_coils=number_of_tf_coils,
+        support_radial_thickness=20,
+        inboard_blanket_radial_thickness=20,
+        outboard_blanket_radial_thickness=20,
+        elongation=2.3,
+        triangularity=0.45,
+        rotation_angle=rotation_angle,
+    )
+
+
+def make_segmented_blanket_ball_reactor(
+        rotation_angle: float, number_of_tf_coils: int):
+    return paramak.SegmentedBlanketBallReactor(
+        inner_bore_radial_thickness=10,
+        inboard_tf_leg_radial_thickness=30,
+        center_column_shield_radial_thickness=60,
+        divertor_radial_thickness=150,
+        inner_plasma_gap_radial_thickness=30,
+        plasma_radial_thickness=300,
+        outer_plasma_gap_radial_thickness=30,
+        firstwall_radial_thickness=20,
+        blanket_radial_thickness=50,
+        blanket_rear_wall_radial_thickness=30,
+        elongation=2,
+        triangularity=0.55,
+        number_of_tf_coils=number_of_tf_coils,
+        rotation_angle=rotation_angle,
+        pf_coil_radial_thicknesses=[50, 50, 50, 50],
+        pf_coil_vertical_thicknesses=[50, 50, 50, 50],
+        pf_coil_radial_position=[200, 200, 200, 200],
+        pf_coil_vertical_position=[200, 100, -100, -200],
+        rear_blanket_to_tf_gap=50,
+        outboard_tf_coil_radial_thickness=100,
+        outboard_tf_coil_poloidal_thickness=50,
+        gap_between_blankets=30,
+        number_of_blanket_segments=4,
+    )
+
+
+def make_iter_reactor(rotation_angle: float, number_of_tf_coils: int):
+    return paramak.IterFrom2020PaperDiagram(
+        rotation_angle=rotation_angle,
+        number_of_tf_coils=number_of_tf_coils,
+    )
+
+
+def make_sparc_reactor(rotation_angle: float, number_of_tf_coils: int):
+    # the SPARC reactor has a fixed number of tf coils
+    return paramak.SparcFrom2020PaperDiagram(rotation_angle=rotation_angle)
+
+
+def make_eu_demo_reactor(rotation_angle: float, number_of_tf_coils: int):
+    return paramak.EuDemoFrom2015PaperDiagram(
+        rotation_angle=rotation_angle,
+        number_of_tf_coils=number_of_tf_coils,
+    )
+
+
+REACTORS = {
+    'BallReactor': make_ball_reactor,
+    'SubmersionTokamak': make_submersion_tokamak,
+    'SegmentedBlanketBallReactor': make_segmented_blanket_ball_reactor,
+    'IterFrom2020PaperDiagram': make_iter_reactor,
+    'SparcFrom2020PaperDiagram': make_sparc_reactor,
+    'EuDemoFrom2015PaperDiagram': make_eu_demo_reactor,
+}
+
+# (rotation_angle, number_of_tf_coils) pairs, from a small sector model up to
+# a full 360 degree reactor
+SIZES = {
+    'small': (90., 4),
+    'medium': (180., 8),
+    'large': (360., 16),
+}
+
+TOLERANCES = [1e-1, 1e-2]
+
+STAGES = [
+    'build',
+    'volume',
+    'export_stp',
+    'export_stl',
+    'export_h5m',
+    'export_2d_image',
+]
+
+
+def get_machine_metadata() -> dict:
+    """Collects information about the machine and software versions used to
+    run the benchmark so that results from different machines are not
+    compared by mistake.
+
+    Returns:
+        dictionary of metadata values
+    """
+
+    metadata = {
+        'date': datetime.datetime.now().isoformat(),
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python_version': platform.python_version(),
+    }
+
+    for package in ['cadquery', 'numpy', 'pymoab']:
+        try:
+            module = __import__(package)
+            metadata[package + '_version'] = getattr(
+                module, '__version__', 'unknown')
+        except ImportError:
+            metadata[package + '_version'] = None
+
+    try:
+        metadata['git_commit'] = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=str(Path(__file__).parent),
+            universal_newlines=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        metadata['git_commit'] = None
+
+    return metadata
+
+
+def pymoab_available() -> bool:
+    try:
+        import pymoab  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def time_function(function: Callable, repeats: int = 1) -> float:
+    """Calls the function the requested number of times and returns the
+    fastest duration in seconds"""
+
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def benchmark_reactor(
+        reactor_name: str,
+        size_name: str,
+        tolerances: List[float],
+        stages: List[str],
+        repeats: int = 1,
+) -> List[dict]:
+    """Builds a reactor and times each of the requested stages. The exports
+    are performed within a temporary directory which is removed afterwards.
+
+    Args:
+        reactor_name: the key of the reactor in the REACTORS dictionary.
+        size_name: the key of the size in the SIZES dictionary.
+        tolerances: the faceting tolerances to use for the stl and h5m
+            exports.
+        stages: the names of the stages to time.
+        repeats: the number of times to repeat each export stage, the fastest
+            time is recorded.
+
+    Returns:
+        a list of dictionaries, one for each timed stage
+    """
+
+    rotation_angle, number_of_tf_coils = SIZES[size_name]
+    make_reactor = REACTORS[reactor_name]
+
+    case = {
+        'reactor': reactor_name,
+        'size': size_name,
+        'rotation_angle': rotation_angle,
+        'number_of_tf_coils': number_of_tf_coils,
+    }
+
+    results = []
+
+    def record(stage, duration, tolerance=None, **extra):
+        entry = dict(case, stage=stage, tolerance=tolerance, time=duration)
+        entry.update(extra)
+        results.append(entry)
+        print('{:<30} {:<7} {:<16} {:<8} {}'.format(
+            reactor_name, size_name, stage, str(tolerance),
+            'skipped' if duration is None else '{:.3f}s'.format(duration)))
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as working_dir:
+        os.chdir(working_dir)
+        try:
+            reactor = make_reactor(rotation_angle, number_of_tf_coils)
+
+            # the first access of the solid builds every component, later
+            # stages reuse the cached solids
+            start = time.perf_counter()
+            reactor.solid
+            build_time = time.perf_counter() - start
+            if 'build' in stages:
+                record(
+                    'build',
+                    build_time,
+                    number_of_components=len(reactor.shapes_and_components))
+
+            if 'volume' in stages:
+                record('volume', time_function(
+                    lambda: [c.volume for c in reactor.shapes_and_components],
+                    repeats))
+
+            if 'export_stp' in stages:
+                record('export_stp', time_function(
+                    lambda: reactor.export_stp(output_folder='stp'),
+                    repeats))
+
+            for tolerance in tolerances:
+                if 'export_stl' in stages:
+                    record('export_stl', time_function(
+                        lambda: reactor.export_stl(
+                            output_folder='stl', tolerance=tolerance),
+                        repeats), tolerance=tolerance)
+
+                if 'export_h5m' in stages:
+                    if pymoab_available():
+                        record('export_h5m', time_function(
+                            lambda: reactor.export_h5m(
+                                filename='dagmc.h5m',
+                                method='pymoab',
+                                faceting_tolerance=tolerance),
+                            repeats), tolerance=tolerance)
+                    else:
+                        record('export_h5m', None, tolerance=tolerance)
+
+            if 'export_2d_image' in stages:
+                record('export_2d_image', time_function(
+                    lambda: reactor.export_2d_image(filename='reactor.png'),
+                    repeats))
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def result_key(result: dict) -> str:
+    """Creates a string that uniquely identifies a benchmark case and stage,
+    used to match results against a baseline"""
+
+    return '{reactor}|{size}|{stage}|{tolerance}'.format(**result)
+
+
+def compare_to_baseline(
+        results: List[dict],
+        baseline: List[dict],
+        threshold: float = 1.25,
+) -> List[dict]:
+    """Finds the stages that are slower than the baseline by more than the
+    threshold ratio.
+
+    Args:
+        results: the newly recorded results.
+        baseline: the results to compare against.
+        threshold: the allowed ratio between the new and baseline time.
+
+    Returns:
+        a list of dictionaries describing each regression
+    """
+
+    baseline_times = {
+        result_key(entry): entry['time'] for entry in baseline
+    }
+
+    regressions = []
+    for entry in results:
+        baseline_time = baseline_times.get(result_key(entry))
+        if baseline_time is None or entry['time'] is None:
+            continue
+        ratio = entry['time'] / max(baseline_time, 1e-9)
+        if ratio > threshold:
+            regressions.append({
+                'case': result_key(entry),
+                'baseline_time': baseline_time,
+                'time': entry['time'],
+                'ratio': ratio,
+            })
+
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--reactors', nargs='+', default=list(REACTORS.keys()),
+        choices=list(REACTORS.keys()))
+    parser.add_argument(
+        '--sizes', nargs='+', default=list(SIZES.keys()),
+        choices=list(SIZES.keys()))
+    parser.add_argument(
+        '--stages', nargs='+', default=STAGES, choices=STAGES)
+    parser.add_argument(
+        '--tolerances', nargs='+', type=float, default=TOLERANCES)
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument(
+        '--baseline', default=None,
+        help='a results file from a previous run to compare against')
+    parser.add_argument(
+        '--threshold', type=float, default=1.25,
+        help='the slow down ratio above which a stage is a regression')
+    options = parser.parse_args(args)
+
+    results = []
+    for reactor_name in options.reactors:
+        for size_name in options.sizes:
+            results += benchmark_reactor(
+                reactor_name=reactor_name,
+                size_name=size_name,
+                tolerances=options.tolerances,
+                stages=options.stages,
+                repeats=options.repeats,
+            )
+
+    output = {'metadata': get_machine_metadata(), 'results': results}
+
+    path_filename = Path(options.output)
+    path_filename.parents[0].mkdir(parents=True, exist_ok=True)
+    with open(path_filename, 'w') as outfile:
+        json.dump(output, outfile, indent=4)
+    print('saved benchmark results to', path_filename)
+
+    if options.baseline is None:
+        return 0
+
+    with open(options.baseline) as json_file:
+        baseline = json.load(json_file)
+
+    if baseline['metadata'].get('hostname') != output['metadata']['hostname']:
+        print('Warning: the baseline was recorded on a different machine',
+              baseline['metadata'].get('hostname'))
+
+    regressions = compare_to_baseline(
+        results, baseline['results'], options.threshold)
+
+    for regression in regressions:
+        print('regression {case} {baseline_time:.3f}s -> {time:.3f}s '
+              '({ratio:.2f}x)'.format(**regression))
+
+    if regressions:
+        return 1
+
+    print('no regressions found compared to', options.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,6 @@
 from .shape import Shape
 from .reactor import Reactor
-from .utils import define_moab_core_and_tags, add_stl_to_moab_core, export_vtk
+from .utils import define_moab_core_and_tags, add_stl_to_moab_core, export_vtk, export_vtm
 from .utils import rotate, extend, distance_between_two_points, diff_between_angles
 from .utils import EdgeLengthSelector, FaceAreaSelector
 
@@ -20,6 +20,7 @@ from .parametric_shapes.sweep_straight_shape import SweepStraightShape
 from .parametric_shapes.sweep_circle_shape import SweepCircleShape
 
 from .parametric_components.hexagon_pin import HexagonPin
+from .parametric_components.hexagon_pin_lattice import HexagonPinLattice
 
 from .parametric_components.tokamak_plasma import Plasma
 from .parametric_components.tokamak_plasma_from_points import PlasmaFromPoints
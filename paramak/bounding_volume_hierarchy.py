@@ -0,0 +1,280 @@
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def morton_codes(points: np.ndarray) -> np.ndarray:
+    """Finds the 30 bit Morton codes of 3D points, which interleave the bits
+    of the coordinates so that sorting points by their codes keeps nearby
+    points close together in the sorted order.
+
+    Args:
+        points: the 3D coordinates of the points with a shape of (N, 3).
+
+    Returns:
+        numpy array of the Morton codes with a shape of (N,)
+    """
+
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    lower, upper = points.min(axis=0), points.max(axis=0)
+    scale = np.where(upper > lower, upper - lower, 1.)
+    cells = np.clip(
+        ((points - lower) / scale * 1023).astype(np.int64), 0, 1023)
+
+    # spreads the 10 bits of each coordinate out to every third bit
+    cells = (cells | (cells << 16)) & 0x030000FF
+    cells = (cells | (cells << 8)) & 0x0300F00F
+    cells = (cells | (cells << 4)) & 0x030C30C3
+    cells = (cells | (cells << 2)) & 0x09249249
+
+    return (cells[:, 0] << 2) | (cells[:, 1] << 1) | cells[:, 2]
+
+
+class BoundingVolumeHierarchy:
+    """A bounding volume hierarchy (BVH) over a triangle mesh for casting
+    many rays at once with NumPy. The triangles are sorted along a Morton
+    curve and grouped into leaves of leaf_size triangles, which are the
+    bottom level of a complete binary tree of axis aligned bounding boxes.
+    Rays are traced through the tree one level at a time for all the rays
+    together, then the triangles of the leaves each ray reaches are tested
+    nearest leaf first so that leaves behind the first hit are skipped.
+
+    Args:
+        vertices: the coordinates of the vertices with a shape of (N, 3).
+        triangles: the vertex indices of the triangles with a shape of
+            (M, 3).
+        leaf_size: the number of triangles in each leaf of the hierarchy.
+            Defaults to 8.
+    """
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        triangles: np.ndarray,
+        leaf_size: Optional[int] = 8,
+    ):
+
+        self.vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self.leaf_size = leaf_size
+
+        self._build()
+
+    @property
+    def leaf_size(self):
+        return self._leaf_size
+
+    @leaf_size.setter
+    def leaf_size(self, value):
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(
+                "BoundingVolumeHierarchy.leaf_size must be an integer of 1 "
+                "or more")
+        self._leaf_size = value
+
+    @property
+    def depth(self) -> int:
+        """The number of levels of bounding boxes below the root box."""
+        return len(self._lower) - 1
+
+    def _build(self):
+        """Sorts the triangles into leaves and finds the bounding boxes of
+        every level of the hierarchy from the leaves up."""
+
+        corners = self.vertices[self.triangles]
+        lower, upper = corners.min(axis=1), corners.max(axis=1)
+        order = np.argsort(morton_codes((lower + upper) / 2), kind='stable')
+
+        number_of_triangles = len(self.triangles)
+        number_of_leaves = max(
+            math.ceil(number_of_triangles / self.leaf_size), 1)
+        depth = math.ceil(math.log2(number_of_leaves))
+
+        # the slots after the last triangle refer to a degenerate triangle
+        slots = np.full(
+            2 ** depth * self.leaf_size, number_of_triangles, dtype=np.int64)
+        slots[:number_of_triangles] = order
+        self._leaf_triangles = slots.reshape(2 ** depth, self.leaf_size)
+
+        lower = np.concatenate((lower, np.full((1, 3), np.inf)))
+        upper = np.concatenate((upper, np.full((1, 3), -np.inf)))
+        self._lower = [lower[self._leaf_triangles].min(axis=1)]
+        self._upper = [upper[self._leaf_triangles].max(axis=1)]
+        self._occupied = [
+            np.any(self._leaf_triangles < number_of_triangles, axis=1)]
+        for _ in range(depth):
+            self._lower.insert(0, np.minimum(
+                self._lower[0][0::2], self._lower[0][1::2]))
+            self._upper.insert(0, np.maximum(
+                self._upper[0][0::2], self._upper[0][1::2]))
+            self._occupied.insert(0, self._occupied[0][0::2])
+
+        self._first_corners = np.concatenate(
+            (corners[:, 0], np.zeros((1, 3))))
+        self._edges_1 = np.concatenate(
+            (corners[:, 1] - corners[:, 0], np.zeros((1, 3))))
+        self._edges_2 = np.concatenate(
+            (corners[:, 2] - corners[:, 0], np.zeros((1, 3))))
+
+    def cast_rays(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: Optional[float] = np.inf,
+        chunk_size: Optional[int] = 10000,
+        parallel: Optional[bool] = False,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the first triangle hit by each ray.
+
+        Args:
+            origins: the 3D coordinates of the starts of the rays with a shape
+                of (3,) or (N, 3).
+            directions: the directions of the rays with a shape of (3,) or
+                (N, 3). The distances are in units of the lengths of the
+                directions, which are normally unit vectors.
+            max_distance: hits further along the rays than this are ignored.
+                Defaults to infinity.
+            chunk_size: the number of rays traced together, which limits the
+                memory used. Defaults to 10000.
+            parallel: If True then the chunks of rays are traced in a pool of
+                threads. Defaults to False.
+            max_workers: the number of threads to use when parallel is True.
+                Defaults to None which lets concurrent.futures choose.
+
+        Returns:
+            numpy arrays of the distances to the first hits, which are inf for
+            rays that miss, and of the indices of the triangles hit, which are
+            -1 for rays that miss
+        """
+
+        origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=float).reshape(-1, 3)
+        origins, directions = np.broadcast_arrays(origins, directions)
+
+        number_of_rays = len(origins)
+        distances = np.full(number_of_rays, np.inf)
+        triangle_indices = np.full(number_of_rays, -1, dtype=np.int64)
+
+        def cast_chunk(start):
+            end = min(start + chunk_size, number_of_rays)
+            distances[start:end], triangle_indices[start:end] = \
+                self._cast_chunk(
+                    origins[start:end], directions[start:end], max_distance)
+
+        starts = range(0, number_of_rays, chunk_size)
+        if parallel:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(cast_chunk, starts))
+        else:
+            for start in starts:
+                cast_chunk(start)
+
+        return distances, triangle_indices
+
+    def _cast_chunk(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the first triangle hit by each of a chunk of rays."""
+
+        # zero components are replaced so that rays in the plane of a box
+        # face are not multiplied by infinity
+        inverse_directions = 1 / np.where(directions == 0, 1e-300, directions)
+
+        distances = np.full(len(origins), float(max_distance))
+        rays = np.arange(len(origins))
+        nodes = np.zeros(len(origins), dtype=np.int64)
+
+        for level in range(self.depth + 1):
+            near, far = self._boxes_hit(
+                origins[rays], inverse_directions[rays],
+                self._lower[level][nodes], self._upper[level][nodes])
+            hit = self._occupied[level][nodes] & (near <= far) & \
+                (far >= 0) & (near <= distances[rays])
+            rays, nodes, near = rays[hit], nodes[hit], near[hit]
+            if level < self.depth:
+                rays = np.repeat(rays, 2)
+                nodes = (2 * nodes[:, np.newaxis] + (0, 1)).ravel()
+
+        # ranks the leaves hit by each ray from nearest to furthest
+        order = np.lexsort((near, rays))
+        rays, nodes, near = rays[order], nodes[order], near[order]
+        first_of_ray = np.flatnonzero(np.diff(rays, prepend=-1))
+        ranks = np.arange(len(rays)) - np.repeat(
+            first_of_ray, np.diff(np.append(first_of_ray, len(rays))))
+
+        triangle_indices = np.full(len(origins), -1, dtype=np.int64)
+        # tests the nearest leaf of each ray, then the next two, the next
+        # four and so on, skipping leaves behind the hits found so far
+        lowest_rank = 0
+        highest_rank = ranks.max() if len(ranks) > 0 else -1
+        while lowest_rank <= highest_rank:
+            batch = (ranks >= lowest_rank) & (ranks <= 2 * lowest_rank) & \
+                (near <= distances[rays])
+            lowest_rank = 2 * lowest_rank + 1
+
+            batch_rays = np.repeat(rays[batch], self.leaf_size)
+            batch_triangles = self._leaf_triangles[nodes[batch]].ravel()
+            t = self._triangles_hit(
+                origins[batch_rays], directions[batch_rays], batch_triangles)
+
+            hit = t < distances[batch_rays]
+            batch_rays, batch_triangles, t = \
+                batch_rays[hit], batch_triangles[hit], t[hit]
+            order = np.lexsort((t, batch_rays))
+            batch_rays, first = np.unique(batch_rays[order], return_index=True)
+            distances[batch_rays] = t[order][first]
+            triangle_indices[batch_rays] = batch_triangles[order][first]
+
+        distances[triangle_indices == -1] = np.inf
+
+        return distances, triangle_indices
+
+    @staticmethod
+    def _boxes_hit(origins, inverse_directions, lower, upper):
+        """Finds the distances along rays to where they enter and leave
+        axis aligned boxes, the rays miss the boxes when they enter after
+        they leave."""
+
+        with np.errstate(over='ignore', invalid='ignore'):
+            t_lower = (lower - origins) * inverse_directions
+            t_upper = (upper - origins) * inverse_directions
+        near = np.minimum(t_lower, t_upper)
+        far = np.maximum(t_lower, t_upper)
+        near = np.maximum(np.maximum(near[:, 0], near[:, 1]), near[:, 2])
+        far = np.minimum(np.minimum(far[:, 0], far[:, 1]), far[:, 2])
+
+        return near, far
+
+    def _triangles_hit(self, origins, directions, triangles):
+        """Finds the distances along rays to where they hit triangles with the
+        Moller-Trumbore algorithm, which are inf where they miss."""
+
+        edges_1 = self._edges_1[triangles]
+        edges_2 = self._edges_2[triangles]
+        offsets = origins - self._first_corners[triangles]
+
+        p = np.cross(directions, edges_2)
+        q = np.cross(offsets, edges_1)
+        determinants = np.einsum('ij,ij->i', edges_1, p)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inverse_determinants = 1 / determinants
+            u = np.einsum('ij,ij->i', offsets, p) * inverse_determinants
+            v = np.einsum('ij,ij->i', directions, q) * inverse_determinants
+            t = np.einsum('ij,ij->i', edges_2, q) * inverse_determinants
+            # the barycentric coordinates are allowed a small tolerance so
+            # rays through shared edges and vertices hit a triangle
+            hit = (determinants != 0) & (u >= -1e-9) & (v >= -1e-9) & \
+                (u + v <= 1 + 1e-9) & (t > 0)
+
+        return np.where(hit, t, np.inf)
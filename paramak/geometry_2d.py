@@ -0,0 +1,623 @@
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+ArrayLike = Union[np.ndarray, list, tuple, float]
+
+
+def rotate_points(
+        origins: ArrayLike,
+        points: ArrayLike,
+        angles: ArrayLike,
+) -> np.ndarray:
+    """Rotates points counterclockwise about origin points. The origins,
+    points and angles are broadcast against each other so many points can be
+    rotated about one origin, or one point rotated by many angles.
+
+    Args:
+        origins: the 2D coordinates of the origins of the rotations with a
+            shape of (2,) or (N, 2).
+        points: the 2D coordinates of the points to rotate with a shape of
+            (2,) or (N, 2).
+        angles: the rotation angles in radians (counterclockwise) with a
+            shape of () or (N,).
+
+    Returns:
+        numpy array of the rotated points with a shape of (2,) or (N, 2)
+    """
+
+    origins = np.asarray(origins, dtype=float)
+    points = np.asarray(points, dtype=float)
+    angles = np.asarray(angles, dtype=float)
+
+    cosines, sines = np.cos(angles), np.sin(angles)
+    offsets = points - origins
+
+    return origins + np.stack(
+        (cosines * offsets[..., 0] - sines * offsets[..., 1],
+         sines * offsets[..., 0] + cosines * offsets[..., 1]),
+        axis=-1)
+
+
+def distances(points_a: ArrayLike, points_b: ArrayLike) -> np.ndarray:
+    """Computes the distances between pairs of points.
+
+    Args:
+        points_a: the 2D coordinates of the first points with a shape of (2,)
+            or (N, 2).
+        points_b: the 2D coordinates of the second points with a shape of
+            (2,) or (N, 2).
+
+    Returns:
+        numpy array of the distances with a shape of () or (N,)
+    """
+
+    offsets = np.asarray(points_b, dtype=float) - \
+        np.asarray(points_a, dtype=float)
+
+    return np.hypot(offsets[..., 0], offsets[..., 1])
+
+
+def extend_points(
+        points_a: ArrayLike,
+        points_b: ArrayLike,
+        lengths: ArrayLike,
+) -> np.ndarray:
+    """Finds the points at a distance from points_a in the direction of
+    points_b.
+
+    Args:
+        points_a: the 2D coordinates of the start points with a shape of (2,)
+            or (N, 2).
+        points_b: the 2D coordinates of the points that set the directions
+            with a shape of (2,) or (N, 2).
+        lengths: the distances of the new points from points_a with a shape
+            of () or (N,). Negative lengths extend away from points_b.
+
+    Returns:
+        numpy array of the new points with a shape of (2,) or (N, 2)
+    """
+
+    points_a = np.asarray(points_a, dtype=float)
+    directions = np.asarray(points_b, dtype=float) - points_a
+    directions = directions / distances(
+        np.zeros(2), directions)[..., np.newaxis]
+
+    return points_a + np.asarray(lengths, dtype=float)[..., np.newaxis] * \
+        directions
+
+
+def line_coefficients(
+        points_a: ArrayLike,
+        points_b: ArrayLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the m and c coefficients of the equations (y=mx+c) of the
+    straight lines through pairs of points. Vertical lines have an infinite
+    gradient and an undefined (nan) intercept.
+
+    Args:
+        points_a: the 2D coordinates of the first points with a shape of (2,)
+            or (N, 2).
+        points_b: the 2D coordinates of the second points with a shape of
+            (2,) or (N, 2).
+
+    Returns:
+        numpy arrays of the m coefficients and c coefficients
+    """
+
+    points_a = np.asarray(points_a, dtype=float)
+    offsets = np.asarray(points_b, dtype=float) - points_a
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gradients = offsets[..., 1] / offsets[..., 0]
+        gradients = np.where(
+            offsets[..., 0] == 0, np.copysign(np.inf, offsets[..., 1]),
+            gradients)
+        intercepts = np.where(
+            np.isinf(gradients), np.nan,
+            points_a[..., 1] - gradients * points_a[..., 0])
+
+    return gradients, intercepts
+
+
+def circle_centres(
+        points_a: ArrayLike,
+        points_b: ArrayLike,
+        points_c: ArrayLike,
+        collinear_tolerance: Optional[float] = 1e-6,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the centres and radii of the circles that pass through sets of
+    three points. Points that are collinear have a nan centre and an infinite
+    radius.
+
+    Args:
+        points_a: the 2D coordinates of the first points with a shape of (2,)
+            or (N, 2).
+        points_b: the 2D coordinates of the second points with a shape of
+            (2,) or (N, 2).
+        points_c: the 2D coordinates of the third points with a shape of (2,)
+            or (N, 2).
+        collinear_tolerance: points are treated as collinear when the
+            magnitude of the determinant of the circle equations is smaller
+            than this value.
+
+    Returns:
+        numpy arrays of the centres with a shape of (2,) or (N, 2) and of the
+        radii with a shape of () or (N,)
+    """
+
+    points_a = np.asarray(points_a, dtype=float)
+    points_b = np.asarray(points_b, dtype=float)
+    points_c = np.asarray(points_c, dtype=float)
+
+    (x_a, y_a), (x_b, y_b), (x_c, y_c) = (
+        np.moveaxis(points, -1, 0) for points in (points_a, points_b, points_c))
+
+    squares_b = x_b * x_b + y_b * y_b
+    bc = (x_a * x_a + y_a * y_a - squares_b) / 2
+    cd = (squares_b - x_c * x_c - y_c * y_c) / 2
+    determinant = (x_a - x_b) * (y_b - y_c) - (x_b - x_c) * (y_a - y_b)
+
+    collinear = np.abs(determinant) < collinear_tolerance
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centres = np.stack(
+            ((bc * (y_b - y_c) - cd * (y_a - y_b)) / determinant,
+             ((x_a - x_b) * cd - (x_b - x_c) * bc) / determinant),
+            axis=-1)
+    centres = np.where(collinear[..., np.newaxis], np.nan, centres)
+    radii = np.where(collinear, np.inf, distances(centres, points_a))
+
+    return centres, radii
+
+
+def offset_curve(
+        x: ArrayLike,
+        y: ArrayLike,
+        thickness: float,
+        gradients: Optional[ArrayLike] = None,
+) -> np.ndarray:
+    """Offsets the points of a curve along the normals of the curve, which
+    thickens the curve. The normal at each point is found from the gradient
+    (dy/dx) of the curve and points towards +y while the curve travels
+    towards +x, and towards -y while the curve travels towards -x. An
+    infinite gradient gives a normal along +x and a negative infinite
+    gradient gives a normal along -x.
+
+    Args:
+        x: the x values of the curve points with a shape of (N,).
+        y: the y values of the curve points with a shape of (N,).
+        thickness: the distance of the offset points from the curve.
+        gradients: the first order derivatives (dy/dx) at the curve points.
+            Defaults to None which uses the gradients between consecutive
+            points, in which case the last point is not offset.
+
+    Returns:
+        numpy array of the offset points with a shape of (M, 2) where M is
+        the number of gradients
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    if gradients is None:
+        gradients = np.diff(y) / np.diff(x)
+    gradients = np.asarray(gradients, dtype=float)
+    number_of_points = len(gradients)
+
+    normals = np.column_stack((-gradients, np.ones(number_of_points)))
+    normals[gradients == np.inf] = (1, 0)
+    normals[gradients == -np.inf] = (-1, 0)
+
+    # the curve direction of the last point follows the previous point
+    convex = x[:number_of_points - 1] >= x[1:number_of_points]
+    convex = np.append(convex, convex[-1:])
+    normals[convex] *= -1
+
+    normals /= distances(np.zeros(2), normals)[:, np.newaxis]
+
+    return np.column_stack((x[:number_of_points], y[:number_of_points])) + \
+        thickness * normals
+
+
+def points_in_polygon(points: ArrayLike, polygon: ArrayLike) -> np.ndarray:
+    """Finds which points are inside a polygon using winding numbers, so
+    points inside any loop of a self intersecting polygon are inside. The
+    points are sorted by their y values so each edge of the polygon is only
+    tested against the points level with it.
+
+    Args:
+        points: the 2D coordinates of the points to test with a shape of
+            (N, 2).
+        polygon: the 2D coordinates of the vertices of the polygon with a
+            shape of (M, 2). The polygon is closed automatically if the last
+            vertex is not the same as the first vertex.
+
+    Returns:
+        numpy array of booleans with a shape of (N,) that are True for the
+        points inside the polygon
+    """
+
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=float)
+    if not np.array_equal(polygon[0], polygon[-1]):
+        polygon = np.concatenate((polygon, polygon[:1]))
+
+    order = np.argsort(points[:, 1], kind='stable')
+    x, y = points[order, 0], points[order, 1]
+    winding_numbers = np.zeros(len(points), dtype=int)
+
+    for (x_a, y_a), (x_b, y_b) in zip(polygon[:-1], polygon[1:]):
+        if y_a == y_b:
+            # horizontal edges are never crossed
+            continue
+        start, end = np.searchsorted(y, sorted((y_a, y_b)))
+        if start == end:
+            continue
+        # positive when the point is to the left of the edge
+        side = (x_b - x_a) * (y[start:end] - y_a) - \
+            (x[start:end] - x_a) * (y_b - y_a)
+        if y_a < y_b:
+            winding_numbers[start:end] += side > 0
+        else:
+            winding_numbers[start:end] -= side < 0
+
+    inside = np.empty(len(points), dtype=bool)
+    inside[order] = winding_numbers != 0
+
+    return inside
+
+
+def rectilinear_rectangles(polygon: ArrayLike) -> np.ndarray:
+    """Splits a polygon with only horizontal and vertical edges into
+    rectangles. The polygon is cut into bands between each of the y values of
+    its vertices and the parts of each band inside the polygon are found from
+    the vertical edges crossing the band. Parts of neighbouring bands with the
+    same x range are joined into one rectangle.
+
+    Args:
+        polygon: the 2D coordinates of the vertices of the polygon with a
+            shape of (M, 2). The polygon is closed automatically if the last
+            vertex is not the same as the first vertex.
+
+    Returns:
+        numpy array of the rectangles with a shape of (N, 4) where each row is
+        the minimum x, maximum x, minimum y and maximum y of a rectangle
+    """
+
+    polygon = np.asarray(polygon, dtype=float)
+    if not np.array_equal(polygon[0], polygon[-1]):
+        polygon = np.concatenate((polygon, polygon[:1]))
+
+    starts, ends = polygon[:-1], polygon[1:]
+    edges_x = starts[:, 0]
+    edges_y_min = np.minimum(starts[:, 1], ends[:, 1])
+    edges_y_max = np.maximum(starts[:, 1], ends[:, 1])
+    vertical = starts[:, 0] == ends[:, 0]
+
+    levels = np.unique(polygon[:, 1])
+    rectangles = []
+    # the x ranges of the rectangles still growing and their minimum y
+    growing = {}
+    for y_min, y_max in zip(levels[:-1], levels[1:]):
+        middle = (y_min + y_max) / 2
+        crossing = vertical & (edges_y_min < middle) & (edges_y_max > middle)
+        crossings = np.sort(edges_x[crossing])
+        intervals = list(zip(crossings[0::2], crossings[1::2]))
+
+        for interval in list(growing):
+            if interval not in intervals:
+                rectangles.append((*interval, growing.pop(interval), y_min))
+        for interval in intervals:
+            growing.setdefault(interval, y_min)
+
+    for interval, y_min in growing.items():
+        rectangles.append((*interval, y_min, levels[-1]))
+
+    return np.array(sorted(rectangles), dtype=float).reshape(-1, 4)
+
+
+def point_segment_distances(
+        points: ArrayLike,
+        starts: ArrayLike,
+        ends: ArrayLike,
+) -> np.ndarray:
+    """Computes the distances between every point and every line segment.
+
+    Args:
+        points: the 2D coordinates of the points with a shape of (N, 2).
+        starts: the 2D coordinates of the starts of the segments with a shape
+            of (M, 2).
+        ends: the 2D coordinates of the ends of the segments with a shape of
+            (M, 2).
+
+    Returns:
+        numpy array of the distances with a shape of (N, M)
+    """
+
+    return _point_segment_distances(
+        np.asarray(points, dtype=float).reshape(-1, 1, 2),
+        np.asarray(starts, dtype=float).reshape(1, -1, 2),
+        np.asarray(ends, dtype=float).reshape(1, -1, 2))
+
+
+def _point_segment_distances(
+        points: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+) -> np.ndarray:
+    """Computes the distances between points and line segments that are
+    broadcast against each other."""
+
+    directions = ends - starts
+    lengths_squared = np.sum(directions * directions, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fractions = np.sum((points - starts) * directions, axis=-1) / \
+            lengths_squared
+    # zero length segments are treated as points
+    fractions = np.clip(np.nan_to_num(fractions), 0, 1)
+    nearest = starts + fractions[..., np.newaxis] * directions
+
+    return distances(points, nearest)
+
+
+def _cross(vectors_a: np.ndarray, vectors_b: np.ndarray) -> np.ndarray:
+    """Computes the z components of the cross products of 2D vectors."""
+
+    return vectors_a[..., 0] * vectors_b[..., 1] - \
+        vectors_a[..., 1] * vectors_b[..., 0]
+
+
+def _closed_counterclockwise(polygon: ArrayLike) -> np.ndarray:
+    """Closes a polygon and orders its vertices counterclockwise."""
+
+    polygon = np.asarray(polygon, dtype=float)
+    if not np.array_equal(polygon[0], polygon[-1]):
+        polygon = np.concatenate((polygon, polygon[:1]))
+
+    signed_area = np.sum(
+        polygon[:-1, 0] * polygon[1:, 1] - polygon[1:, 0] * polygon[:-1, 1])
+
+    return polygon if signed_area >= 0 else polygon[::-1]
+
+
+def _nearby_segments(
+        starts_a: np.ndarray,
+        ends_a: np.ndarray,
+        starts_b: np.ndarray,
+        ends_b: np.ndarray,
+        distance: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the pairs of segments that might be closer than a distance,
+    which are the pairs whose circles around the segments are closer than
+    the distance. The candidate pairs are found with kd-trees of the middles
+    of the segments rather than by testing every pair."""
+
+    middles_a, middles_b = (starts_a + ends_a) / 2, (starts_b + ends_b) / 2
+    radii_a = distances(starts_a, ends_a) / 2
+    radii_b = distances(starts_b, ends_b) / 2
+
+    pairs = cKDTree(middles_a).sparse_distance_matrix(
+        cKDTree(middles_b),
+        radii_a.max() + radii_b.max() + distance,
+        output_type='ndarray')
+    indices_a, indices_b = pairs['i'], pairs['j']
+    close = pairs['v'] <= radii_a[indices_a] + radii_b[indices_b] + distance
+
+    return indices_a[close], indices_b[close]
+
+
+def _boundary_integral_inside(
+        polygon: np.ndarray,
+        other: np.ndarray,
+        tolerance: float,
+        include_shared: bool,
+) -> float:
+    """Integrates x dy / 2 - y dx / 2 along the parts of the boundary of a
+    counterclockwise polygon that are inside another counterclockwise
+    polygon. Parts of the boundaries that are shared and run in the same
+    direction are only included if include_shared is True."""
+
+    starts, ends = polygon[:-1], polygon[1:]
+    other_starts, other_ends = other[:-1], other[1:]
+    directions = ends - starts
+    other_directions = other_ends - other_starts
+
+    edges, others = _nearby_segments(
+        starts, ends, other_starts, other_ends, tolerance)
+
+    # the edges are cut where they cross the edges of the other polygon
+    offsets = other_starts[others] - starts[edges]
+    denominators = _cross(directions[edges], other_directions[others])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = _cross(offsets, other_directions[others]) / denominators
+        t = _cross(offsets, directions[edges]) / denominators
+        crossing = (denominators != 0) & (s > 0) & (s < 1) & \
+            (t >= 0) & (t <= 1)
+
+    # and where the vertices of the other polygon touch the edges, which
+    # finds the ends of shared parts of the boundaries
+    touching = _point_segment_distances(
+        other_starts[others], starts[edges], ends[edges]) < tolerance
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fractions = np.sum(offsets * directions[edges], axis=1) / \
+            np.sum(directions[edges] ** 2, axis=1)
+
+    number_of_edges = len(starts)
+    cut_edges = np.concatenate((
+        edges[crossing], edges[touching], np.arange(number_of_edges),
+        np.arange(number_of_edges)))
+    cut_fractions = np.concatenate((
+        s[crossing], fractions[touching], np.zeros(number_of_edges),
+        np.ones(number_of_edges)))
+    keep = (cut_fractions >= 0) & (cut_fractions <= 1)
+    cut_edges, cut_fractions = cut_edges[keep], cut_fractions[keep]
+
+    order = np.lexsort((cut_fractions, cut_edges))
+    cut_edges, cut_fractions = cut_edges[order], cut_fractions[order]
+    pieces = (cut_edges[:-1] == cut_edges[1:]) & \
+        (cut_fractions[:-1] < cut_fractions[1:])
+    piece_edges = cut_edges[:-1][pieces]
+    piece_starts = starts[piece_edges] + \
+        cut_fractions[:-1][pieces, np.newaxis] * directions[piece_edges]
+    piece_ends = starts[piece_edges] + \
+        cut_fractions[1:][pieces, np.newaxis] * directions[piece_edges]
+    middles = (piece_starts + piece_ends) / 2
+
+    # pieces on an edge of the other polygon are shared, which only needs
+    # testing against the other edges near the edge of the piece
+    order = np.argsort(edges, kind='stable')
+    edges, others = edges[order], others[order]
+    first = np.searchsorted(edges, piece_edges, side='left')
+    counts = np.searchsorted(edges, piece_edges, side='right') - first
+    pieces = np.repeat(np.arange(len(piece_edges)), counts)
+    candidates = others[
+        np.repeat(first - np.cumsum(counts) + counts, counts) +
+        np.arange(counts.sum())]
+    on_edge = _point_segment_distances(
+        middles[pieces], other_starts[candidates],
+        other_ends[candidates]) < tolerance
+    same_direction = np.sum(
+        directions[piece_edges[pieces]] * other_directions[candidates],
+        axis=1) > 0
+
+    shared = np.zeros(len(piece_edges), dtype=bool)
+    shared[pieces[on_edge]] = True
+    shared_same_direction = np.zeros(len(piece_edges), dtype=bool)
+    shared_same_direction[pieces[on_edge & same_direction]] = True
+
+    included = np.where(
+        shared,
+        include_shared & shared_same_direction,
+        points_in_polygon(middles, other))
+
+    return np.sum(
+        piece_starts[included, 0] * piece_ends[included, 1] -
+        piece_ends[included, 0] * piece_starts[included, 1]) / 2
+
+
+def polygon_overlap_area(
+        polygon_a: ArrayLike,
+        polygon_b: ArrayLike,
+        tolerance: Optional[float] = 1e-9,
+) -> float:
+    """Computes the area of the overlap of two simple polygons, which do not
+    need to be convex, using Green's theorem. The boundary of the overlap is
+    made from the parts of the boundary of each polygon that are inside the
+    other polygon, so the area is found from the polygon edges cut where they
+    cross without building the overlapping polygon. Only pairs of edges near
+    each other are tested so densely faceted polygons are quick to compare.
+    Polygons that only touch along shared edges have no overlap.
+
+    Args:
+        polygon_a: the 2D coordinates of the vertices of the first polygon
+            with a shape of (N, 2).
+        polygon_b: the 2D coordinates of the vertices of the second polygon
+            with a shape of (M, 2).
+        tolerance: points closer than this to an edge are treated as on the
+            edge.
+
+    Returns:
+        the area of the overlap
+    """
+
+    polygon_a = _closed_counterclockwise(polygon_a)
+    polygon_b = _closed_counterclockwise(polygon_b)
+
+    area = _boundary_integral_inside(
+        polygon_a, polygon_b, tolerance, include_shared=True) + \
+        _boundary_integral_inside(
+            polygon_b, polygon_a, tolerance, include_shared=False)
+
+    return max(float(area), 0.)
+
+
+def polygon_clearance(polygon_a: ArrayLike, polygon_b: ArrayLike) -> float:
+    """Computes the smallest distance between the edges of two polygons,
+    which is 0 if the edges touch or cross. The nearest pair of vertices
+    limits the distance, so only the pairs of edges closer than that need to
+    be tested.
+
+    Args:
+        polygon_a: the 2D coordinates of the vertices of the first polygon
+            with a shape of (N, 2).
+        polygon_b: the 2D coordinates of the vertices of the second polygon
+            with a shape of (M, 2).
+
+    Returns:
+        the smallest distance between the edges
+    """
+
+    polygon_a = _closed_counterclockwise(polygon_a)
+    polygon_b = _closed_counterclockwise(polygon_b)
+    starts_a, ends_a = polygon_a[:-1], polygon_a[1:]
+    starts_b, ends_b = polygon_b[:-1], polygon_b[1:]
+
+    vertex_distance = cKDTree(starts_b).query(starts_a)[0].min()
+    edges_a, edges_b = _nearby_segments(
+        starts_a, ends_a, starts_b, ends_b, vertex_distance)
+    starts_a, ends_a = starts_a[edges_a], ends_a[edges_a]
+    starts_b, ends_b = starts_b[edges_b], ends_b[edges_b]
+
+    # edges that cross have the ends of each on opposite sides of the other
+    directions_a, directions_b = ends_a - starts_a, ends_b - starts_b
+    sides_a = _cross(directions_a, starts_b - starts_a) * \
+        _cross(directions_a, ends_b - starts_a)
+    sides_b = _cross(directions_b, starts_a - starts_b) * \
+        _cross(directions_b, ends_a - starts_b)
+    if np.any((sides_a < 0) & (sides_b < 0)):
+        return 0.
+
+    return float(np.min(np.concatenate((
+        [vertex_distance],
+        _point_segment_distances(starts_a, starts_b, ends_b),
+        _point_segment_distances(ends_a, starts_b, ends_b),
+        _point_segment_distances(starts_b, starts_a, ends_a),
+        _point_segment_distances(ends_b, starts_a, ends_a)))))
+
+
+def clip_polygon(
+        polygon: ArrayLike,
+        origin: ArrayLike,
+        normal: ArrayLike,
+) -> np.ndarray:
+    """Clips a polygon to the half plane on the side of a line that its
+    normal points to, using the Sutherland-Hodgman algorithm. Clipping a
+    polygon that is not convex can leave edges of zero width along the line,
+    which do not change the area or other integrals of the polygon.
+
+    Args:
+        polygon: the 2D coordinates of the vertices of the polygon with a
+            shape of (N, 2). The polygon is closed automatically if the last
+            vertex is not the same as the first vertex.
+        origin: the 2D coordinates of a point on the line.
+        normal: the normal of the line, pointing into the half plane that is
+            kept.
+
+    Returns:
+        numpy array of the vertices of the closed clipped polygon with a shape
+        of (M, 2), which is empty if the polygon is outside of the half plane
+    """
+
+    polygon = np.asarray(polygon, dtype=float)
+    if not np.array_equal(polygon[0], polygon[-1]):
+        polygon = np.concatenate((polygon, polygon[:1]))
+
+    starts, ends = polygon[:-1], polygon[1:]
+    sides_starts = (starts - origin) @ np.asarray(normal, dtype=float)
+    sides_ends = (ends - origin) @ np.asarray(normal, dtype=float)
+    inside = sides_starts >= 0
+    crossing = inside != (sides_ends >= 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fractions = sides_starts / (sides_starts - sides_ends)
+        crossings = starts + fractions[:, np.newaxis] * (ends - starts)
+
+    # each edge keeps its start if inside then where it crosses the line
+    clipped = np.stack((starts, crossings), axis=1)[
+        np.column_stack((inside, crossing))]
+    if len(clipped) == 0:
+        return clipped
+
+    return np.concatenate((clipped, clipped[:1]))
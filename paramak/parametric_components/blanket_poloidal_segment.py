@@ -1,5 +1,6 @@
 
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from paramak import BlanketFP, RotateStraightShape
@@ -121,34 +122,12 @@ class BlanketFPPoloidalSegments(BlanketFP):
         return solid
 
     def create_segment_cutters(self):
-        """Creates a shape for cutting the blanket into segments and store it
-        in segments_cutter attribute
+        """Creates the shapes for cutting the blanket into segments and stores
+        them in the segments_cutters attribute. The cutters are kept as a list
+        so the blanket is cut by all of them in a single boolean operation.
         """
         if self.segments_gap > 0:
-            # initialise main cutting shape
-            cutting_shape = RotateStraightShape(
-                rotation_angle=self.rotation_angle,
-                azimuth_placement_angle=self.azimuth_placement_angle,
-                union=[])
-            # add points to the shape to avoid void solid
-            cutting_shape.points = [
-                (self.major_radius,
-                 self.vertical_displacement),
-                (self.major_radius +
-                 self.minor_radius /
-                 10,
-                 self.vertical_displacement),
-                (self.major_radius +
-                 self.minor_radius /
-                 10,
-                 self.vertical_displacement +
-                 self.minor_radius /
-                 10),
-                (self.major_radius,
-                 self.vertical_displacement +
-                 self.minor_radius /
-                 10),
-            ]
+            cutters = []
 
             # Create cutters for each gap
             for inner_point, outer_point in zip(
@@ -187,10 +166,9 @@ class BlanketFPPoloidalSegments(BlanketFP):
                             self.segments_gap),
                         angle=np.pi / 2)]
                 cutter.points = points_cutter
-                # add cutter to global cutting shape
-                cutting_shape.union.append(cutter)
+                cutters.append(cutter)
 
-            self.segments_cutters = cutting_shape
+            self.segments_cutters = cutters
 
 
 def compute_lengths_from_angles(angles, distribution):
@@ -200,26 +178,76 @@ def compute_lengths_from_angles(angles, distribution):
     Args:
         angles (list): Contains the angles of the points (degree)
         distribution (callable): function taking an angle as argument and
-            returning (x,y) coordinates.
+            returning (x,y) coordinates. If the function accepts a numpy
+            array of angles all the points are found in one call.
+
+    Returns:
+        numpy.array: contains the lengths of the segments.
+    """
+    angles = np.asarray(angles, dtype=float)
+
+    try:
+        x, y = distribution(angles)
+        vectorised = np.shape(x) == angles.shape and \
+            np.shape(y) == angles.shape
+    except (TypeError, ValueError):
+        vectorised = False
+
+    if not vectorised:
+        x, y = np.array([distribution(angle) for angle in angles]).T
+
+    return np.hypot(np.diff(x), np.diff(y))
+
+
+def _optimise_segments(nb_segments, initial_angles, distribution, angles,
+                       length_limits):
+    """Optimises the angles of a given number of segments with scipy
+    minimize. Defined at the module level so that it can be run in a process
+    pool by segments_optimiser.
 
     Returns:
-        list: contains the lengths of the segments.
+        (float, list, bool): the value of the cost function, the optimised
+            angles (including the start and stop angles) and whether the
+            lengths of the segments meet the length_limits
     """
-    points = []
-    for angle in angles:
-        points.append(distribution(angle))
+    start_angle, stop_angle = angles
+    min_length, max_length = length_limits
+
+    # define cost function
+    def cost_function(angles):
+        lengths = compute_lengths_from_angles(
+            np.concatenate(([start_angle], angles, [stop_angle])),
+            distribution)
+        too_short = np.clip(min_length - lengths, 0, None)
+        too_long = np.clip(lengths - max_length, 0, None)
+        return np.sum(too_short + too_long)
+
+    if nb_segments > 1:
+        # use scipy minimize to find best set of angles
+        res = minimize(
+            cost_function, initial_angles[1:-1], method="Nelder-Mead")
+        cost, inner_angles = res.fun, list(res.x)
+    else:
+        cost, inner_angles = cost_function(np.array([])), []
+
+    # complete the optimised angles with extrema
+    optimised_angles = [start_angle] + inner_angles + [stop_angle]
 
-    lengths = []
-    for i in range(len(points) - 1):
-        lengths.append(distance_between_two_points(points[i], points[i + 1]))
-    return lengths
+    # check that the optimised angles meet the lengths requirements
+    lengths = compute_lengths_from_angles(optimised_angles, distribution)
+    meets_rules = bool(np.all(
+        (min_length <= lengths) & (lengths <= max_length)))
+
+    return float(cost), optimised_angles, meets_rules
 
 
 def segments_optimiser(length_limits, nb_segments_limits, distribution, angles,
-                       stop_on_success=True):
+                       stop_on_success=True, max_workers=None):
     """Optimiser segmenting a given R(theta), Z(theta) distribution of points
     with constraints regarding the number of segments and the length of the
-    segments.
+    segments. The numbers of segments are tried in increasing order and the
+    optimisation for each number of segments starts from the solution for the
+    previous number of segments.
 
     Args:
         length_limits ((float, float)): The minimum and maximum acceptable
@@ -233,6 +261,11 @@ def segments_optimiser(length_limits, nb_segments_limits, distribution, angles,
         angles ((float, float)): the start and stop angles of the distribution.
         stop_on_sucess (bool, optional): If set to True, the optimiser will
             stop as soon as a configuration meets the requirements.
+        max_workers (int, optional): If greater than 1, this number of
+            segment numbers are optimised concurrently in a process pool,
+            each starting from the best solution of the previous batch. The
+            distribution must then be picklable. Defaults to None which
+            optimises each number of segments in turn.
 
     Returns:
         list: list of optimised angles
@@ -258,48 +291,54 @@ def segments_optimiser(length_limits, nb_segments_limits, distribution, angles,
 
     start_angle, stop_angle = angles
 
-    # define cost function
-    def cost_function(angles):
-        angles_with_extremums = [start_angle, *angles, stop_angle]
-
-        lengths = compute_lengths_from_angles(
-            angles_with_extremums, distribution)
-
-        cost = 0
-        for length in lengths:
-            if not min_length <= length <= max_length:
-                cost += min(abs(min_length - length), abs(max_length - length))
-        return cost
+    def initial_angles(nb_segments, previous_angles):
+        # stretches the previous solution over the new number of segments
+        if previous_angles is None:
+            return np.linspace(start_angle, stop_angle, num=nb_segments + 1)
+        return np.interp(
+            np.linspace(0, 1, nb_segments + 1),
+            np.linspace(0, 1, len(previous_angles)),
+            previous_angles)
+
+    if max_workers is None or max_workers < 2:
+        batch_size = 1
+        executor = None
+    else:
+        batch_size = max_workers
+        executor = ProcessPoolExecutor(max_workers=max_workers)
 
     # test for several numbers of segments the best config
     best = [float("inf"), []]
-
-    for nb_segments in range(min_nb_segments, max_nb_segments + 1):
-        # initialise angles to linspace
-        list_of_angles = \
-            np.linspace(start_angle, stop_angle, num=nb_segments + 1)
-
-        # use scipy minimize to find best set of angles
-        res = minimize(
-            cost_function, list_of_angles[1:-1], method="Nelder-Mead")
-
-        # complete the optimised angles with extrema
-        optimised_angles = [start_angle] + \
-            [angle for angle in res.x] + [stop_angle]
-
-        # check that the optimised angles meet the lengths requirements
-        lengths = compute_lengths_from_angles(optimised_angles, distribution)
-        break_the_rules = False
-        for length in lengths:
-            if not min_length <= length <= max_length:
-                break_the_rules = True
-                break
-        if not break_the_rules:
-            # compare with previous results and get the minimum
-            # cost function value
-            best = min(best, [res.fun, optimised_angles], key=lambda x: x[0])
-            if stop_on_success:
-                return optimised_angles
+    previous_angles = None
+
+    try:
+        nb_segments_list = list(range(min_nb_segments, max_nb_segments + 1))
+        for i in range(0, len(nb_segments_list), batch_size):
+            batch = nb_segments_list[i:i + batch_size]
+            arguments = [
+                (nb_segments, initial_angles(nb_segments, previous_angles),
+                 distribution, (start_angle, stop_angle),
+                 (min_length, max_length))
+                for nb_segments in batch
+            ]
+            if executor is None:
+                results = [_optimise_segments(*args) for args in arguments]
+            else:
+                results = list(executor.map(_optimise_segments, *zip(*arguments)))
+
+            for cost, optimised_angles, meets_rules in results:
+                if meets_rules:
+                    # compare with previous results and get the minimum
+                    # cost function value
+                    best = min(
+                        best, [cost, optimised_angles], key=lambda x: x[0])
+                    if stop_on_success:
+                        return optimised_angles
+
+            previous_angles = min(results, key=lambda x: x[0])[1]
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     # return the results
     returned_angles = best[1]
@@ -1,4 +1,5 @@
 
+import math
 from typing import Optional
 import numpy as np
 from paramak import SweepCircleShape
@@ -68,6 +69,14 @@ class CoolantChannelRingCurved(SweepCircleShape):
     def azimuth_placement_angle(self, value):
         self._azimuth_placement_angle = value
 
+    @property
+    def channel_radius(self):
+        return self.radius
+
+    @channel_radius.setter
+    def channel_radius(self, value):
+        self.radius = value
+
     @property
     def path_points(self):
         self.find_path_points()
@@ -90,6 +99,60 @@ class CoolantChannelRingCurved(SweepCircleShape):
 
         self.azimuth_placement_angle = angles
 
+    def channels_are_disjoint(self) -> bool:
+        """Checks if neighbouring coolant channels are clear of each other,
+        in which case the channels can be gathered into a compound rather than
+        fused together. The check uses the closest approach of the channel
+        paths to the rotation axis and is only made when the channels are
+        placed around the normal of the workplane.
+
+        Returns:
+            True if the channels do not touch, otherwise False
+        """
+
+        if self.rotation_axis is not None:
+            axis = self.get_rotation_axis()[1]
+            if axis.replace("-", "").replace("+", "") != \
+                    self.path_workplane[1]:
+                return False
+        if self.path_workplane[1] in self.workplane:
+            return False
+
+        if self.number_of_coolant_channels < 2:
+            return True
+
+        # the channel paths can get no closer than the rays from the
+        # rotation axis through their innermost points
+        minimum_radius = min(abs(point[0]) for point in self.path_points)
+        angle = 2 * math.pi / self.number_of_coolant_channels
+        if angle < math.pi / 2:
+            distance_between_paths = minimum_radius * math.sin(angle)
+        else:
+            distance_between_paths = 2 * minimum_radius * math.sin(angle / 2)
+
+        return distance_between_paths > 2 * self.radius
+
+    def rotate_solid(self, solid, wedge_cut=None, union=None):
+        """Places the coolant channels around the ring. Channels that are
+        clear of each other are gathered into a single compound, which avoids
+        a boolean union per channel and scales to rings with many channels.
+
+        Args:
+            solid: the coolant channel to copy.
+            wedge_cut (paramak.CuttingWedgeFS): an optional wedge that removes
+                the part of the ring outside of the rotation_angle.
+            union: if True the channels are fused together. Defaults to None
+                which only fuses the channels if they touch each other.
+
+        Returns:
+            CadQuery.Workplane: the ring of coolant channels
+        """
+
+        if union is None:
+            union = not self.channels_are_disjoint()
+
+        return super().rotate_solid(solid, wedge_cut=wedge_cut, union=union)
+
     def find_path_points(self):
 
         path_points = [
@@ -1,4 +1,5 @@
 
+import math
 from typing import Optional
 import numpy as np
 from paramak import ExtrudeCircleShape
@@ -61,6 +62,14 @@ class CoolantChannelRingStraight(ExtrudeCircleShape):
     def azimuth_placement_angle(self, value):
         self._azimuth_placement_angle = value
 
+    @property
+    def channel_radius(self):
+        return self.radius
+
+    @channel_radius.setter
+    def channel_radius(self, value):
+        self.radius = value
+
     def find_azimuth_placement_angle(self):
         """Calculates the azimuth placement angles based on the number of
         coolant channels."""
@@ -74,6 +83,49 @@ class CoolantChannelRingStraight(ExtrudeCircleShape):
 
         self.azimuth_placement_angle = angles
 
+    def channels_are_disjoint(self) -> bool:
+        """Checks if neighbouring coolant channels are clear of each other,
+        in which case the channels can be gathered into a compound rather than
+        fused together. This is only checked when the channels are placed
+        around the normal of the workplane.
+
+        Returns:
+            True if the channels do not touch, otherwise False
+        """
+
+        axis = self.get_rotation_axis()[1].replace("-", "").replace("+", "")
+        if axis not in ["X", "Y", "Z"] or axis in self.workplane:
+            return False
+
+        if self.number_of_coolant_channels < 2:
+            return True
+
+        distance_between_centres = 2 * abs(self.ring_radius) * math.sin(
+            math.pi / self.number_of_coolant_channels)
+
+        return distance_between_centres > 2 * self.radius
+
+    def rotate_solid(self, solid, wedge_cut=None, union=None):
+        """Places the coolant channels around the ring. Channels that are
+        clear of each other are gathered into a single compound, which avoids
+        a boolean union per channel and scales to rings with many channels.
+
+        Args:
+            solid: the coolant channel to copy.
+            wedge_cut (paramak.CuttingWedgeFS): an optional wedge that removes
+                the part of the ring outside of the rotation_angle.
+            union: if True the channels are fused together. Defaults to None
+                which only fuses the channels if they touch each other.
+
+        Returns:
+            CadQuery.Workplane: the ring of coolant channels
+        """
+
+        if union is None:
+            union = not self.channels_are_disjoint()
+
+        return super().rotate_solid(solid, wedge_cut=wedge_cut, union=union)
+
     def find_points(self):
 
         points = [(self.ring_radius, 0)]
@@ -0,0 +1,177 @@
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+from cadquery import Assembly, Color, Compound, Location, Workplane
+from paramak import HexagonPin
+from paramak.utils import get_cq_shape
+
+
+class HexagonPinLattice(HexagonPin):
+    """Creates a hexagonal lattice of extruded hexagon pins. A single pin is
+    built and copies of it are placed at each lattice position as located
+    instances in one compound, so the pin geometry is only stored and
+    triangulated once however many pins there are.
+
+    Args:
+        length_of_side: the length of one side of each hexagon pin (mm).
+        distance: extruded distance along the y-direction (mm).
+        pitch: the distance between the centers of neighbouring pins (mm).
+            Must be at least the flat to flat width of a pin.
+        number_of_rings: the number of rings of pins in the lattice, where
+            the central pin counts as the first ring. Defaults to 2.
+        center_point: the center of the lattice on the x-z plane (mm).
+        stp_filename: defaults to "HexagonPinLattice.stp".
+        stl_filename: defaults to "HexagonPinLattice.stl".
+        name: defaults to "hexagon_pin_lattice".
+        material_tag: defaults to "hexagon_pin_mat".
+    """
+
+    def __init__(
+        self,
+        length_of_side: float,
+        distance: float,
+        pitch: float,
+        number_of_rings: Optional[int] = 2,
+        center_point: Tuple[float, float] = (0, 0),
+        stp_filename: Optional[str] = "HexagonPinLattice.stp",
+        stl_filename: Optional[str] = "HexagonPinLattice.stl",
+        name: Optional[str] = "hexagon_pin_lattice",
+        material_tag: Optional[str] = "hexagon_pin_mat",
+        **kwargs
+    ) -> None:
+
+        super().__init__(
+            length_of_side=length_of_side,
+            distance=distance,
+            center_point=center_point,
+            name=name,
+            material_tag=material_tag,
+            stp_filename=stp_filename,
+            stl_filename=stl_filename,
+            **kwargs
+        )
+
+        self.pitch = pitch
+        self.number_of_rings = number_of_rings
+
+    @property
+    def pitch(self):
+        return self._pitch
+
+    @pitch.setter
+    def pitch(self, pitch):
+        if not isinstance(pitch, (int, float)) or pitch <= 0:
+            raise ValueError(
+                "HexagonPinLattice.pitch must be a positive number")
+        self._pitch = pitch
+
+    @property
+    def number_of_rings(self):
+        return self._number_of_rings
+
+    @number_of_rings.setter
+    def number_of_rings(self, number_of_rings):
+        if not isinstance(number_of_rings, int) or number_of_rings < 1:
+            raise ValueError(
+                "HexagonPinLattice.number_of_rings must be an integer of 1 "
+                "or more")
+        self._number_of_rings = number_of_rings
+
+    @property
+    def pin_centers(self) -> List[Tuple[float, float]]:
+        """The centers of the pins on the workplane, starting with the central
+        pin and then working outwards ring by ring."""
+        offsets = self.find_pin_offsets()
+        return [
+            (x + self.center_point[0], y + self.center_point[1])
+            for x, y in offsets
+        ]
+
+    def find_pin_offsets(self) -> np.ndarray:
+        """Finds the positions of the pins relative to the central pin.
+
+        Returns:
+            numpy.ndarray: an array of the 2D offsets with shape (n, 2)
+        """
+
+        if self.pitch < math.sqrt(3) * self.length_of_side:
+            raise ValueError(
+                "HexagonPinLattice.pitch must be at least the flat to flat "
+                "width of the pins (sqrt(3) * length_of_side) otherwise the "
+                "pins overlap")
+
+        # the pins are flat topped so neighbouring pins are at 30 degrees
+        # plus multiples of 60 degrees
+        angles = np.radians(30 + 60 * np.arange(6))
+        directions = self.pitch * np.column_stack(
+            (np.cos(angles), np.sin(angles)))
+
+        offsets = [np.zeros(2)]
+        for ring in range(1, self.number_of_rings):
+            position = ring * directions[4]
+            for direction in directions:
+                for _ in range(ring):
+                    offsets.append(position)
+                    position = position + direction
+
+        return np.array(offsets)
+
+    def rotate_solid(self, solid, wedge_cut=None, union=None):
+        """Places located copies of the pin at each lattice position and then
+        places the lattice at the azimuth_placement_angle values.
+
+        Args:
+            solid: the pin to copy.
+            wedge_cut (paramak.CuttingWedgeFS): an optional wedge that removes
+                the part of the lattice outside of the rotation_angle.
+            union: not used as the pins never overlap.
+
+        Returns:
+            CadQuery.Workplane: the lattice of pins
+        """
+
+        pin = get_cq_shape(solid)
+        plane = Workplane(self.workplane).plane
+
+        copies = [
+            pin.moved(Location(plane.xDir * x + plane.yDir * y))
+            for x, y in self.find_pin_offsets()
+        ]
+        lattice = Workplane(self.workplane).newObject(
+            [Compound.makeCompound(copies)])
+
+        if wedge_cut is None and self.azimuth_placement_angle in [0, [0]]:
+            # rotating would copy the geometry of each instance
+            return lattice
+
+        return super().rotate_solid(lattice, wedge_cut=wedge_cut, union=False)
+
+    def _create_assembly(self) -> Assembly:
+        """Creates a CadQuery Assembly of the lattice. When every pin is still
+        an instance of the same geometry the pin is added once and referenced
+        at each pin location, so the stp file shares one pin definition.
+
+        Returns:
+            CadQuery.Assembly: the assembly of pins
+        """
+
+        solids = get_cq_shape(self.solid).Solids()
+        if not all(s.wrapped.IsPartner(solids[0].wrapped) for s in solids):
+            return super()._create_assembly()
+
+        color = None
+        if self.color is not None:
+            color = Color(*self.color)
+
+        pin = Assembly(
+            solids[0].located(Location()),
+            name=f"{self.name}_pin",
+            color=color)
+
+        assembly = Assembly(name=self.name)
+        for i, solid in enumerate(solids):
+            assembly.add(pin, loc=solid.location(), name=f"{self.name}_{i}")
+
+        return assembly
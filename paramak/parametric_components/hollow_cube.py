@@ -1,6 +1,9 @@
 
+from typing import List
+
 import cadquery as cq
 from paramak import Shape
+from paramak.utils import add_csg_surface
 
 
 class HollowCube(Shape):
@@ -72,3 +75,30 @@ class HollowCube(Shape):
         self.solid = new_shape
 
         return new_shape
+
+    def csg_region(self, surfaces: List[dict]) -> str:
+        """Finds the constructive solid geometry (CSG) description of the
+        HollowCube, which is the region inside the outer box planes and
+        outside of the inner box planes.
+
+        Args:
+            surfaces: the list of surfaces to add the planes to, see
+                paramak.utils.add_csg_surface.
+
+        Returns:
+            the region of the HollowCube in the OpenMC region syntax
+        """
+
+        boxes = []
+        for half_width in (
+                (self.length + self.thickness) / 2, self.length / 2):
+            half_spaces = []
+            for surface_type, coefficient in (
+                    ('x-plane', 'x0'), ('y-plane', 'y0'), ('z-plane', 'z0')):
+                half_spaces.append(add_csg_surface(
+                    surfaces, surface_type, **{coefficient: -half_width}))
+                half_spaces.append(-add_csg_surface(
+                    surfaces, surface_type, **{coefficient: half_width}))
+            boxes.append("(" + " ".join(str(h) for h in half_spaces) + ")")
+
+        return f"{boxes[0]} ~{boxes[1]}"
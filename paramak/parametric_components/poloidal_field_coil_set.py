@@ -1,5 +1,6 @@
 
 import cadquery as cq
+import numpy as np
 from paramak import RotateStraightShape
 
 
@@ -112,6 +113,20 @@ class PoloidalFieldCoilSet(RotateStraightShape):
 
         self.points = all_points
 
+    def _revolved_profiles(self, **kwargs):
+        """Finds the closed rectangle of each coil in the RZ plane.
+
+        Returns:
+            list of numpy arrays of the rectangle points with shapes of (5, 2)
+        """
+
+        corners = np.array([point[:2] for point in self.points[:-1]])
+
+        return [
+            np.concatenate((rectangle, rectangle[:1]))
+            for rectangle in corners.reshape(-1, 4, 2)
+        ]
+
     def create_solid(self):
         """Creates a 3d solid using points with straight connections
         edges, azimuth_placement_angle and rotation angle.
@@ -1,10 +1,14 @@
 
 import math
+from pathlib import Path
+from typing import Optional
 
 import cadquery as cq
+import numpy as np
 from paramak import RotateStraightShape
-from paramak.utils import (coefficients_of_line_from_points, intersect_solid,
-                           rotate)
+from paramak.geometry_2d import (clip_polygon, distances, line_coefficients,
+                                 rotate_points)
+from paramak.utils import split_solid
 
 
 class PoloidalSegments(RotateStraightShape):
@@ -98,42 +102,226 @@ class PoloidalSegments(RotateStraightShape):
 
         angle_per_segment = 360. / self.number_of_segments
 
-        points = []
-
-        current_angle = 0
-
         outer_point = (
             self.center_point[0] +
             self.max_distance_from_center,
             self.center_point[1])
-        for i in range(self.number_of_segments):
 
-            points.append(self.center_point)
+        angles = np.radians(
+            angle_per_segment * np.arange(self.number_of_segments + 1))
+        outer_points = rotate_points(self.center_point, outer_point, angles)
 
-            outer_point_1 = rotate(
-                self.center_point,
-                outer_point,
-                math.radians(current_angle)
-            )
+        # if the points go beyond the zero line then move them along the line
+        # to the center point until they are on the zero line
+        _, intercepts = line_coefficients(outer_points, self.center_point)
+        beyond_zero = outer_points[:, 0] < 0
+        outer_points[beyond_zero] = np.column_stack(
+            (np.zeros(beyond_zero.sum()), intercepts[beyond_zero]))
 
-            outer_point_2 = rotate(
-                self.center_point,
-                outer_point,
-                math.radians(current_angle + angle_per_segment)
-            )
+        # each segment is a triangle of the center point and two outer points
+        center_points = np.tile(
+            np.asarray(self.center_point, dtype=float),
+            (self.number_of_segments, 1))
+        points = np.stack(
+            (center_points, outer_points[:-1], outer_points[1:]), axis=1)
+
+        self.points = points.reshape(-1, 2)
+
+    def _is_revolved_profile(self) -> bool:
+        """The segments of a shape_to_segment are not described by the
+        points of the wedges."""
+
+        return self.shape_to_segment is None and super()._is_revolved_profile()
+
+    def _revolved_profiles(self, **kwargs):
+        """Finds the closed triangle of each wedge in the RZ plane.
+
+        Returns:
+            list of numpy arrays of the triangle points with shapes of (4, 2)
+        """
+
+        corners = np.array([point[:2] for point in self.points[:-1]])
+
+        return [
+            np.concatenate((triangle, triangle[:1]))
+            for triangle in corners.reshape(-1, 3, 2)
+        ]
+
+    def segment_areas(self, tolerance: Optional[float] = 1e-3) -> np.ndarray:
+        """Finds the surface area, volume and centroid of each segment of the
+        shape_to_segment from its faceted profile in the RZ plane, without
+        building the segments. The profile edges and the profile are clipped
+        to the wedge of each segment and revolved analytically with Pappus's
+        theorems, so a straight edge between radii r1 and r2 of length L
+        revolved by an angle sweeps an area of angle * L * (r1 + r2) / 2. The
+        surfaces facing the center_point are also found separately as these
+        are the surfaces used for neutron wall loading. The ends of partially
+        rotated shapes are not included in the surface areas and the
+        shape_to_segment is assumed to be within max_distance_from_center of
+        the center_point.
+
+        Args:
+            tolerance: faceting tolerance to use when faceting circles and
+                splines of the shape_to_segment points. Defaults to 1e-3.
+
+        Returns:
+            numpy structured array with a row for each segment and the fields
+            "segment", "start_angle" and "end_angle" (degrees), "area",
+            "facing_area", "facing_centroid_r" and "facing_centroid_z" (the
+            RZ centroid of the facing surface) and "volume"
+        """
+
+        shape = self.shape_to_segment
+        if shape is None or not shape._is_revolved_profile():
+            raise ValueError(
+                "PoloidalSegmenter.segment_areas requires a shape_to_segment "
+                "revolved from points on the XZ workplane about the Z axis")
 
-            # if the point goes beyond the zero line then set to zero
-            for new_point in [outer_point_1, outer_point_2]:
-                if new_point[0] < 0:
-                    m, c = coefficients_of_line_from_points(
-                        new_point, self.center_point)
-                    points.append((0, c))
-                else:
-                    points.append(new_point)
+        # copies at each azimuth_placement_angle are assumed not to overlap
+        revolved_angle = math.radians(min(
+            shape.rotation_angle * len(shape._azimuth_placement_angles()),
+            360))
 
-            current_angle = current_angle + angle_per_segment
+        center = np.asarray(self.center_point, dtype=float)
+        angle_per_segment = 360. / self.number_of_segments
+        start_angles = angle_per_segment * np.arange(self.number_of_segments)
+        end_angles = start_angles + angle_per_segment
+        # the normals of the sides of the wedges point into the wedges
+        start_normals = np.column_stack(
+            (-np.sin(np.radians(start_angles)),
+             np.cos(np.radians(start_angles))))
+        end_normals = np.column_stack(
+            (np.sin(np.radians(end_angles)), -np.cos(np.radians(end_angles))))
+
+        table = np.zeros(
+            self.number_of_segments,
+            dtype=[("segment", int), ("start_angle", float),
+                   ("end_angle", float), ("area", float),
+                   ("facing_area", float), ("facing_centroid_r", float),
+                   ("facing_centroid_z", float), ("volume", float)])
+        table["segment"] = np.arange(self.number_of_segments)
+        table["start_angle"] = start_angles
+        table["end_angle"] = end_angles
+        facing_moments = np.zeros((self.number_of_segments, 2))
+
+        for profile in shape._revolved_profiles(tolerance=tolerance):
+            signed_area = np.sum(
+                profile[:-1, 0] * profile[1:, 1] -
+                profile[1:, 0] * profile[:-1, 1])
+            if signed_area < 0:
+                profile = profile[::-1]
+            starts, ends = profile[:-1], profile[1:]
+            directions = ends - starts
+
+            # the normals of the edges point out of the counterclockwise
+            # profile
+            normals = np.column_stack((directions[:, 1], -directions[:, 0]))
+            facing = np.sum(
+                normals * (center - (starts + ends) / 2), axis=1) > 0
+
+            # the fractions along each edge where it enters and leaves each
+            # wedge, with edges along the side of two wedges only in the
+            # wedge that starts at that side
+            entering = np.zeros((self.number_of_segments, len(starts)))
+            leaving = np.ones((self.number_of_segments, len(starts)))
+            if self.number_of_segments > 1:
+                for wedge_normals, on_side_inside in (
+                        (start_normals, True), (end_normals, False)):
+                    sides = (starts - center) @ wedge_normals.T
+                    changes = directions @ wedge_normals.T
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        fractions = -sides.T / changes.T
+                    entering = np.where(
+                        changes.T > 0, np.maximum(entering, fractions),
+                        entering)
+                    leaving = np.where(
+                        changes.T < 0, np.minimum(leaving, fractions),
+                        leaving)
+                    outside = sides.T < 0 if on_side_inside else \
+                        sides.T <= 0
+                    leaving[(changes.T == 0) & outside] = -1
+            leaving = np.maximum(leaving, entering)
+
+            piece_starts = starts + entering[..., np.newaxis] * directions
+            piece_ends = starts + leaving[..., np.newaxis] * directions
+            piece_lengths = distances(piece_starts, piece_ends)
+            r_1, z_1 = piece_starts[..., 0], piece_starts[..., 1]
+            r_2, z_2 = piece_ends[..., 0], piece_ends[..., 1]
+
+            # the integrals of r, r^2 and r z along the pieces of edges
+            r_integrals = piece_lengths * (r_1 + r_2) / 2
+            r_squared_integrals = piece_lengths * (
+                r_1 * r_1 + r_1 * r_2 + r_2 * r_2) / 3
+            rz_integrals = piece_lengths * (
+                2 * r_1 * z_1 + r_1 * z_2 + r_2 * z_1 + 2 * r_2 * z_2) / 6
+
+            table["area"] += revolved_angle * r_integrals.sum(axis=1)
+            table["facing_area"] += revolved_angle * \
+                r_integrals[:, facing].sum(axis=1)
+            facing_moments[:, 0] += r_squared_integrals[:, facing].sum(axis=1)
+            facing_moments[:, 1] += rz_integrals[:, facing].sum(axis=1)
+
+            for segment in range(self.number_of_segments):
+                clipped = profile
+                if self.number_of_segments > 1:
+                    clipped = clip_polygon(
+                        clipped, center, start_normals[segment])
+                    if len(clipped) > 0:
+                        clipped = clip_polygon(
+                            clipped, center, end_normals[segment])
+                if len(clipped) == 0:
+                    continue
+                # the volume is the angle times the integral of r over the
+                # area, found with Green's theorem
+                r_1, z_1 = clipped[:-1, 0], clipped[:-1, 1]
+                r_2, z_2 = clipped[1:, 0], clipped[1:, 1]
+                table["volume"][segment] += revolved_angle * np.sum(
+                    (r_1 + r_2) * (r_1 * z_2 - r_2 * z_1)) / 6
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            table["facing_centroid_r"] = facing_moments[:, 0] / \
+                table["facing_area"] * revolved_angle
+            table["facing_centroid_z"] = facing_moments[:, 1] / \
+                table["facing_area"] * revolved_angle
+
+        return table
+
+    def export_segment_areas(
+        self,
+        filename: Optional[str] = "segment_areas.csv",
+        tolerance: Optional[float] = 1e-3,
+    ) -> str:
+        """Saves the table of PoloidalSegmenter.segment_areas to a CSV file,
+        or to a NumPy .npy file if the filename ends with .npy.
+
+        Args:
+            filename: the filename of the table. Defaults to
+                "segment_areas.csv".
+            tolerance: faceting tolerance to use when faceting circles and
+                splines of the shape_to_segment points. Defaults to 1e-3.
+
+        Returns:
+            the filename of the table
+        """
+
+        table = self.segment_areas(tolerance=tolerance)
+
+        path_filename = Path(filename)
+        path_filename.parents[0].mkdir(parents=True, exist_ok=True)
+
+        if path_filename.suffix == ".npy":
+            np.save(path_filename, table)
+        else:
+            np.savetxt(
+                path_filename,
+                table,
+                delimiter=",",
+                header=",".join(table.dtype.names),
+                comments="",
+                fmt=["%d"] + ["%.10g"] * (len(table.dtype.names) - 1),
+            )
 
-        self.points = points
+        return str(path_filename)
 
     def create_solid(self):
         """Creates a 3d solid using points with straight edges. Individual
@@ -172,13 +360,16 @@ class PoloidalSegments(RotateStraightShape):
 
         else:
 
-            intersected_solids = []
-            for segment in triangle_wedges:
-                overlap = intersect_solid(segment, self.shape_to_segment)
-                intersected_solids.append(overlap)
+            # splits the shape between all the wedges in one operation
+            segments = split_solid(
+                self.shape_to_segment.solid, triangle_wedges)
 
             compound = cq.Compound.makeCompound(
-                [a.val() for a in intersected_solids]
+                [
+                    parts[0] if len(parts) == 1
+                    else cq.Compound.makeCompound(parts)
+                    for parts in segments
+                ]
             )
 
         self.solid = compound
@@ -141,6 +141,8 @@ class TFCoilCasing(ExtrudeMixedShape):
         self.leg_shape.distance = self.distance
         self.leg_shape.azimuth_placement_angle = \
             self.azimuth_placement_angle
+        # only the legs and cutters within the sector are built
+        self.leg_shape.rotation_angle = self.rotation_angle
         solid = union_solid(solid, self.leg_shape)
         solid = cut_solid(solid, self.magnet)
 
@@ -148,7 +150,8 @@ class TFCoilCasing(ExtrudeMixedShape):
         inner_bore_cutting_shape = ExtrudeStraightShape(
             points=self.inner_bore_cutting_points,
             distance=self.distance,
-            azimuth_placement_angle=self.azimuth_placement_angle
+            azimuth_placement_angle=self.azimuth_placement_angle,
+            rotation_angle=self.rotation_angle
         )
         solid = cut_solid(solid, inner_bore_cutting_shape)
 
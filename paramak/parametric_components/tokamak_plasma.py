@@ -1,6 +1,12 @@
 
+from numbers import Integral
+from typing import Optional, Tuple
+
 import numpy as np
 from paramak import RotateSplineShape
+from paramak.geometry_2d import (distances, point_segment_distances,
+                                 points_in_polygon)
+from paramak.utils import facet_points, simplify_polyline
 
 
 class Plasma(RotateSplineShape):
@@ -25,6 +31,12 @@ class Plasma(RotateSplineShape):
             Defaults to "non-null".
         x_point_shift (float, optional): shift parameters for locating the
             X points in [0, 1]. Defaults to 0.1.
+        simplification_tolerance (float, optional): if set, the sampled
+            boundary points are simplified with the Douglas-Peucker algorithm
+            so that every removed point is within this distance (cm) of the
+            spline through the remaining points. Fewer spline points give
+            lighter solids, stp files and meshes. Defaults to None which keeps
+            every point.
         name (str, optional): Defaults to "plasma".
         material_tag (str, optional): defaults to "DT_plasma".
         stp_filename (str, optional): defaults to "plasma.stp".
@@ -41,6 +53,7 @@ class Plasma(RotateSplineShape):
         num_points=50,
         configuration="non-null",
         x_point_shift=0.1,
+        simplification_tolerance=None,
         name="plasma",
         material_tag="DT_plasma",
         stp_filename="plasma.stp",
@@ -65,6 +78,8 @@ class Plasma(RotateSplineShape):
         self.num_points = num_points
         self.configuration = configuration
         self.x_point_shift = x_point_shift
+        self.simplification_tolerance = simplification_tolerance
+        self._number_of_removed_points = 0
 
         self.outer_equatorial_point = None
         self.inner_equatorial_point = None
@@ -174,6 +189,167 @@ class Plasma(RotateSplineShape):
         else:
             self._elongation = value
 
+    @property
+    def simplification_tolerance(self):
+        return self._simplification_tolerance
+
+    @simplification_tolerance.setter
+    def simplification_tolerance(self, value):
+        if value is not None and value <= 0:
+            raise ValueError(
+                "simplification_tolerance must be a positive number or None")
+        self._simplification_tolerance = value
+
+    @property
+    def number_of_removed_points(self):
+        """The number of boundary points removed by the
+        simplification_tolerance, which is found from the current points."""
+        # the points are found again if any of the parameters have changed
+        self.points
+        return self._number_of_removed_points
+
+    def simplify_points(self, points: np.ndarray) -> np.ndarray:
+        """Removes the boundary points that are not needed to describe the
+        plasma within the simplification_tolerance. The points are first
+        simplified as a polyline with the Douglas-Peucker algorithm. The
+        spline through the kept points can stray further from the removed
+        points than the polyline, so the removed point furthest from the
+        faceted spline is then added back until every point is within the
+        simplification_tolerance of the spline. The number of points removed
+        is stored for the number_of_removed_points property.
+
+        Args:
+            points: the (n, 2) array of points around the closed boundary,
+                without the first point repeated at the end.
+
+        Returns:
+            numpy.ndarray: the points that are kept
+        """
+
+        if self.simplification_tolerance is None or len(points) <= 3:
+            self._number_of_removed_points = 0
+            return points
+
+        closed_points = np.vstack((points, points[:1]))
+        keep = simplify_polyline(
+            closed_points, tolerance=self.simplification_tolerance)
+        # the repeated first point is not part of the plasma points
+        keep = keep[keep < len(points)]
+
+        # the faceted spline is within a tenth of the tolerance of the spline
+        facet_tolerance = self.simplification_tolerance / 10
+        while len(keep) < len(points):
+            spline = facet_points(
+                [(x, z, "spline") for x, z in points[np.append(keep, 0)]],
+                tolerance=facet_tolerance)
+            deviations = point_segment_distances(
+                points, spline[:-1], spline[1:]).min(axis=1)
+            furthest = np.argmax(deviations)
+            if deviations[furthest] + facet_tolerance <= \
+                    self.simplification_tolerance:
+                break
+            keep = np.union1d(keep, [furthest])
+
+        self._number_of_removed_points = len(points) - len(keep)
+
+        return points[keep]
+
+    def sample_source_positions(
+        self,
+        number_of_samples: int,
+        emissivity_exponent: Optional[float] = None,
+        seed: Optional[int] = None,
+        tolerance: Optional[float] = 1e-3,
+        filename: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples neutron source positions uniformly within the volume of
+        the plasma. Points in the RZ plane are drawn within the bounding box
+        of the faceted plasma profile, with the radii drawn in proportion to
+        the radius as the revolved volume is, and the points outside of the
+        profile are rejected. Each accepted point is then placed at a random
+        azimuthal angle within the revolved plasma. Weights can be found from
+        a simple emissivity profile of (1 - rho^2)^emissivity_exponent where
+        rho is the fraction of the distance from the plasma center
+        (major_radius, vertical_displacement) to the plasma edge.
+
+        Args:
+            number_of_samples: the number of source positions to sample,
+                which must be a positive integer.
+            emissivity_exponent: the exponent of the emissivity profile used
+                for the weights. Defaults to None which gives every position
+                the same weight.
+            seed: the seed of the random number generator, so that the same
+                positions can be sampled again. Defaults to None.
+            tolerance: faceting tolerance to use when faceting the spline of
+                the plasma points. Defaults to 1e-3.
+            filename: if set the positions and weights are also saved to this
+                NumPy .npz file. Defaults to None.
+
+        Returns:
+            numpy arrays of the positions with a shape of (N, 3) and of the
+            weights with a shape of (N,) that sum to 1
+        """
+
+        if isinstance(number_of_samples, bool) or \
+                not isinstance(number_of_samples, Integral) or \
+                number_of_samples < 1:
+            raise ValueError(
+                "number_of_samples must be a positive integer")
+
+        if not self._is_revolved_profile():
+            raise ValueError(
+                "Plasma.sample_source_positions requires a plasma revolved "
+                "from the XZ workplane about the Z axis")
+
+        profile = self._revolved_profiles(tolerance=tolerance)[0]
+        rng = np.random.default_rng(seed)
+
+        (r_min, z_min), (r_max, z_max) = \
+            profile.min(axis=0), profile.max(axis=0)
+        profile_area = abs(np.sum(
+            profile[:-1, 0] * profile[1:, 1] -
+            profile[1:, 0] * profile[:-1, 1])) / 2
+        acceptance = profile_area / ((r_max - r_min) * (z_max - z_min))
+
+        samples = []
+        number_remaining = number_of_samples
+        while number_remaining > 0:
+            # a few extra points are drawn so that one batch is usually enough
+            batch_size = int(1.1 * number_remaining / acceptance) + 100
+            radii = np.sqrt(rng.uniform(r_min ** 2, r_max ** 2, batch_size))
+            heights = rng.uniform(z_min, z_max, batch_size)
+            batch = np.column_stack((radii, heights))
+            batch = batch[points_in_polygon(batch, profile)][:number_remaining]
+            samples.append(batch)
+            number_remaining -= len(batch)
+        radii, heights = np.concatenate(samples).T
+
+        # each revolved copy has the same volume so is equally likely
+        azimuths = np.radians(
+            rng.choice(self._azimuth_placement_angles(), number_of_samples) +
+            rng.uniform(0, self.rotation_angle, number_of_samples))
+        positions = np.column_stack(
+            (radii * np.cos(azimuths), radii * np.sin(azimuths), heights))
+
+        if emissivity_exponent is None:
+            weights = np.full(number_of_samples, 1 / number_of_samples)
+        else:
+            center = (self.major_radius, self.vertical_displacement)
+            edge_angles = np.arctan2(
+                profile[:, 1] - center[1], profile[:, 0] - center[0])
+            edge_distances = distances(center, profile)
+            angles = np.arctan2(heights - center[1], radii - center[0])
+            rho = distances(center, np.column_stack((radii, heights))) / \
+                np.interp(angles, edge_angles, edge_distances,
+                          period=2 * np.pi)
+            weights = np.clip(1 - rho ** 2, 0, None) ** emissivity_exponent
+            weights /= weights.sum()
+
+        if filename is not None:
+            np.savez(filename, positions=positions, weights=weights)
+
+        return positions, weights
+
     def compute_x_points(self):
         """Computes the location of X points based on plasma parameters and
         configuration
@@ -227,4 +403,6 @@ class Plasma(RotateSplineShape):
                 + self.vertical_displacement
             )
 
-        self.points = np.stack((R(theta), Z(theta)), axis=1).tolist()
+        points = np.stack((R(theta), Z(theta)), axis=1)
+
+        self.points = self.simplify_points(points)
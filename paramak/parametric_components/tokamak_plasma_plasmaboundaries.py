@@ -84,4 +84,4 @@ class PlasmaBoundaries(Plasma):
 
         points = points[
             (points[:, 1] >= lower_point_y) & (points[:, 1] <= upper_point_y)]
-        self.points = points.tolist()[:-1]
+        self.points = self.simplify_points(points[:-1])
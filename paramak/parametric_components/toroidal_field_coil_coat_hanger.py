@@ -243,10 +243,9 @@ class ToroidalFieldCoilCoatHanger(ExtrudeStraightShape):
 
         solid = wire.extrude(distance=-self.distance / 2.0, both=True)
 
-        solid = self.rotate_solid(solid)
-
         cutting_wedge = calculate_wedge_cut(self)
-        solid = self.perform_boolean_operations(solid, wedge_cut=cutting_wedge)
+        solid = self.rotate_solid(solid, wedge_cut=cutting_wedge)
+        solid = self.perform_boolean_operations(solid)
 
         if self.with_inner_leg is True:
             inner_leg_solid = cq.Workplane(self.workplane)
@@ -255,9 +254,9 @@ class ToroidalFieldCoilCoatHanger(ExtrudeStraightShape):
             inner_leg_solid = inner_leg_solid.close().extrude(
                 distance=-self.distance / 2.0, both=True)
 
-            inner_leg_solid = self.rotate_solid(inner_leg_solid)
-            inner_leg_solid = self.perform_boolean_operations(
+            inner_leg_solid = self.rotate_solid(
                 inner_leg_solid, wedge_cut=cutting_wedge)
+            inner_leg_solid = self.perform_boolean_operations(inner_leg_solid)
 
             solid = cq.Compound.makeCompound(
                 [a.val() for a in [inner_leg_solid, solid]]
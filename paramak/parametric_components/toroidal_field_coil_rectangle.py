@@ -1,9 +1,12 @@
 
-from typing import Optional, Tuple
+import math
+from typing import List, Optional, Tuple
 import cadquery as cq
 import numpy as np
 from paramak import ExtrudeStraightShape
-from paramak.utils import calculate_wedge_cut
+from paramak.geometry_2d import rectilinear_rectangles
+from paramak.utils import (add_csg_surface, calculate_wedge_cut,
+                           csg_sector_region)
 
 
 class ToroidalFieldCoilRectangle(ExtrudeStraightShape):
@@ -142,10 +145,9 @@ class ToroidalFieldCoilRectangle(ExtrudeStraightShape):
 
         solid = wire.extrude(distance=-self.distance / 2.0, both=True)
 
-        solid = self.rotate_solid(solid)
-
         cutting_wedge = calculate_wedge_cut(self)
-        solid = self.perform_boolean_operations(solid, wedge_cut=cutting_wedge)
+        solid = self.rotate_solid(solid, wedge_cut=cutting_wedge)
+        solid = self.perform_boolean_operations(solid)
 
         if self.with_inner_leg is True:
             inner_leg_solid = cq.Workplane(self.workplane)
@@ -154,9 +156,9 @@ class ToroidalFieldCoilRectangle(ExtrudeStraightShape):
             inner_leg_solid = inner_leg_solid.close().extrude(
                 distance=-self.distance / 2.0, both=True)
 
-            inner_leg_solid = self.rotate_solid(inner_leg_solid)
-            inner_leg_solid = self.perform_boolean_operations(
+            inner_leg_solid = self.rotate_solid(
                 inner_leg_solid, wedge_cut=cutting_wedge)
+            inner_leg_solid = self.perform_boolean_operations(inner_leg_solid)
 
             solid = cq.Compound.makeCompound(
                 [a.val() for a in [inner_leg_solid, solid]]
@@ -165,3 +167,70 @@ class ToroidalFieldCoilRectangle(ExtrudeStraightShape):
         self.solid = solid   # not necessarily required as set in boolean_operations
 
         return solid
+
+    def csg_region(self, surfaces: List[dict]) -> Optional[str]:
+        """Finds the constructive solid geometry (CSG) description of the
+        coils made from planes. The profile of the coils only has horizontal
+        and vertical edges, so it is split into rectangles that are each
+        bounded by two z-planes and two planes normal to the radial direction
+        of a coil. Each coil is also bounded by the two planes either side of
+        its profile, half of the distance away.
+
+        Args:
+            surfaces: the list of surfaces to add the planes to, see
+                paramak.utils.add_csg_surface.
+
+        Returns:
+            the region of the coils in the OpenMC region syntax, or None if
+            the coils are not placed about the Z axis from the XZ workplane
+            or have boolean operations
+        """
+
+        if self.workplane != 'XZ' or self.get_rotation_axis()[1] != 'Z' \
+                or self.cut is not None or self.intersect is not None \
+                or self.union is not None:
+            return None
+
+        profiles = [self.point_coordinates]
+        if self.with_inner_leg is True:
+            profiles.append(np.array(self.inner_leg_connection_points))
+        rectangles = np.concatenate(
+            [rectilinear_rectangles(profile) for profile in profiles])
+
+        coils = []
+        for angle in self.azimuth_placement_angle:
+            cos_angle = math.cos(math.radians(angle))
+            sin_angle = math.sin(math.radians(angle))
+            # the planes through the profile have the radial direction of
+            # the coil as their normal, the side planes have the tangential
+            # direction
+            sides = [
+                add_csg_surface(
+                    surfaces, 'plane', a=-sin_angle, b=cos_angle, c=0, d=d)
+                for d in (-self.distance / 2, self.distance / 2)
+            ]
+            boxes = []
+            for u_min, u_max, z_min, z_max in rectangles:
+                half_spaces = [
+                    add_csg_surface(
+                        surfaces, 'plane',
+                        a=cos_angle, b=sin_angle, c=0, d=u_min),
+                    -add_csg_surface(
+                        surfaces, 'plane',
+                        a=cos_angle, b=sin_angle, c=0, d=u_max),
+                    add_csg_surface(surfaces, 'z-plane', z0=z_min),
+                    -add_csg_surface(surfaces, 'z-plane', z0=z_max),
+                ]
+                boxes.append(
+                    "(" + " ".join(str(h) for h in half_spaces) + ")")
+            coils.append(
+                f"({sides[0]} -{sides[1]} (" + " | ".join(boxes) + "))")
+
+        region = "(" + " | ".join(coils) + ")"
+
+        # the coils are cut to the sector that starts at 0 degrees
+        if self.rotation_angle < 360:
+            region += " " + csg_sector_region(
+                surfaces, [0], self.rotation_angle)
+
+        return region
@@ -108,9 +108,9 @@ class ExtrudeCircleShape(Shape):
             distance=extrusion_distance,
             both=self.extrude_both)
 
-        solid = self.rotate_solid(solid)
         cutting_wedge = calculate_wedge_cut(self)
-        solid = self.perform_boolean_operations(solid, wedge_cut=cutting_wedge)
+        solid = self.rotate_solid(solid, wedge_cut=cutting_wedge)
+        solid = self.perform_boolean_operations(solid)
         self.solid = solid
 
         return solid
@@ -96,9 +96,9 @@ class ExtrudeMixedShape(Shape):
         if hasattr(self, "add_fillet"):
             solid = self.add_fillet(solid)
 
-        solid = self.rotate_solid(solid)
         cutting_wedge = calculate_wedge_cut(self)
-        solid = self.perform_boolean_operations(solid, wedge_cut=cutting_wedge)
+        solid = self.rotate_solid(solid, wedge_cut=cutting_wedge)
+        solid = self.perform_boolean_operations(solid)
         self.solid = solid
 
         return solid
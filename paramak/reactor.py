@@ -1,18 +1,24 @@
 
 import collections
+import itertools
 import json
-import os
-import shutil
+import warnings
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
 
 import cadquery as cq
 import matplotlib.pyplot as plt
+import numpy as np
 from cadquery import exporters
 
 import paramak
-from paramak.utils import get_hash, _replace, add_stl_to_moab_core, define_moab_core_and_tags, export_vtk
+from paramak import geometry_2d
+from paramak.bounding_volume_hierarchy import BoundingVolumeHierarchy
+from paramak.utils import get_hash, _replace, add_stl_to_moab_core, define_moab_core_and_tags, export_vtk, \
+    add_triangles_to_moab_core, hollow_cube_triangles, sector_wedge_triangles, \
+    intermediate_folder
 
 
 class Reactor:
@@ -53,6 +59,13 @@ class Reactor:
             all the shapes and creating bounding boxes. This can be slow and
             that is why the user is able to provide a subsection of shapes to
             use when calculating the graveyard dimentions.
+        triangle_budget: the maximum total number of triangles to use when
+            faceting the shapes. If set (or if relative_faceting_tolerance is
+            set) each shape is faceted with its own tolerances found by
+            Reactor.adaptive_faceting_tolerances instead of the single
+            faceting_tolerance. Defaults to None.
+        relative_faceting_tolerance: the faceting tolerance of each shape as
+            a fraction of its size. Defaults to None.
         include_graveyard
         include_sector_wedge
     """
@@ -66,6 +79,8 @@ class Reactor:
             graveyard_size: Optional[float] = 20_000,
             graveyard_offset: Optional[float] = None,
             largest_shapes: Optional[List[paramak.Shape]] = None,
+            triangle_budget: Optional[int] = None,
+            relative_faceting_tolerance: Optional[float] = None,
     ):
 
         self.shapes_and_components = shapes_and_components
@@ -74,6 +89,8 @@ class Reactor:
         self.largest_shapes = largest_shapes
         self.faceting_tolerance = faceting_tolerance
         self.merge_tolerance = merge_tolerance
+        self.triangle_budget = triangle_budget
+        self.relative_faceting_tolerance = relative_faceting_tolerance
         self.method = method
 
         self.stp_filenames = []
@@ -156,6 +173,38 @@ class Reactor:
                 positive number")
         self._merge_tolerance = value
 
+    @property
+    def triangle_budget(self):
+        return self._triangle_budget
+
+    @triangle_budget.setter
+    def triangle_budget(self, value):
+        if value is None:
+            self._triangle_budget = None
+        elif not isinstance(value, int):
+            raise TypeError("Reactor.triangle_budget should be an int")
+        elif value < 1:
+            raise ValueError("Reactor.triangle_budget should be positive")
+        self._triangle_budget = value
+
+    @property
+    def relative_faceting_tolerance(self):
+        return self._relative_faceting_tolerance
+
+    @relative_faceting_tolerance.setter
+    def relative_faceting_tolerance(self, value):
+        if value is None:
+            self._relative_faceting_tolerance = None
+        elif not isinstance(value, (int, float)):
+            raise TypeError(
+                "Reactor.relative_faceting_tolerance should be a number "
+                "(floats or ints are accepted)")
+        elif value <= 0:
+            raise ValueError(
+                "Reactor.relative_faceting_tolerance should be a positive "
+                "number")
+        self._relative_faceting_tolerance = value
+
     @property
     def stp_filenames(self):
         values = []
@@ -443,6 +492,213 @@ class Reactor:
 
         return values
 
+    def _queried_shapes(
+            self,
+            include_plasma: Optional[bool] = False,
+    ) -> List[paramak.Shape]:
+        """Returns the Shapes to query for materials, optionally without the
+        plasma."""
+
+        shapes = []
+        for entry in self.shapes_and_components:
+            if include_plasma is False and (
+                isinstance(
+                    entry,
+                    (paramak.Plasma,
+                     paramak.PlasmaFromPoints,
+                     paramak.PlasmaBoundaries)) is True or entry.name == 'plasma'):
+                continue
+            shapes.append(entry)
+        return shapes
+
+    def _material_ids_at(
+            self,
+            points: np.ndarray,
+            shapes: List[paramak.Shape],
+            material_tags: List[str],
+            tolerance: float,
+    ) -> np.ndarray:
+        """Finds the index in the material_tags of the material of the first
+        Shape that contains each point, or -1 for points outside of every
+        Shape."""
+
+        material_ids = np.full(len(points), -1, dtype=np.int16)
+
+        for entry in shapes:
+            indices = np.flatnonzero(material_ids == -1)
+            if len(indices) == 0:
+                break
+            inside = indices[entry.contains(
+                points[indices], tolerance=tolerance)]
+            material_ids[inside] = material_tags.index(entry.material_tag)
+
+        return material_ids
+
+    def _prepare_queried_shapes(
+            self,
+            shapes: List[paramak.Shape],
+            tolerance: float,
+    ):
+        """Finds the points, faceted profiles and solids that Shape.contains
+        uses for each of the shapes. These are otherwise found lazily on first
+        use, which is not safe when the shapes are shared by threads."""
+
+        for entry in shapes:
+            entry.points
+            if entry._is_revolved_profile():
+                entry._revolved_profiles(tolerance=tolerance)
+            else:
+                entry.solid
+
+    def material_at(
+            self,
+            points,
+            include_plasma: Optional[bool] = False,
+            tolerance: Optional[float] = 1e-3,
+    ) -> np.ndarray:
+        """Finds the material_tag of the Shape that contains each of the
+        points. Revolved Shapes are queried with vectorised 2D tests of their
+        points and other Shapes are queried with OCC, see Shape.contains.
+        When Shapes overlap the first Shape in the
+        Reactor.shapes_and_components that contains the point is used.
+
+        Args:
+            points: the 3D coordinates of the points with a shape of (N, 3).
+            include_plasma: Should the plasma be included in the Shapes
+                queried.
+            tolerance: faceting tolerance to use when faceting circles and
+                splines of the Shape.points. Defaults to 1e-3.
+
+        Returns:
+            numpy array of the material tags with a shape of (N,) that is None
+            for points outside of every Shape
+        """
+
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        shapes = self._queried_shapes(include_plasma=include_plasma)
+        material_tags = list(dict.fromkeys(s.material_tag for s in shapes))
+
+        material_ids = self._material_ids_at(
+            points, shapes, material_tags, tolerance)
+
+        # the last entry is found by the material_ids of -1
+        return np.array(material_tags + [None], dtype=object)[material_ids]
+
+    def export_voxel_map(
+            self,
+            filename: Optional[str] = 'voxel_map.npz',
+            resolution: Union[int, Tuple[int, int, int]] = 100,
+            bounds: Optional[Tuple[Tuple[float, float, float],
+                                   Tuple[float, float, float]]] = None,
+            include_plasma: Optional[bool] = False,
+            tolerance: Optional[float] = 1e-3,
+            chunk_size: Optional[int] = 1000000,
+            parallel: Optional[bool] = False,
+            max_workers: Optional[int] = None,
+    ) -> str:
+        """Exports a regular grid of voxels with the material of the Shape
+        containing the centre of each voxel to a compressed numpy (npz) file.
+        The materials are found with Reactor.material_at for slabs of voxels
+        along the z axis so the memory used is bounded by the chunk_size. The
+        npz file contains the "material_ids" integer grid with a shape of
+        (nx, ny, nz), the "material_tags" lookup table where
+        material_tags[material_id] is the material_tag of each voxel and the
+        empty string marks voxels outside of every Shape (material_id 0), and
+        the "bounds" of the grid.
+
+        Args:
+            filename: the filename of the npz file. If the filename does not
+                end with .npz then .npz will be added.
+            resolution: the number of voxels along each of the x, y and z
+                axes, or along all of the axes if a single value is given.
+            bounds: the lower (x, y, z) and upper (x, y, z) corners of the
+                grid. Defaults to None which uses a cube that extends to
+                Reactor.largest_dimension in every direction.
+            include_plasma: Should the plasma be included.
+            tolerance: faceting tolerance to use when faceting circles and
+                splines of the Shape.points. Defaults to 1e-3.
+            chunk_size: the maximum number of voxels in each slab, unless a
+                single layer of the grid has more voxels.
+            parallel: find the materials of the slabs concurrently using a
+                pool of threads.
+            max_workers: the maximum number of threads to use when parallel is
+                True. Defaults to None which uses the concurrent.futures
+                default.
+
+        Returns:
+            filename of the npz file produced
+        """
+
+        if isinstance(resolution, int):
+            resolution = (resolution, resolution, resolution)
+        if len(resolution) != 3 or not all(
+                isinstance(value, int) and value > 0 for value in resolution):
+            raise ValueError(
+                "Reactor.export_voxel_map resolution must be a positive "
+                "integer or three positive integers")
+
+        if bounds is None:
+            largest_dimension = self.largest_dimension
+            bounds = ((-largest_dimension,) * 3, (largest_dimension,) * 3)
+        lower, upper = np.asarray(bounds, dtype=float)
+        if np.any(upper <= lower):
+            raise ValueError(
+                "Reactor.export_voxel_map bounds must have upper values "
+                "larger than the lower values")
+
+        path_filename = Path(filename)
+        if path_filename.suffix != ".npz":
+            path_filename = path_filename.with_suffix(".npz")
+        path_filename.parents[0].mkdir(parents=True, exist_ok=True)
+
+        # the coordinates of the voxel centres along each axis
+        nx, ny, nz = resolution
+        centres = [
+            low + (np.arange(number) + 0.5) * (high - low) / number
+            for low, high, number in zip(lower, upper, resolution)
+        ]
+        x, y = np.meshgrid(centres[0], centres[1], indexing='ij')
+        x, y = x.ravel(), y.ravel()
+
+        shapes = self._queried_shapes(include_plasma=include_plasma)
+        material_tags = list(dict.fromkeys(s.material_tag for s in shapes))
+
+        layers_per_slab = max(chunk_size // (nx * ny), 1)
+        slabs = [
+            range(start, min(start + layers_per_slab, nz))
+            for start in range(0, nz, layers_per_slab)
+        ]
+
+        material_ids = np.zeros(resolution, dtype=np.int16)
+
+        def fill_slab(slab):
+            points = np.column_stack((
+                np.tile(x, len(slab)),
+                np.tile(y, len(slab)),
+                np.repeat(centres[2][slab.start:slab.stop], nx * ny)))
+            slab_ids = self._material_ids_at(
+                points, shapes, material_tags, tolerance)
+            # the voxels outside of every Shape become material_id 0
+            material_ids[:, :, slab.start:slab.stop] = np.moveaxis(
+                slab_ids.reshape(len(slab), nx, ny), 0, -1) + 1
+
+        if parallel:
+            self._prepare_queried_shapes(shapes, tolerance)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(fill_slab, slabs))
+        else:
+            for slab in slabs:
+                fill_slab(slab)
+
+        np.savez_compressed(
+            path_filename,
+            material_ids=material_ids,
+            material_tags=np.array([''] + material_tags),
+            bounds=np.array([lower, upper]),
+        )
+
+        return str(path_filename)
+
     def export_neutronics_description(
             self,
             filename: Optional[str] = "manifest.json",
@@ -503,6 +759,72 @@ class Reactor:
 
         return str(path_filename)
 
+    def export_csg(
+            self,
+            filename: Optional[str] = "csg.json",
+            manifest_filename: Optional[str] = "hybrid_manifest.json",
+            include_plasma: Optional[bool] = False,
+    ) -> Tuple[str, str]:
+        """Saves a constructive solid geometry (CSG) description of the
+        Shapes that can be made exactly from planes and cylinders, such as
+        rectangular profiles revolved about the Z axis, the
+        ToroidalFieldCoilRectangle and the HollowCube, see Shape.csg_region. Particle transport through CSG cells is much faster
+        than through faceted DAGMC volumes. The CSG file contains the surfaces
+        and a cell with a region and material_tag for each of these Shapes,
+        using the surface types and region syntax of OpenMC. A hybrid manifest
+        is also saved which lists the CSG cells and contains the neutronics
+        description of the remaining Shapes (and the graveyard) to make into
+        a DAGMC geometry, for example with
+        paramak.utils.trelis_command_to_create_dagmc_h5m. The boundary
+        conditions of the CSG model are left to the neutronics model.
+
+        Args:
+            filename: the filename used to save the CSG description.
+            manifest_filename: the filename used to save the hybrid manifest.
+            include_plasma: should the plasma be included.
+
+        Returns:
+            the filenames of the CSG description and of the hybrid manifest
+        """
+
+        surfaces = []
+        cells = []
+        dagmc_description = []
+
+        for entry in self._queried_shapes(include_plasma=include_plasma):
+            region = entry.csg_region(surfaces)
+            if region is None:
+                dagmc_description.append(entry.neutronics_description())
+            else:
+                cells.append({
+                    "name": entry.name,
+                    "material_tag": entry.material_tag,
+                    "region": region,
+                })
+
+        if len(dagmc_description) > 0:
+            # this only takes the json values so the actual size doesn't matter
+            self.make_graveyard(graveyard_size=1)
+            dagmc_description.append(self.graveyard.neutronics_description())
+
+        path_filename = Path(filename)
+        path_manifest_filename = Path(manifest_filename)
+
+        for path, contents in (
+                (path_filename, {"surfaces": surfaces, "cells": cells}),
+                (path_manifest_filename, {
+                    "csg_filename": str(path_filename),
+                    "csg_cells": [cell["name"] for cell in cells],
+                    "dagmc": dagmc_description,
+                })):
+            path.parents[0].mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as outfile:
+                json.dump(contents, outfile, indent=4)
+
+        print("saved CSG description to ", path_filename)
+
+        return str(path_filename), str(path_manifest_filename)
+
     def export_stp(
             self,
             output_folder: Optional[str] = "",
@@ -599,6 +921,155 @@ class Reactor:
 
         return [filename]
 
+    def adaptive_faceting_tolerances(
+            self,
+            triangle_budget: Optional[int] = None,
+            relative_tolerance: Optional[float] = None,
+            include_plasma: Optional[bool] = True,
+    ) -> List[dict]:
+        """Finds faceting tolerances for each Shape in the reactor from the
+        size and curvature of the Shape so that large simple shapes (such as
+        the graveyard) are not faceted as finely as small or curved shapes.
+        The number of triangles that each Shape is faceted into is also
+        reported. See paramak.utils.find_adaptive_faceting_tolerances for
+        details of how the tolerances are found.
+
+        Args:
+            triangle_budget: the maximum total number of triangles. Defaults
+                to None which uses the Reactor.triangle_budget attribute.
+            relative_tolerance: the linear tolerance as a fraction of the size
+                of each Shape. Defaults to None which uses the
+                Reactor.relative_faceting_tolerance attribute.
+            include_plasma: Should the plasma be included.
+
+        Returns:
+            A list of dictionaries, one for each Shape, with the "name",
+            "material_tag", "stl_filename", "tolerance", "angular_tolerance"
+            and resulting number of "triangles"
+        """
+
+        if triangle_budget is None:
+            triangle_budget = self.triangle_budget
+        if relative_tolerance is None:
+            relative_tolerance = self.relative_faceting_tolerance
+
+        shapes = []
+        for entry in self.shapes_and_components:
+            if include_plasma is False and (
+                isinstance(
+                    entry,
+                    (paramak.Plasma,
+                     paramak.PlasmaFromPoints,
+                     paramak.PlasmaBoundaries)) is True or entry.name == 'plasma'):
+                continue
+            shapes.append(entry)
+
+        tolerances = paramak.utils.find_adaptive_faceting_tolerances(
+            solids=[entry.solid for entry in shapes],
+            triangle_budget=triangle_budget,
+            relative_tolerance=relative_tolerance,
+        )
+
+        for entry, tolerance in zip(shapes, tolerances):
+            tolerance["name"] = entry.name
+            tolerance["material_tag"] = entry.material_tag
+            tolerance["stl_filename"] = entry.stl_filename
+
+        return tolerances
+
+    def triangulations(
+            self,
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            include_plasma: Optional[bool] = True,
+            include_graveyard: Optional[bool] = False,
+            instanced: Optional[bool] = False,
+    ) -> List[dict]:
+        """Triangulates the surfaces of each Shape in the reactor in memory
+        without writing any files.
+
+        Args:
+            tolerance: the linear deflection tolerance of the faceting. Not
+                used if Reactor.triangle_budget or
+                Reactor.relative_faceting_tolerance are set as each Shape is
+                then faceted with the tolerances found by
+                Reactor.adaptive_faceting_tolerances.
+            angular_tolerance: the angular deflection tolerance of the
+                faceting in radians. Not used if adaptive faceting is enabled.
+            include_plasma: Should the plasma be included.
+            include_graveyard: specifiy if the graveyard will be included or
+                not. If True the the Reactor.make_graveyard will be called
+                using Reactor.graveyard_size and Reactor.graveyard_offset
+                attribute values.
+            instanced: only triangulate one of each set of solids in a Shape
+                that are rotated copies of each other (such as the copies
+                made with the Shape.azimuth_placement_angle). See
+                paramak.utils.tessellate_instances for details.
+
+        Returns:
+            A list of dictionaries, one for each Shape, with the "name",
+            "material_tag", "color", "vertices" (a numpy array with shape
+            (N, 3)) and "triangles" (a numpy array with shape (M, 3)). If
+            instanced is True there is a dictionary for each unique solid in
+            each Shape which also contains a list of 4x4 "matrices" that
+            place each copy of the solid.
+        """
+
+        if self.triangle_budget is not None or \
+                self.relative_faceting_tolerance is not None:
+            tolerances = self.adaptive_faceting_tolerances(
+                include_plasma=include_plasma)
+        else:
+            tolerances = None
+
+        shapes = []
+        for entry in self.shapes_and_components:
+            if include_plasma is False and (
+                isinstance(
+                    entry,
+                    (paramak.Plasma,
+                     paramak.PlasmaFromPoints,
+                     paramak.PlasmaBoundaries)) is True or entry.name == 'plasma'):
+                continue
+            shapes.append(entry)
+
+        if tolerances is None:
+            tolerances = [
+                {"tolerance": tolerance, "angular_tolerance": angular_tolerance}
+                for _ in shapes
+            ]
+
+        if include_graveyard:
+            shapes.append(self.make_graveyard())
+            tolerances.append(
+                {"tolerance": tolerance, "angular_tolerance": angular_tolerance}
+            )
+
+        triangulations = []
+        for entry, entry_tolerances in zip(shapes, tolerances):
+            if instanced:
+                instances = paramak.utils.tessellate_instances(
+                    entry.solid,
+                    tolerance=entry_tolerances["tolerance"],
+                    angular_tolerance=entry_tolerances["angular_tolerance"],
+                    rotation_axis=entry.get_rotation_axis()[0],
+                )
+            else:
+                vertices, triangles = paramak.utils.tessellate_solid(
+                    entry.solid,
+                    tolerance=entry_tolerances["tolerance"],
+                    angular_tolerance=entry_tolerances["angular_tolerance"],
+                )
+                instances = [{"vertices": vertices, "triangles": triangles}]
+
+            for instance in instances:
+                instance["name"] = entry.name
+                instance["material_tag"] = entry.material_tag
+                instance["color"] = entry.color
+                triangulations.append(instance)
+
+        return triangulations
+
     def export_stl(
             self,
             output_folder: Optional[str] = "",
@@ -609,7 +1080,10 @@ class Reactor:
 
         Args:
             output_folder (str): the folder for saving the stl files to
-            tolerance (float):  the precision of the faceting
+            tolerance (float):  the precision of the faceting. Not used if
+                Reactor.triangle_budget or Reactor.relative_faceting_tolerance
+                are set as each Shape is then faceted with the tolerances found
+                by Reactor.adaptive_faceting_tolerances.
             include_graveyard: specifiy if the graveyard will be included or
                 not. If True the the Reactor.make_graveyard will be called
                 using Reactor.graveyard_size and Reactor.graveyard_offset
@@ -626,6 +1100,12 @@ class Reactor:
                 self.stl_filenames,
             )
 
+        if self.triangle_budget is not None or \
+                self.relative_faceting_tolerance is not None:
+            adaptive_tolerances = iter(self.adaptive_faceting_tolerances())
+        else:
+            adaptive_tolerances = None
+
         filenames = []
         for entry in self.shapes_and_components:
             if entry.stl_filename is None:
@@ -633,11 +1113,20 @@ class Reactor:
                     "set .stl_filename attribute for Shapes before using the Reactor.export_stl method"
                 )
 
-            filename = entry.export_stl(
-                filename=Path(output_folder) / entry.stl_filename,
-                tolerance=tolerance,
-                verbose=False,
-            )
+            if adaptive_tolerances is None:
+                filename = entry.export_stl(
+                    filename=Path(output_folder) / entry.stl_filename,
+                    tolerance=tolerance,
+                    verbose=False,
+                )
+            else:
+                tolerances = next(adaptive_tolerances)
+                filename = entry.export_stl(
+                    filename=Path(output_folder) / entry.stl_filename,
+                    tolerance=tolerances["tolerance"],
+                    angular_tolerance=tolerances["angular_tolerance"],
+                    verbose=False,
+                )
             filenames.append(filename)
 
         # creates a graveyard (bounding shell volume) which is needed for
@@ -650,6 +1139,275 @@ class Reactor:
 
         return filenames
 
+    def check_meshes(
+            self,
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            include_plasma: Optional[bool] = False,
+            volume_tolerance: Optional[float] = 0.01,
+    ) -> List[dict]:
+        """Triangulates each Shape in the reactor in memory and checks the
+        triangles enclose the volume of the Shape without gaps, overlapping
+        or inconsistently oriented triangles, see Shape.check_mesh. A warning
+        naming the Shapes that fail the checks is raised so broken geometry
+        is found before it is used in a simulation.
+
+        Args:
+            tolerance: the linear deflection tolerance of the faceting. Not
+                used if adaptive faceting is enabled.
+            angular_tolerance: the angular deflection tolerance of the
+                faceting in radians. Not used if adaptive faceting is enabled.
+            include_plasma: Should the plasma be included.
+            volume_tolerance: the largest acceptable relative difference
+                between the volume enclosed by the triangles and the volume of
+                each Shape.
+
+        Returns:
+            list of dicts: the results of the checks for each Shape with the
+            "name" and "material_tag" of the Shape
+        """
+
+        shapes = self._queried_shapes(include_plasma=include_plasma)
+
+        if self.triangle_budget is not None or \
+                self.relative_faceting_tolerance is not None:
+            tolerances = self.adaptive_faceting_tolerances(
+                include_plasma=include_plasma)
+        else:
+            tolerances = [
+                {"tolerance": tolerance, "angular_tolerance": angular_tolerance}
+                for _ in shapes
+            ]
+
+        reports = []
+        for entry, entry_tolerances in zip(shapes, tolerances):
+            report = entry.check_mesh(
+                tolerance=entry_tolerances["tolerance"],
+                angular_tolerance=entry_tolerances["angular_tolerance"],
+                volume_tolerance=volume_tolerance,
+            )
+            report["name"] = entry.name
+            report["material_tag"] = entry.material_tag
+            reports.append(report)
+
+        invalid_names = [
+            report["name"] for report in reports if not report["valid"]]
+        if invalid_names:
+            warnings.warn(
+                "The meshes of these Shapes are not valid, check the "
+                "returned reports for details: {}".format(invalid_names))
+
+        return reports
+
+    @staticmethod
+    def _stl_mesh_is_valid(stl_filename: str) -> bool:
+        """Checks the triangles written to an stl file enclose a volume
+        without gaps and are consistently oriented outwards."""
+
+        vertices, triangles = paramak.utils.read_stl(stl_filename)
+
+        return paramak.utils.check_mesh(vertices, triangles)["valid"]
+
+    def check_overlaps(
+            self,
+            min_clearance: Optional[float] = 0.,
+            tolerance: Optional[float] = 0.01,
+            area_tolerance: Optional[float] = 1e-6,
+            include_plasma: Optional[bool] = False,
+    ) -> List[dict]:
+        """Checks the Shapes revolved about the Z axis for overlaps and for
+        gaps narrower than the min_clearance, while Shapes that touch are
+        allowed. The checks use the faceted profiles of the Shapes in
+        the RZ plane, which is much quicker than building the solids and
+        finds overlaps before the boolean operations and particle tracking
+        that they would break. Pairs of Shapes with bounding boxes further
+        apart than the min_clearance or with azimuthal sectors that do not
+        meet are not compared. Shapes that are not revolved from points are
+        not checked.
+
+        Args:
+            min_clearance: the smallest acceptable distance between Shapes
+                that do not touch. Defaults to 0 which allows any gap.
+            tolerance: faceting tolerance to use when faceting circles and
+                splines of the Shape.points.
+            area_tolerance: the largest acceptable area of overlap between
+                the profiles of two Shapes.
+            include_plasma: Should the plasma be included.
+
+        Returns:
+            list of dicts: the "names", "material_tags", "overlap_area",
+            "clearance" and "valid" result of each pair of Shapes compared
+        """
+
+        shapes = [
+            entry for entry in self._queried_shapes(
+                include_plasma=include_plasma)
+            if entry._is_revolved_profile()]
+        profiles = [
+            entry._revolved_profiles(tolerance=tolerance) for entry in shapes]
+        bounding_boxes = [
+            (np.concatenate(p).min(axis=0), np.concatenate(p).max(axis=0))
+            for p in profiles]
+
+        reports = []
+        for i, j in itertools.combinations(range(len(shapes)), 2):
+            (lower_a, upper_a), (lower_b, upper_b) = \
+                bounding_boxes[i], bounding_boxes[j]
+            if np.any(lower_a - upper_b > min_clearance) or \
+                    np.any(lower_b - upper_a > min_clearance):
+                continue
+            if not self._sectors_overlap(shapes[i], shapes[j]):
+                continue
+
+            overlap_area = sum(
+                geometry_2d.polygon_overlap_area(profile_a, profile_b)
+                for profile_a in profiles[i] for profile_b in profiles[j])
+            if overlap_area > area_tolerance:
+                clearance = 0.
+            else:
+                clearance = min(
+                    geometry_2d.polygon_clearance(profile_a, profile_b)
+                    for profile_a in profiles[i] for profile_b in profiles[j])
+
+            reports.append({
+                "names": (shapes[i].name, shapes[j].name),
+                "material_tags": (
+                    shapes[i].material_tag, shapes[j].material_tag),
+                "overlap_area": overlap_area,
+                "clearance": clearance,
+                "valid": bool(
+                    overlap_area <= area_tolerance
+                    and (clearance == 0 or clearance >= min_clearance)),
+            })
+
+        invalid_names = [
+            report["names"] for report in reports if not report["valid"]]
+        if invalid_names:
+            warnings.warn(
+                "These pairs of Shapes overlap or are closer than the "
+                "min_clearance, check the returned reports for details: "
+                "{}".format(invalid_names))
+
+        return reports
+
+    @staticmethod
+    def _sectors_overlap(shape_a: paramak.Shape, shape_b: paramak.Shape):
+        """Checks if the azimuthal sectors of two revolved Shapes meet."""
+
+        for angle_a in shape_a._azimuth_placement_angles():
+            for angle_b in shape_b._azimuth_placement_angles():
+                if (angle_b - angle_a) % 360 <= shape_a.rotation_angle or \
+                        (angle_a - angle_b) % 360 <= shape_b.rotation_angle:
+                    return True
+        return False
+
+    def cast_rays(
+            self,
+            origins,
+            directions,
+            max_distance: Optional[float] = np.inf,
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            include_plasma: Optional[bool] = False,
+            leaf_size: Optional[int] = 8,
+            chunk_size: Optional[int] = 10000,
+            parallel: Optional[bool] = False,
+            max_workers: Optional[int] = None,
+    ) -> dict:
+        """Finds the first Shape hit by each ray, for example for line of
+        sight studies or to find the angles that rays hit the first wall at.
+        The Shapes are triangulated in memory and the rays are traced through
+        a bounding volume hierarchy of the triangles with NumPy, see
+        paramak.bounding_volume_hierarchy.BoundingVolumeHierarchy. The
+        hierarchy is built for each call so many rays should be cast in one
+        call.
+
+        Args:
+            origins: the 3D coordinates of the starts of the rays with a shape
+                of (3,) or (N, 3).
+            directions: the directions of the rays with a shape of (3,) or
+                (N, 3), which are normally unit vectors.
+            max_distance: hits further along the rays than this are ignored.
+                Defaults to infinity.
+            tolerance: the linear deflection tolerance of the faceting.
+            angular_tolerance: the angular deflection tolerance of the
+                faceting in radians.
+            include_plasma: Should the plasma be included.
+            leaf_size: the number of triangles in each leaf of the hierarchy.
+            chunk_size: the number of rays traced together, which limits the
+                memory used.
+            parallel: If True then the chunks of rays are traced in a pool of
+                threads.
+            max_workers: the number of threads to use when parallel is True.
+                Defaults to None which lets concurrent.futures choose.
+
+        Returns:
+            dictionary with numpy arrays of the "distances" to the first hits
+            (inf for misses), the "points" hit and the unit "normals" of the
+            triangles hit (nan for misses), and the "names" and
+            "material_tags" of the Shapes hit (None for misses)
+        """
+
+        triangulations = self.triangulations(
+            tolerance=tolerance,
+            angular_tolerance=angular_tolerance,
+            include_plasma=include_plasma,
+        )
+
+        offsets = np.cumsum(
+            [0] + [len(t["vertices"]) for t in triangulations])
+        vertices = np.concatenate(
+            [t["vertices"] for t in triangulations] + [np.zeros((0, 3))])
+        triangles = np.concatenate(
+            [t["triangles"] + offset
+             for t, offset in zip(triangulations, offsets)] +
+            [np.zeros((0, 3), dtype=np.int64)])
+        # the index of rays that miss (-1) finds the last shape index
+        shape_indices = np.repeat(
+            np.arange(len(triangulations) + 1),
+            [len(t["triangles"]) for t in triangulations] + [1])
+
+        hierarchy = BoundingVolumeHierarchy(
+            vertices, triangles, leaf_size=leaf_size)
+        distances, triangle_indices = hierarchy.cast_rays(
+            origins,
+            directions,
+            max_distance=max_distance,
+            chunk_size=chunk_size,
+            parallel=parallel,
+            max_workers=max_workers,
+        )
+
+        origins, directions = np.broadcast_arrays(
+            np.asarray(origins, dtype=float).reshape(-1, 3),
+            np.asarray(directions, dtype=float).reshape(-1, 3))
+        hit = triangle_indices != -1
+
+        points = np.full(origins.shape, np.nan)
+        points[hit] = origins[hit] + \
+            distances[hit, np.newaxis] * directions[hit]
+
+        corners = vertices[triangles[triangle_indices[hit]]]
+        normals = np.full(origins.shape, np.nan)
+        normals[hit] = np.cross(
+            corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        normals[hit] /= np.linalg.norm(normals[hit], axis=1)[:, np.newaxis]
+
+        hit_shapes = shape_indices[triangle_indices]
+        names = np.array(
+            [t["name"] for t in triangulations] + [None], dtype=object)
+        material_tags = np.array(
+            [t["material_tag"] for t in triangulations] + [None],
+            dtype=object)
+
+        return {
+            "distances": distances,
+            "points": points,
+            "normals": normals,
+            "names": names[hit_shapes],
+            "material_tags": material_tags[hit_shapes],
+        }
+
     def export_vtk(
         self,
         filename: Optional[str] = 'dagmc.vtk',
@@ -689,6 +1447,49 @@ class Reactor:
 
         return vtk_filename
 
+    def export_vtm(
+            self,
+            filename: Optional[str] = 'reactor.vtm',
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            include_plasma: Optional[bool] = True,
+            include_graveyard: Optional[bool] = False,
+            parallel: Optional[bool] = False,
+    ) -> str:
+        """Produces a multi-block vtk file directly from the triangulated
+        surfaces of each Shape in the reactor, with one block per Shape and
+        the material_tag of each Shape stored as cell data. This is useful
+        for previewing the faceted geometry in ParaView without first
+        producing a h5m file.
+
+        Args:
+            filename: filename of vtm outputfile. If the filename does not end
+                with .vtm then .vtm will be added. The vtu file for each block
+                is saved in a folder with the same name as the vtm file minus
+                the suffix.
+            tolerance: the linear deflection tolerance of the faceting. Not
+                used if adaptive faceting is enabled.
+            angular_tolerance: the angular deflection tolerance of the
+                faceting in radians. Not used if adaptive faceting is enabled.
+            include_plasma: Should the plasma be included.
+            include_graveyard: optionally include the graveyard in the vtm file
+            parallel: write the blocks concurrently.
+
+        Returns:
+            filename of the vtm file produced
+        """
+
+        return paramak.utils.export_vtm(
+            blocks=self.triangulations(
+                tolerance=tolerance,
+                angular_tolerance=angular_tolerance,
+                include_plasma=include_plasma,
+                include_graveyard=include_graveyard,
+            ),
+            filename=filename,
+            parallel=parallel,
+        )
+
     def export_h5m(
             self,
             filename: Optional[str] = 'dagmc.h5m',
@@ -697,6 +1498,8 @@ class Reactor:
             method: Optional[str] = None,
             merge_tolerance: Optional[float] = None,
             faceting_tolerance: Optional[float] = None,
+            include_sector_wedge: Optional[bool] = False,
+            output_folder: Optional[str] = None,
     ) -> str:
         """Produces a h5m neutronics geometry compatable with DAGMC
         simulations. Tags the volumes with their material_tag attributes. Sets
@@ -721,6 +1524,14 @@ class Reactor:
                 https://svalinn.github.io/DAGMC/usersguide/trelis_basics.html
                 for more details. Defaults to None which uses the
                 Reactor.faceting_tolerance attribute.
+            include_sector_wedge: specifies if a reflective sector wedge will
+                be included when using the "pymoab" method. The "trelis"
+                method always includes the sector wedge.
+            output_folder: the folder to write the intermediate files (such
+                as stl or stp files) to. Defaults to None which uses a
+                temporary folder that is removed afterwards, so several
+                reactors can be exported at once without overwriting each
+                others files.
 
         Returns:
             The filename of the DAGMC file created
@@ -735,14 +1546,13 @@ class Reactor:
         if method is None:
             method = self.method
 
-        os.system('rm ' + filename)
-
         if method == 'trelis':
             output_filename = self.export_h5m_with_trelis(
                 filename=filename,
                 merge_tolerance=merge_tolerance,
                 faceting_tolerance=faceting_tolerance,
                 include_plasma=include_plasma,
+                output_folder=output_folder,
             )
         elif method == 'pymoab':
             output_filename = self.export_h5m_with_pymoab(
@@ -750,6 +1560,8 @@ class Reactor:
                 include_graveyard=include_graveyard,
                 faceting_tolerance=faceting_tolerance,
                 include_plasma=include_plasma,
+                include_sector_wedge=include_sector_wedge,
+                output_folder=output_folder,
             )
 
         else:
@@ -828,6 +1640,7 @@ class Reactor:
             merge_tolerance: Optional[float] = None,
             faceting_tolerance: Optional[float] = None,
             include_plasma: Optional[bool] = False,
+            output_folder: Optional[str] = None,
     ) -> str:
         """Produces a dagmc.h5m neutronics file compatable with DAGMC
         simulations using Coreform Trelis.
@@ -844,6 +1657,11 @@ class Reactor:
                 https://svalinn.github.io/DAGMC/usersguide/trelis_basics.html
                 for more details. Defaults to None which uses the
                 Reactor.faceting_tolerance attribute.
+            include_plasma: Should the plasma material be included in the h5m
+                file.
+            output_folder: the folder to write the stp files, manifest file
+                and the files produced by Trelis to. Defaults to None which
+                uses a temporary folder that is removed afterwards.
 
         Returns:
             filename of the DAGMC file produced
@@ -854,35 +1672,43 @@ class Reactor:
         if faceting_tolerance is None:
             faceting_tolerance = self.faceting_tolerance
 
-        if isinstance(self.shapes_and_components, list):
-            self.export_neutronics_description(
-                include_graveyard=True,
-                include_sector_wedge=True,
-                include_plasma=include_plasma,
-            )
-            self.export_stp(
-                include_graveyard=True,
-                include_sector_wedge=True,
-            )
-        elif isinstance(self.shapes_and_components, str):
-            if not Path(self.shapes_and_components).is_file():
-                raise FileNotFoundError("The filename entered as the geometry \
-                    argument {} does not exist".format(self.shapes_and_components))
-            if self.shapes_and_components != 'manifest.json':
-                shutil.copy(
-                    src=self.shapes_and_components,
-                    dst='manifest.json')
-        else:
-            raise ValueError(
-                "shapes_and_components must be a list of paramak.Shape or a filename")
+        with intermediate_folder(output_folder) as folder:
+            if isinstance(self.shapes_and_components, list):
+                manifest_filename = self.export_neutronics_description(
+                    filename=folder / 'manifest.json',
+                    include_graveyard=True,
+                    include_sector_wedge=True,
+                    include_plasma=include_plasma,
+                )
+                self.export_stp(
+                    output_folder=folder,
+                    include_graveyard=True,
+                    include_sector_wedge=True,
+                )
+            elif isinstance(self.shapes_and_components, str):
+                if not Path(self.shapes_and_components).is_file():
+                    raise FileNotFoundError("The filename entered as the geometry \
+                        argument {} does not exist".format(self.shapes_and_components))
+                manifest_filename = self.shapes_and_components
+            else:
+                raise ValueError(
+                    "shapes_and_components must be a list of paramak.Shape or a filename")
 
-        not_watertight_file = paramak.utils.trelis_command_to_create_dagmc_h5m(
-            faceting_tolerance=faceting_tolerance, merge_tolerance=merge_tolerance)
+            not_watertight_file = paramak.utils.trelis_command_to_create_dagmc_h5m(
+                faceting_tolerance=faceting_tolerance,
+                merge_tolerance=merge_tolerance,
+                h5m_filename=str(folder / 'dagmc_not_watertight.h5m'),
+                manifest_filename=str(manifest_filename),
+                cubit_filename=str(folder / 'dagmc.cub'),
+                trelis_filename=str(folder / 'dagmc.trelis'),
+                geometry_details_filename=str(
+                    folder / 'geometry_details.json'),
+            )
 
-        water_tight_h5m_filename = paramak.utils.make_watertight(
-            input_filename=not_watertight_file[0],
-            output_filename=filename
-        )
+            water_tight_h5m_filename = paramak.utils.make_watertight(
+                input_filename=not_watertight_file[0],
+                output_filename=filename
+            )
 
         self.h5m_filename = water_tight_h5m_filename
 
@@ -894,6 +1720,9 @@ class Reactor:
             include_graveyard: Optional[bool] = True,
             faceting_tolerance: Optional[float] = None,
             include_plasma: Optional[bool] = False,
+            include_sector_wedge: Optional[bool] = False,
+            output_folder: Optional[str] = None,
+            mesh_check: Optional[str] = "warn",
     ) -> str:
         """Converts stl files into DAGMC compatible h5m file using PyMOAB. The
         DAGMC file produced has not been imprinted and merged unlike the other
@@ -907,14 +1736,37 @@ class Reactor:
                 not. If True the the Reactor.make_graveyard will be called
                 using Reactor.graveyard_size and Reactor.graveyard_offset
                 attribute values.
-            faceting_tolerance: the precision of the faceting.
+            faceting_tolerance: the precision of the faceting. Not used if
+                Reactor.triangle_budget or Reactor.relative_faceting_tolerance
+                are set as each Shape is then faceted with the tolerances found
+                by Reactor.adaptive_faceting_tolerances.
             include_plasma: Should the plasma material be included in the h5m
                 file.
+            include_sector_wedge: specifies if a sector wedge with reflective
+                surfaces will be included. The graveyard and sector wedge
+                triangles are generated directly in MOAB without stl files.
+            output_folder: the folder to write the stl file of each Shape to.
+                Defaults to None which uses a temporary folder that is removed
+                afterwards, so nothing is written to the current working
+                directory apart from the h5m file.
+            mesh_check: the triangles of each stl file are checked for gaps,
+                overlapping or inconsistently oriented triangles with
+                paramak.utils.check_mesh as they are added. Shapes with
+                invalid meshes are named in a warning with "warn" or in a
+                ValueError raised before the h5m file is written with "raise".
+                None skips the checks. Defaults to "warn". The enclosed
+                volumes are not compared to the Shape volumes as they depend
+                on the faceting tolerance, see Reactor.check_meshes for that.
 
         Returns:
             The filename of the DAGMC file created
         """
 
+        if mesh_check not in ["warn", "raise", None]:
+            raise ValueError(
+                'Reactor.export_h5m_with_pymoab mesh_check must be "warn", '
+                '"raise" or None not {}'.format(mesh_check))
+
         if faceting_tolerance is None:
             faceting_tolerance = self.faceting_tolerance
 
@@ -929,70 +1781,127 @@ class Reactor:
 
         surface_id = 1
         volume_id = 1
+        invalid_meshes = []
 
-        if isinstance(self.shapes_and_components, list):
-            for entry in self.shapes_and_components:
+        with intermediate_folder(output_folder) as folder:
+            if isinstance(self.shapes_and_components, list):
 
-                if include_plasma is False and (
-                    isinstance(
-                        entry,
-                        (paramak.Plasma,
-                         paramak.PlasmaFromPoints,
-                         paramak.PlasmaBoundaries)) is True or entry.name == 'plasma'):
-                    continue
+                if self.triangle_budget is not None or \
+                        self.relative_faceting_tolerance is not None:
+                    adaptive_tolerances = iter(self.adaptive_faceting_tolerances(
+                        include_plasma=include_plasma))
+                else:
+                    adaptive_tolerances = None
+
+                for entry in self.shapes_and_components:
+
+                    if include_plasma is False and (
+                        isinstance(
+                            entry,
+                            (paramak.Plasma,
+                             paramak.PlasmaFromPoints,
+                             paramak.PlasmaBoundaries)) is True or entry.name == 'plasma'):
+                        continue
+
+                    if adaptive_tolerances is None:
+                        stl_filename = entry.export_stl(
+                            folder / entry.stl_filename,
+                            tolerance=faceting_tolerance)
+                    else:
+                        tolerances = next(adaptive_tolerances)
+                        stl_filename = entry.export_stl(
+                            folder / entry.stl_filename,
+                            tolerance=tolerances["tolerance"],
+                            angular_tolerance=tolerances["angular_tolerance"])
+                    if mesh_check is not None and not self._stl_mesh_is_valid(
+                            stl_filename):
+                        invalid_meshes.append(
+                            entry.name or Path(stl_filename).name)
+                    moab_core = add_stl_to_moab_core(
+                        moab_core,
+                        surface_id,
+                        volume_id,
+                        entry.material_tag,
+                        moab_tags,
+                        stl_filename)
+                    volume_id += 1
+                    surface_id += 1
+            else:
+                # loads up the json file
+                with open(self.shapes_and_components) as json_file:
+                    manifest = json.load(json_file)
+
+                # gets all the stp files and loads them into shapes
+                for entry in manifest:
+                    new_shape = paramak.Shape()
+                    # loads the stp file into a Shape object
+                    new_shape.from_stp_file(entry['stp_filename'])
+                    new_shape.material_tag = entry['material_tag']
+                    new_shape.stl_filename = str(
+                        Path(entry['stp_filename']).stem) + '.stl'
+
+                    stl_filename = new_shape.export_stl(
+                        folder / new_shape.stl_filename,
+                        tolerance=faceting_tolerance)
+                    if mesh_check is not None and not self._stl_mesh_is_valid(
+                            stl_filename):
+                        invalid_meshes.append(Path(stl_filename).name)
+
+                    moab_core = add_stl_to_moab_core(
+                        moab_core,
+                        surface_id,
+                        volume_id,
+                        new_shape.material_tag,
+                        moab_tags,
+                        stl_filename)
+                    volume_id += 1
+                    surface_id += 1
+
+        if invalid_meshes:
+            msg = "The meshes of these Shapes are not valid, check them " + \
+                "with Reactor.check_meshes: {}".format(invalid_meshes)
+            if mesh_check == "raise":
+                raise ValueError(msg)
+            warnings.warn(msg)
 
-                entry.export_stl(
-                    entry.stl_filename,
-                    tolerance=faceting_tolerance)
-                moab_core = add_stl_to_moab_core(
-                    moab_core,
-                    surface_id,
-                    volume_id,
-                    entry.material_tag,
-                    moab_tags,
-                    entry.stl_filename)
-                volume_id += 1
-                surface_id += 1
-        else:
-            # loads up the json file
-            with open(self.shapes_and_components) as json_file:
-                manifest = json.load(json_file)
-
-            # gets all the stp files and loads them into shapes
-            for entry in manifest:
-                new_shape = paramak.Shape()
-                # loads the stp file into a Shape object
-                new_shape.from_stp_file(entry['stp_filename'])
-                new_shape.material_tag = entry['material_tag']
-                new_shape.stl_filename = str(
-                    Path(entry['stp_filename']).stem) + '.stl'
-
-                new_shape.export_stl(
-                    new_shape.stl_filename,
+        if include_sector_wedge:
+            # the wedge is only described by its parameters, the solid of the
+            # CuttingWedge is never built
+            sector_wedge = self.make_sector_wedge()
+            if sector_wedge is not None:
+                vertices, triangles = sector_wedge_triangles(
+                    height=sector_wedge.height,
+                    radius=sector_wedge.radius,
+                    start_angle=sector_wedge.azimuth_placement_angle,
+                    end_angle=sector_wedge.azimuth_placement_angle +
+                    sector_wedge.rotation_angle,
                     tolerance=faceting_tolerance)
-
-                moab_core = add_stl_to_moab_core(
+                moab_core = add_triangles_to_moab_core(
                     moab_core,
                     surface_id,
                     volume_id,
-                    new_shape.material_tag,
+                    'reflective',
                     moab_tags,
-                    new_shape.stl_filename)
+                    vertices,
+                    triangles)
                 volume_id += 1
                 surface_id += 1
 
         if include_graveyard:
             self.make_graveyard()
-            self.graveyard.export_stl()
+            vertices, triangles = hollow_cube_triangles(
+                length=self.graveyard.length,
+                thickness=self.graveyard.thickness)
             volume_id += 1
             surface_id += 1
-            moab_core = add_stl_to_moab_core(
+            moab_core = add_triangles_to_moab_core(
                 moab_core,
                 surface_id,
                 volume_id,
                 self.graveyard.material_tag,
                 moab_tags,
-                self.graveyard.stl_filename
+                vertices,
+                triangles
             )
 
         all_sets = moab_core.get_entities_by_handle(0)
@@ -1276,17 +2185,62 @@ class Reactor:
 
         return filename
 
+    def export_glb(
+            self,
+            filename: Optional[str] = 'reactor.glb',
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            include_plasma: Optional[bool] = True,
+            include_graveyard: Optional[bool] = False,
+            quantize: Optional[bool] = True,
+    ) -> str:
+        """Saves a binary glTF (glb) 3d view of the Reactor which can be
+        opened in most 3D viewers and web browsers without a notebook. Each
+        Shape is exported with its name and color and rotated copies of a
+        solid (such as TF coils) are instanced so they are only stored once.
+
+        Args:
+            filename: filename of glb outputfile. If the filename does not end
+                with .glb then .glb will be added.
+            tolerance: the linear deflection tolerance of the faceting. Not
+                used if adaptive faceting is enabled.
+            angular_tolerance: the angular deflection tolerance of the
+                faceting in radians. Not used if adaptive faceting is enabled.
+            include_plasma: Should the plasma be included.
+            include_graveyard: optionally include the graveyard in the glb
+                file
+            quantize: store the vertex positions as 16 bit integers to reduce
+                the file size.
+
+        Returns:
+            filename of the glb file produced
+        """
+
+        return paramak.utils.export_glb(
+            meshes=self.triangulations(
+                tolerance=tolerance,
+                angular_tolerance=angular_tolerance,
+                include_plasma=include_plasma,
+                include_graveyard=include_graveyard,
+                instanced=True,
+            ),
+            filename=filename,
+            quantize=quantize,
+        )
+
     def export_html(
             self,
             filename: Optional[str] = "reactor.html",
             facet_splines: Optional[bool] = True,
             facet_circles: Optional[bool] = True,
             tolerance: Optional[float] = 1.,
-            view_plane: Optional[str] = 'RZ'):
-        """Creates a html graph representation of the points for the Shape
-        objects that make up the reactor. Shapes are colored by their .color
-        property. Shapes are also labelled by their .name. If filename provided
-        doesn't end with .html then .html will be added.
+            view_plane: Optional[str] = 'RZ',
+            max_points: Optional[int] = None):
+        """Creates a html graph representation of the outline of each Shape
+        object that makes up the reactor, with one trace per Shape. Shapes are
+        colored by their .color property. Shapes are also labelled by their
+        .name. If filename provided doesn't end with .html then .html will be
+        added. See Shape.outline_points for how the outlines are found.
 
         Args:
             filename: the filename used to save the html graph. Defaults to
@@ -1296,24 +2250,65 @@ class Reactor:
             facet_circles: If True then circle edges will be faceted. Defaults
                 to True.
             tolerance: faceting toleranceto use when faceting cirles and
-                splines. Defaults to 1e-3.
+                splines. Defaults to 1.
             view_plane: The plane to project. Options are 'XZ', 'XY', 'YZ',
                 'YX', 'ZY', 'ZX', 'RZ' and 'XYZ'. Defaults to 'RZ'. Defaults to
                 'RZ'.
+            max_points: the maximum number of points in the outline of each
+                Shape. Outlines with more points are simplified. Defaults to
+                None which keeps all the points.
         Returns:
             plotly.Figure(): figure object
         """
 
+        title = "coordinates of the " + self.__class__.__name__ + \
+            " reactor, viewed from the " + view_plane + " plane"
+
+        # a reactor loaded from a file has no Shape objects to outline
+        if isinstance(self.shapes_and_components, str):
+            return paramak.utils.export_wire_to_html(
+                wires=self.solid.Edges(),
+                filename=filename,
+                view_plane=view_plane,
+                facet_splines=facet_splines,
+                facet_circles=facet_circles,
+                tolerance=tolerance,
+                title=title,
+                mode="lines",
+            )
+
         fig = paramak.utils.export_wire_to_html(
-            wires=self.solid.Edges(),
-            filename=filename,
+            wires=[],
+            filename=None,
             view_plane=view_plane,
-            facet_splines=facet_splines,
-            facet_circles=facet_circles,
-            tolerance=tolerance,
-            title="coordinates of the " + self.__class__.__name__ +
-            " reactor, viewed from the " + view_plane + " plane",
-            mode="lines",
+            title=title,
         )
 
+        for entry in self.shapes_and_components:
+            fig.add_trace(
+                paramak.utils.plotly_trace(
+                    points=entry.outline_points(
+                        view_plane=view_plane,
+                        tolerance=tolerance,
+                        facet_splines=facet_splines,
+                        facet_circles=facet_circles,
+                        max_points=max_points,
+                    ),
+                    mode="lines",
+                    name=entry.name,
+                    color=entry.color,
+                )
+            )
+
+        if filename is not None:
+
+            Path(filename).parents[0].mkdir(parents=True, exist_ok=True)
+
+            path_filename = Path(filename)
+
+            if path_filename.suffix != ".html":
+                path_filename = path_filename.with_suffix(".html")
+
+            fig.write_html(str(path_filename))
+
         return fig
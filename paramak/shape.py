@@ -1,26 +1,35 @@
 
 import json
+import math
 import numbers
 import warnings
 from collections.abc import Iterable
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
 
-from cadquery import exporters, Workplane, Compound, Assembly, Color
+from cadquery import exporters, Workplane, Compound, Assembly, Color, Vector
 from cadquery.occ_impl import shapes
 
 from cadquery import importers
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.collections import PatchCollection
 from matplotlib.patches import Polygon
 
 import paramak
+from paramak.geometry_2d import points_in_polygon, rectilinear_rectangles
+from paramak.utils import (_replace, add_csg_surface, cut_solid, facet_wire,
+                           get_cq_shape, get_hash, intersect_solid, plotly_trace,
+                           union_solid, add_stl_to_moab_core,
+                           add_triangles_to_moab_core, hollow_cube_triangles,
+                           define_moab_core_and_tags, export_vtk,
+                           intermediate_folder)
 
-from paramak.utils import (_replace, cut_solid, facet_wire, get_hash,
-                           intersect_solid, plotly_trace, union_solid,
-                           add_stl_to_moab_core, define_moab_core_and_tags,
-                           export_vtk)
+# the connection types that can join Shape.points, the position in the tuple
+# is the integer code used in Shape.point_connections
+CONNECTION_TYPES = ("straight", "spline", "circle")
+CONNECTION_CODES = {name: code for code, name in enumerate(CONNECTION_TYPES)}
 
 
 class Shape:
@@ -200,7 +209,9 @@ class Shape:
         """The CadQuery solid of the 3d object. Returns a CadQuery workplane
         or CadQuery Compound"""
 
-        ignored_keys = ["_solid", "_hash_value"]
+        # the list of tuples view of the points is built from the point
+        # arrays when it is read so only the arrays are hashed
+        ignored_keys = ["_solid", "_hash_value", "_points"]
         if get_hash(self, ignored_keys) != self.hash_value:
             self.create_solid()
             self.hash_value = get_hash(self, ignored_keys)
@@ -216,7 +227,7 @@ class Shape:
         """The CadQuery wire of the 3d object. Returns a CadQuery workplane
         or CadQuery Compound"""
 
-        ignored_keys = ["_wire", "_solid", "_hash_value"]
+        ignored_keys = ["_wire", "_solid", "_hash_value", "_points"]
         if get_hash(self, ignored_keys) != self.hash_value:
             self.create_solid()
             self.hash_value = get_hash(self, ignored_keys)
@@ -478,83 +489,163 @@ class Shape:
         """Sets the Shape.point attributes.
 
         Args:
-            points (a list of lists or tuples): list of points that create the
-                shape
+            points (a list of lists or tuples or a numpy array with a shape of
+                (n, 2)): list of points that create the shape
 
         Raises:
             incorrect type: only list of lists or tuples are accepted
         """
-        ignored_keys = ["_points", "_points_hash_value"]
-        if hasattr(self, 'find_points') and \
-                self.points_hash_value != get_hash(self, ignored_keys):
-            self.find_points()
-            self.points_hash_value = get_hash(self, ignored_keys)
+        self._update_points()
+
+        # the list of tuples view is only built when it is needed
+        if self._points is None and self._point_coordinates is not None:
+            x_values, z_values = self._point_coordinates.T.tolist()
+            codes = self._point_connections.tolist()
+            if len(codes) > 0 and codes[0] == -1:
+                self._points = list(zip(x_values, z_values))
+            else:
+                self._points = list(zip(
+                    x_values,
+                    z_values,
+                    [CONNECTION_TYPES[code] for code in codes]))
 
         return self._points
 
     @points.setter
     def points(self, values_in):
+        self._points = None
         if values_in is None:
-            values = values_in
+            self._point_coordinates = None
+            self._point_connections = None
+            return
+
+        if isinstance(values_in, np.ndarray):
+            coordinates = values_in
+            if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+                msg = "points provided as an array must have a shape of " + \
+                    "(n, 2) not {}".format(coordinates.shape)
+                raise ValueError(msg)
+            if self.connection_type == "mixed":
+                codes = np.full(len(coordinates), -1, dtype=np.int8)
+            else:
+                codes = np.full(
+                    len(coordinates),
+                    CONNECTION_CODES.get(self.connection_type, -2),
+                    dtype=np.int8)
+
         else:
-            values = values_in[:]
-        if values is not None:
-            if not isinstance(values, list):
+            if not isinstance(values_in, list):
                 raise ValueError("points must be a list")
 
+            # the types are gathered without a python loop over the points
+            if not set(map(type, values_in)) <= {list, tuple}:
+                value = next(
+                    value for value in values_in
+                    if type(value) not in [list, tuple])
+                msg = "individual points must be a list or a tuple." + \
+                    "{} in of type {}".format(value, type(value))
+                raise ValueError(msg)
+
+            # Checks that the length of each tuple in points is 2 or 3
+            lengths = np.fromiter(map(len, values_in), dtype=int,
+                                  count=len(values_in))
             if self.connection_type != "mixed":
-                values = [(*p, self.connection_type) for p in values]
+                lengths = lengths + 1
+            wrong_lengths = np.flatnonzero((lengths < 2) | (lengths > 3))
+            if wrong_lengths.size > 0:
+                value = values_in[wrong_lengths[0]]
+                msg = "individual points contain 2 or 3 entries {} has a \
+                    length of {}".format(value, len(value))
+                raise ValueError(msg)
 
-            for value in values:
-                if type(value) not in [list, tuple]:
-                    msg = "individual points must be a list or a tuple." + \
-                        "{} in of type {}".format(value, type(value))
-                    raise ValueError(msg)
+            # checks that the entries in the points are either all 2 long or
+            # all 3 long, not a mixture
+            if lengths.size > 0 and lengths.min() != lengths.max():
+                msg = "The points list should contain entries of length 2 \
+                        or 3 but not a mixture of 2 and 3"
+                raise ValueError(msg)
 
-            for value in values:
-                # Checks that the length of each tuple in points is 2 or 3
-                if len(value) not in [2, 3]:
-                    msg = "individual points contain 2 or 3 entries {} has a \
-                        length of {}".format(value, len(values[0]))
-                    raise ValueError(msg)
+            entries = np.array(values_in, dtype=object)
+            if len(values_in) == 0:
+                entries = entries.reshape(0, 2)
+            elif entries.ndim != 2:
+                msg = "individual points must contain an X and a Z value"
+                raise ValueError(msg)
+            coordinates = entries[:, :2]
 
-                # Checks that the XY points are numbers
-                if not isinstance(value[0], numbers.Number):
-                    msg = "The first value in the tuples that make \
-                                        up the points represents the X value \
-                                        and must be a number {}".format(value)
-                    raise ValueError(msg)
-                if not isinstance(value[1], numbers.Number):
-                    msg = "The second value in the tuples that make \
-                                      up the points represents the X value \
-                                      and must be a number {}".format(value)
-                    raise ValueError(msg)
+            if self.connection_type != "mixed":
+                codes = np.full(
+                    len(values_in),
+                    CONNECTION_CODES.get(self.connection_type, -2),
+                    dtype=np.int8)
+            elif entries.shape[1] == 2:
+                codes = np.full(len(values_in), -1, dtype=np.int8)
+            else:
+                # only the distinct connection types are looked up
+                names, inverse = np.unique(
+                    entries[:, 2].astype(str), return_inverse=True)
+                codes = np.array(
+                    [CONNECTION_CODES.get(name, -2) for name in names],
+                    dtype=np.int8)[inverse.ravel()]
+
+        # Checks that the XY points are numbers, arrays of python objects
+        # such as Decimal are checked for each distinct type of value
+        if coordinates.dtype.kind not in "biuf" and not (
+                coordinates.dtype.kind == "O" and all(
+                    issubclass(value_type, numbers.Number)
+                    for value_type in set(map(type, coordinates.ravel())))):
+            msg = "The values in the tuples that make up the points \
+                represent the X and Z values and must be numbers"
+            raise ValueError(msg)
+        coordinates = coordinates.astype(float).reshape(-1, 2)
 
-                # Checks that only straight and spline are in the connections
-                # part of points
-                if len(value) == 3:
-                    if value[2] not in ["straight", "spline", "circle"]:
-                        msg = 'individual connections must be either \
-                            "straight", "circle" or "spline"'
-                        raise ValueError(msg)
+        # Checks that only straight, spline and circle are in the
+        # connections part of points
+        if np.any(codes == -2):
+            msg = 'individual connections must be either \
+                "straight", "circle" or "spline"'
+            raise ValueError(msg)
 
-            # checks that the entries in the points are either all 2 long or
-            # all 3 long, not a mixture
-            if not all(len(entry) == 2 for entry in values):
-                if not all(len(entry) == 3 for entry in values):
-                    msg = "The points list should contain entries of length 2 \
-                            or 3 but not a mixture of 2 and 3"
-                    raise ValueError(msg)
+        if len(coordinates) > 1:
+            if np.array_equal(coordinates[0], coordinates[-1]):
+                msg = "The coordinates of the last and first points are \
+                    the same."
+                raise ValueError(msg)
 
-            if len(values) > 1:
-                if values[0][:2] == values[-1][:2]:
-                    msg = "The coordinates of the last and first points are \
-                        the same."
-                    raise ValueError(msg)
+            coordinates = np.vstack((coordinates, coordinates[:1]))
+            codes = np.append(codes, codes[0])
+
+        coordinates.setflags(write=False)
+        codes.setflags(write=False)
+        self._point_coordinates = coordinates
+        self._point_connections = codes
 
-                values.append(values[0])
+    def _update_points(self):
+        """Finds the points again with the find_points method of parametric
+        Shapes if any of the parameters have changed."""
 
-        self._points = values
+        ignored_keys = ["_points", "_points_hash_value",
+                        "_point_coordinates", "_point_connections"]
+        if hasattr(self, 'find_points') and \
+                self.points_hash_value != get_hash(self, ignored_keys):
+            self.find_points()
+            self.points_hash_value = get_hash(self, ignored_keys)
+
+    @property
+    def point_coordinates(self) -> Optional[np.ndarray]:
+        """The x and z coordinates of the Shape.points as a read only numpy
+        array with a shape of (n, 2), including the repeated first point that
+        closes the profile."""
+        self._update_points()
+        return self._point_coordinates
+
+    @property
+    def point_connections(self) -> Optional[np.ndarray]:
+        """The connection types of the Shape.points as a read only numpy array
+        of integer codes which index paramak.shape.CONNECTION_TYPES. Points
+        without a connection type have a code of -1."""
+        self._update_points()
+        return self._point_connections
 
     @property
     def stp_filename(self):
@@ -678,36 +769,26 @@ class Shape:
     def create_solid(self) -> Workplane:
         solid = None
         if self.points is not None:
-            # obtains the first two values of the points list
-            XZ_points = [(p[0], p[1]) for p in self.points]
+            coordinates = self._point_coordinates
+            # the connection types of the points, apart from the closing point
+            connections = self._point_connections[:-1]
 
-            for point in self.points:
-                if len(point) != 3:
-                    msg = "The points list should contain two coordinates and \
-                        a connetion type"
-                    raise ValueError(msg)
+            if np.any(connections < 0):
+                msg = "The points list should contain two coordinates and \
+                    a connetion type"
+                raise ValueError(msg)
 
-            # obtains the last values of the points list
-            connections = [p[2] for p in self.points[:-1]]
-
-            current_linetype = connections[0]
-            current_points_list = []
-            instructions = []
-            # groups together common connection types
-            for i, connection in enumerate(connections):
-                if connection == current_linetype:
-                    current_points_list.append(XZ_points[i])
-                else:
-                    current_points_list.append(XZ_points[i])
-                    instructions.append(
-                        {current_linetype: current_points_list})
-                    current_linetype = connection
-                    current_points_list = [XZ_points[i]]
-            instructions.append({current_linetype: current_points_list})
-
-            if list(instructions[-1].values())[0][-1] != XZ_points[0]:
-                keyname = list(instructions[-1].keys())[0]
-                instructions[-1][keyname].append(XZ_points[0])
+            # groups together common connection types, each group of points
+            # runs up to and includes the first point of the next group
+            group_starts = np.flatnonzero(np.diff(connections)) + 1
+            group_starts = [0] + group_starts.tolist()
+            group_ends = group_starts[1:] + [len(connections)]
+            instructions = [
+                {CONNECTION_TYPES[connections[start]]:
+                    [tuple(point) for point in
+                     coordinates[start:end + 1].tolist()]}
+                for start, end in zip(group_starts, group_ends)
+            ]
 
             if hasattr(self, "path_points"):
 
@@ -787,24 +868,86 @@ class Shape:
 
     def rotate_solid(
             self,
-            solid: Optional[Workplane]) -> Workplane:
-        # Checks if the azimuth_placement_angle is a list of angles
+            solid: Optional[Workplane],
+            wedge_cut=None,
+            union: Optional[bool] = True) -> Workplane:
+        """Places copies of the solid at each of the
+        Shape.azimuth_placement_angle values and joins them together.
+
+        Args:
+            solid: the solid to copy.
+            wedge_cut (paramak.CuttingWedgeFS): an optional wedge that removes
+                the part of the copies outside of the sector of
+                Shape.rotation_angle, which starts at 0 for a list of
+                azimuth_placement_angle values and at the
+                azimuth_placement_angle for a single value. When the rotation
+                axis is Z the copies entirely outside of the sector are not
+                made and only the copies that straddle the sector boundaries
+                are cut.
+            union: if True the copies are fused together one after another.
+                If False the copies are gathered into a single compound
+                without any boolean operations, which is much quicker for
+                large numbers of copies but only valid when the copies do not
+                touch or overlap each other. Defaults to True.
+
+        Returns:
+            CadQuery.Workplane: the joined copies of the solid
+        """
+
+        # Checks if the azimuth_placement_angle is a list of angles. The
+        # CuttingWedgeFS keeps the sector from 0 degrees for a list of angles
+        # and from the azimuth_placement_angle for a single angle
         if isinstance(self.azimuth_placement_angle, Iterable):
             azimuth_placement_angles = self.azimuth_placement_angle
+            sector_start = 0
         else:
             azimuth_placement_angles = [self.azimuth_placement_angle]
+            sector_start = self.azimuth_placement_angle
+
+        angular_extent = None
+        if wedge_cut is not None and self.get_rotation_axis()[1] == 'Z':
+            angular_extent = paramak.utils.find_angular_extent(solid)
 
         rotated_solids = []
         # Perform seperate rotations for each angle
         for angle in azimuth_placement_angles:
-            rotated_solids.append(
-                solid.rotate(
-                    *self.get_rotation_axis()[0], angle))
-        solid = Workplane(self.workplane)
-
-        # Joins the seperate solids together
-        for i in rotated_solids:
-            solid = solid.union(i)
+            if angular_extent is None:
+                rotated_solids.append(
+                    solid.rotate(
+                        *self.get_rotation_axis()[0], angle))
+                continue
+
+            # the angular extent of the copy relative to the start of the
+            # sector, shifted to start in [0, 360)
+            start = angle + angular_extent[0] - sector_start
+            end = angle + angular_extent[1] - sector_start - \
+                360 * math.floor(start / 360)
+            start = start % 360
+            if start >= self.rotation_angle and end <= 360:
+                # the copy is entirely outside of the sector
+                continue
+            rotated_solid = solid.rotate(*self.get_rotation_axis()[0], angle)
+            if end > self.rotation_angle:
+                # the copy straddles a sector boundary
+                rotated_solid = cut_solid(rotated_solid, wedge_cut)
+            rotated_solids.append(rotated_solid)
+
+        if union:
+            solid = Workplane(self.workplane)
+
+            # Joins the seperate solids together
+            for i in rotated_solids:
+                solid = solid.union(i)
+        else:
+            copies = []
+            for i in rotated_solids:
+                copies += get_cq_shape(i).Solids()
+            solid = Workplane(self.workplane).newObject(
+                [Compound.makeCompound(copies)])
+
+        if wedge_cut is not None and angular_extent is None:
+            solid = cut_solid(solid, wedge_cut)
+
         return solid
 
     def get_rotation_axis(self):
@@ -953,12 +1096,7 @@ class Shape:
 
         if mode == 'solid':
 
-            assembly = Assembly(name=self.name)
-
-            if self.color is None:
-                assembly.add(self.solid)
-            else:
-                assembly.add(self.solid, color=Color(*self.color))
+            assembly = self._create_assembly()
 
             assembly.save(str(path_filename), exportType='STEP')
 
@@ -982,6 +1120,23 @@ class Shape:
 
         return str(path_filename)
 
+    def _create_assembly(self) -> Assembly:
+        """Creates a CadQuery Assembly of the Shape.solid with the Shape.color
+        which is used when exporting stp files.
+
+        Returns:
+            CadQuery.Assembly: the assembly containing the solid
+        """
+
+        assembly = Assembly(name=self.name)
+
+        if self.color is None:
+            assembly.add(self.solid)
+        else:
+            assembly.add(self.solid, color=Color(*self.color))
+
+        return assembly
+
     def export_physical_groups(self, filename: str) -> str:
         """Exports a JSON file containing a look up table which is useful for
         identifying faces and volumes. If filename provided doesn't end with
@@ -1111,6 +1266,324 @@ class Shape:
 
         return filename
 
+    def export_glb(
+            self,
+            filename: Optional[str] = "shape.glb",
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            quantize: Optional[bool] = True,
+    ) -> str:
+        """Saves a binary glTF (glb) 3d view of the Shape which can be opened
+        in most 3D viewers and web browsers without a notebook. Rotated copies
+        of the solid made with the azimuth_placement_angle are instanced so
+        they are only stored once.
+
+        Args:
+            filename: the filename of the glb file. If the filename does not
+                end with .glb then .glb will be added.
+            tolerance: the deflection tolerance of the faceting
+            angular_tolerance: the angular tolerance, in radians
+            quantize: store the vertex positions as 16 bit integers to reduce
+                the file size.
+
+        Returns:
+            str: filename of the created glb file
+        """
+
+        instances = paramak.utils.tessellate_instances(
+            self.solid,
+            tolerance=tolerance,
+            angular_tolerance=angular_tolerance,
+            rotation_axis=self.get_rotation_axis()[0],
+        )
+        for instance in instances:
+            instance["name"] = self.name
+            instance["color"] = self.color
+
+        return paramak.utils.export_glb(
+            meshes=instances,
+            filename=filename,
+            quantize=quantize,
+        )
+
+    def check_mesh(
+            self,
+            tolerance: Optional[float] = 0.001,
+            angular_tolerance: Optional[float] = 0.1,
+            volume_tolerance: Optional[float] = 0.01,
+    ) -> dict:
+        """Triangulates the surfaces of the Shape in memory and checks the
+        triangles enclose the volume of the solid without gaps, overlapping
+        or inconsistently oriented triangles, see paramak.utils.check_mesh.
+
+        Args:
+            tolerance: the linear deflection tolerance of the faceting.
+            angular_tolerance: the angular deflection tolerance of the
+                faceting in radians.
+            volume_tolerance: the largest acceptable relative difference
+                between the volume enclosed by the triangles and
+                Shape.volume.
+
+        Returns:
+            dict: the results of the checks
+        """
+
+        vertices, triangles = paramak.utils.tessellate_solid(
+            self.solid,
+            tolerance=tolerance,
+            angular_tolerance=angular_tolerance,
+        )
+
+        return paramak.utils.check_mesh(
+            vertices,
+            triangles,
+            volume=self.volume,
+            volume_tolerance=volume_tolerance,
+        )
+
+    def _is_revolved_profile(self) -> bool:
+        """Checks if the Shape is fully described by Shape.points revolved
+        from the XZ workplane about the Z axis, without boolean operations,
+        so the solid does not need to be built to find its outline or which
+        points it contains."""
+
+        return (
+            isinstance(
+                self,
+                (paramak.RotateStraightShape,
+                 paramak.RotateSplineShape,
+                 paramak.RotateMixedShape))
+            and self.workplane == 'XZ'
+            and self.get_rotation_axis()[1] == 'Z'
+            and self.cut is None
+            and self.intersect is None
+            and self.union is None
+            and self.points is not None
+            and min(point[0] for point in self.points) >= 0
+        )
+
+    def _revolved_profiles(
+            self,
+            tolerance: Optional[float] = 1e-3,
+            facet_splines: Optional[bool] = True,
+            facet_circles: Optional[bool] = True,
+    ) -> List[np.ndarray]:
+        """Finds the closed profiles in the RZ plane that are revolved to
+        make the Shape. Most revolved Shapes have a single profile made from
+        the faceted Shape.points.
+
+        Args:
+            tolerance: faceting tolerance to use when faceting circles and
+                splines. Defaults to 1e-3.
+            facet_splines: If True then spline edges will be faceted.
+            facet_circles: If True then circle edges will be faceted.
+
+        Returns:
+            list of numpy arrays of the profile points with shapes of (N, 2)
+        """
+
+        return [paramak.utils.facet_points(
+            self.points,
+            tolerance=tolerance,
+            facet_splines=facet_splines,
+            facet_circles=facet_circles,
+        )]
+
+    def _azimuth_placement_angles(self) -> list:
+        """Returns the azimuth_placement_angle as a list of angles."""
+
+        if isinstance(self.azimuth_placement_angle, Iterable):
+            return list(self.azimuth_placement_angle)
+        return [self.azimuth_placement_angle]
+
+    def csg_region(self, surfaces: List[dict]) -> Optional[str]:
+        """Finds a constructive solid geometry (CSG) description of the Shape
+        made from planes and cylinders, which particle transport codes can
+        track through much faster than a faceted DAGMC geometry. Shapes
+        revolved about the Z axis from profiles with only horizontal and
+        vertical edges are split into rectangles in the RZ plane, each of
+        which is the region between two z-planes and up to two z-cylinders.
+        Partial rotations are limited to their azimuthal sectors.
+
+        Args:
+            surfaces: the list of surfaces to add the surfaces of the Shape
+                to, see paramak.utils.add_csg_surface.
+
+        Returns:
+            the region of the Shape in the OpenMC region syntax, or None if
+            the Shape can not be described with planes and cylinders
+        """
+
+        if not self._is_revolved_profile():
+            return None
+
+        if any(len(point) == 3 and point[2] != 'straight'
+               for point in self.points[:-1]):
+            return None
+
+        profiles = self._revolved_profiles()
+        for profile in profiles:
+            edges = np.diff(profile, axis=0)
+            if not np.all((edges[:, 0] == 0) | (edges[:, 1] == 0)):
+                return None
+
+        rectangles = []
+        for profile in profiles:
+            for r_min, r_max, z_min, z_max in rectilinear_rectangles(profile):
+                half_spaces = [
+                    add_csg_surface(surfaces, 'z-plane', z0=z_min),
+                    -add_csg_surface(surfaces, 'z-plane', z0=z_max),
+                    -add_csg_surface(
+                        surfaces, 'z-cylinder', x0=0, y0=0, r=r_max),
+                ]
+                # rectangles touching the axis do not need an inner cylinder
+                if r_min > 0:
+                    half_spaces.append(add_csg_surface(
+                        surfaces, 'z-cylinder', x0=0, y0=0, r=r_min))
+                rectangles.append(
+                    "(" + " ".join(str(h) for h in half_spaces) + ")")
+
+        region = "(" + " | ".join(rectangles) + ")"
+
+        if self.rotation_angle < 360:
+            region += " " + paramak.utils.csg_sector_region(
+                surfaces,
+                self._azimuth_placement_angles(),
+                self.rotation_angle,
+            )
+
+        return region
+
+    def contains(
+            self,
+            points,
+            tolerance: Optional[float] = 1e-3,
+    ) -> np.ndarray:
+        """Finds which of the points are inside the Shape. For Shapes revolved
+        from points on the XZ workplane about the Z axis without boolean
+        operations each point is tested against the faceted Shape.points in
+        the RZ plane and against the azimuthal range of the revolved copies,
+        which is vectorised and does not build the solid. Otherwise the solid
+        is built and each point within its bounding box is classified by OCC.
+
+        Args:
+            points: the 3D coordinates of the points with a shape of (N, 3).
+            tolerance: faceting tolerance to use when faceting circles and
+                splines of the Shape.points. Defaults to 1e-3.
+
+        Returns:
+            numpy array of booleans with a shape of (N,) that are True for the
+            points inside the Shape
+        """
+
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+
+        if not self._is_revolved_profile():
+            solid = get_cq_shape(self.solid)
+            bounding_box = solid.BoundingBox()
+            candidates = np.all(
+                (points >= (bounding_box.xmin, bounding_box.ymin,
+                            bounding_box.zmin))
+                & (points <= (bounding_box.xmax, bounding_box.ymax,
+                              bounding_box.zmax)),
+                axis=1)
+            solids = solid.Solids()
+            inside = np.zeros(len(points), dtype=bool)
+            for index in np.flatnonzero(candidates):
+                point = Vector(*points[index])
+                inside[index] = any(s.isInside(point) for s in solids)
+            return inside
+
+        radii_and_heights = np.column_stack(
+            (np.hypot(points[:, 0], points[:, 1]), points[:, 2]))
+        inside = np.zeros(len(points), dtype=bool)
+        for profile in self._revolved_profiles(tolerance=tolerance):
+            inside |= points_in_polygon(radii_and_heights, profile)
+
+        if self.rotation_angle < 360:
+            # each copy is revolved counterclockwise about the Z axis from
+            # its azimuth_placement_angle
+            azimuths = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+            within_copies = np.zeros(len(points), dtype=bool)
+            for angle in self._azimuth_placement_angles():
+                within_copies |= (azimuths - angle) % 360 <= \
+                    self.rotation_angle
+            inside &= within_copies
+
+        return inside
+
+    def outline_points(
+            self,
+            view_plane: Optional[str] = 'RZ',
+            tolerance: Optional[float] = 1e-3,
+            facet_splines: Optional[bool] = True,
+            facet_circles: Optional[bool] = True,
+            max_points: Optional[int] = None,
+    ) -> list:
+        """Finds the points of the outline of the Shape viewed from a plane.
+        For Shapes revolved from points on the XZ workplane about the Z axis
+        without boolean operations the outline in the 'RZ' plane is the
+        faceted Shape.points, which is found without using the solid. Otherwise
+        the edges of the solid are faceted and projected onto the view_plane.
+        Separate lines in the outline are separated by a point of None values
+        so the outline can be plotted as a single plotly trace.
+
+        Args:
+            view_plane: The plane to project. Options are 'XZ', 'XY', 'YZ',
+                'YX', 'ZY', 'ZX', 'RZ' and 'XYZ'. Defaults to 'RZ'.
+            tolerance: faceting tolerance to use when faceting circles and
+                splines. Defaults to 1e-3.
+            facet_splines: If True then spline edges will be faceted.
+            facet_circles: If True then circle edges will be faceted.
+            max_points: the maximum number of points in the outline. If the
+                outline has more points it is simplified with the
+                Douglas-Peucker algorithm. Defaults to None which keeps all
+                the points.
+
+        Returns:
+            list of tuples: the coordinates of the outline
+        """
+
+        if view_plane == 'RZ' and self._is_revolved_profile():
+            lines = self._revolved_profiles(
+                tolerance=tolerance,
+                facet_splines=facet_splines,
+                facet_circles=facet_circles,
+            )
+        else:
+            if isinstance(self.solid, Workplane):
+                edges = self.solid.val().Edges()
+            else:
+                edges = self.solid.Edges()
+            lines = []
+            for edge in edges:
+                lines.append(paramak.utils.extract_points_from_edges(
+                    edges=facet_wire(
+                        wire=edge,
+                        facet_splines=facet_splines,
+                        facet_circles=facet_circles,
+                        tolerance=tolerance,
+                    ),
+                    view_plane=view_plane,
+                ))
+
+        total_points = sum(len(line) for line in lines)
+        outline = []
+        for line in lines:
+            if len(line) == 0:
+                continue
+            line = np.array(line, dtype=float)
+            if max_points is not None and total_points > max_points:
+                line_max_points = max(
+                    2, int(max_points * len(line) / total_points))
+                line = line[paramak.utils.simplify_polyline(
+                    line, max_points=line_max_points)]
+            if outline:
+                outline.append((None,) * line.shape[1])
+            outline.extend(tuple(point) for point in line.tolist())
+
+        return outline
+
     def export_html(
             self,
             filename: Optional[str] = "shape.html",
@@ -1479,12 +1952,50 @@ class Shape:
 
         return vtk_filename
 
+    def export_vtm(
+        self,
+        filename: Optional[str] = 'shape.vtm',
+        tolerance: Optional[float] = 0.001,
+        angular_tolerance: Optional[float] = 0.1,
+    ) -> str:
+        """Produces a multi-block vtk file directly from the triangulated
+        surface of the Shape.solid, with the Shape.material_tag stored as cell
+        data. This is useful for previewing the faceted geometry in ParaView
+        without first producing a h5m file.
+
+        Args:
+            filename: filename of vtm outputfile. If the filename does not end
+                with .vtm then .vtm will be added.
+            tolerance: the deflection tolerance of the faceting
+            angular_tolerance: the angular tolerance, in radians
+
+        Returns:
+            filename of the vtm file produced
+        """
+
+        vertices, triangles = paramak.utils.tessellate_solid(
+            self.solid,
+            tolerance=tolerance,
+            angular_tolerance=angular_tolerance,
+        )
+
+        return paramak.utils.export_vtm(
+            blocks=[{
+                "name": self.name,
+                "material_tag": self.material_tag,
+                "vertices": vertices,
+                "triangles": triangles,
+            }],
+            filename=filename,
+        )
+
     def export_h5m(
             self,
             filename: str = 'dagmc.h5m',
             method: Optional[str] = None,
             merge_tolerance: Optional[float] = None,
             faceting_tolerance: Optional[float] = None,
+            output_folder: Optional[str] = None,
     ) -> str:
         """Produces a dagmc.h5m neutronics file compatable with DAGMC
         simulations. Tags the volumes with their material_tag attributes. Sets
@@ -1504,6 +2015,9 @@ class Shape:
                 https://svalinn.github.io/DAGMC/usersguide/trelis_basics.html
                 for more details. Defaults to None which uses the
                 Shape.faceting_tolerance attribute.
+            output_folder: the folder to write the intermediate files (such
+                as stl or stp files) to. Defaults to None which uses a
+                temporary folder that is removed afterwards.
 
         Returns:
             The filename of the DAGMC file created
@@ -1520,14 +2034,17 @@ class Shape:
 
         if method == 'trelis':
             output_filename = self.export_h5m_with_trelis(
+                filename=filename,
                 merge_tolerance=merge_tolerance,
                 faceting_tolerance=faceting_tolerance,
+                output_folder=output_folder,
             )
 
         elif method == 'pymoab':
             output_filename = self.export_h5m_with_pymoab(
                 filename=filename,
                 faceting_tolerance=faceting_tolerance,
+                output_folder=output_folder,
             )
 
         else:
@@ -1538,13 +2055,16 @@ class Shape:
 
     def export_h5m_with_trelis(
             self,
+            filename: Optional[str] = 'dagmc.h5m',
             merge_tolerance: Optional[float] = None,
             faceting_tolerance: Optional[float] = None,
+            output_folder: Optional[str] = None,
     ):
         """Produces a dagmc.h5m neutronics file compatable with DAGMC
         simulations using Coreform Trelis.
 
         Arguments:
+            filename: filename of h5m outputfile.
             merge_tolerance: the allowable distance between edges and surfaces
                 before merging these CAD objects into a single CAD object. See
                 https://svalinn.github.io/DAGMC/usersguide/trelis_basics.html
@@ -1555,6 +2075,9 @@ class Shape:
                 https://svalinn.github.io/DAGMC/usersguide/trelis_basics.html
                 for more details. Defaults to None which uses the
                 Shape.faceting_tolerance attribute.
+            output_folder: the folder to write the stp file, manifest file
+                and the files produced by Trelis to. Defaults to None which
+                uses a temporary folder that is removed afterwards.
 
         Returns:
             str: filename of the DAGMC file produced
@@ -1565,16 +2088,26 @@ class Shape:
         if faceting_tolerance is None:
             faceting_tolerance = self.faceting_tolerance
 
-        self.export_stp()
-        self.export_neutronics_description()
+        with intermediate_folder(output_folder) as folder:
+            self.export_stp(filename=folder / self.stp_filename)
+            manifest_filename = self.export_neutronics_description(
+                filename=folder / 'manifest.json')
 
-        not_watertight_file = paramak.utils.trelis_command_to_create_dagmc_h5m(
-            faceting_tolerance=faceting_tolerance, merge_tolerance=merge_tolerance)
+            not_watertight_file = paramak.utils.trelis_command_to_create_dagmc_h5m(
+                faceting_tolerance=faceting_tolerance,
+                merge_tolerance=merge_tolerance,
+                h5m_filename=str(folder / 'dagmc_not_watertight.h5m'),
+                manifest_filename=str(manifest_filename),
+                cubit_filename=str(folder / 'dagmc.cub'),
+                trelis_filename=str(folder / 'dagmc.trelis'),
+                geometry_details_filename=str(
+                    folder / 'geometry_details.json'),
+            )
 
-        water_tight_h5m = paramak.utils.make_watertight(
-            input_filename=not_watertight_file,
-            output_filename="dagmc.h5m"
-        )
+            water_tight_h5m = paramak.utils.make_watertight(
+                input_filename=not_watertight_file[0],
+                output_filename=filename
+            )
 
         self.h5m_filename = water_tight_h5m
 
@@ -1585,6 +2118,7 @@ class Shape:
             filename: Optional[str] = 'dagmc.h5m',
             include_graveyard: Optional[bool] = True,
             faceting_tolerance: Optional[float] = 0.001,
+            output_folder: Optional[str] = None,
     ) -> str:
         """Converts stl files into DAGMC compatible h5m file using PyMOAB. The
         DAGMC file produced has not been imprinted and merged unlike the other
@@ -1599,6 +2133,8 @@ class Shape:
                 using Reactor.graveyard_size and Reactor.graveyard_offset
                 attribute values.
             faceting_tolerance: the precision of the faceting.
+            output_folder: the folder to write the stl file to. Defaults to
+                None which uses a temporary folder that is removed afterwards.
 
         Returns:
             The filename of the DAGMC file created
@@ -1611,31 +2147,36 @@ class Shape:
 
         path_filename.parents[0].mkdir(parents=True, exist_ok=True)
 
-        self.export_stl(self.stl_filename, tolerance=faceting_tolerance)
-
         moab_core, moab_tags = define_moab_core_and_tags()
 
-        moab_core = add_stl_to_moab_core(
-            moab_core=moab_core,
-            surface_id=1,
-            volume_id=1,
-            material_name=self.material_tag,
-            tags=moab_tags,
-            stl_filename=self.stl_filename
-        )
+        with intermediate_folder(output_folder) as folder:
+            stl_filename = self.export_stl(
+                folder / self.stl_filename, tolerance=faceting_tolerance)
+
+            moab_core = add_stl_to_moab_core(
+                moab_core=moab_core,
+                surface_id=1,
+                volume_id=1,
+                material_name=self.material_tag,
+                tags=moab_tags,
+                stl_filename=stl_filename
+            )
 
         if include_graveyard:
             self.make_graveyard()
-            self.graveyard.export_stl(self.graveyard.stl_filename)
+            vertices, triangles = hollow_cube_triangles(
+                length=self.graveyard.length,
+                thickness=self.graveyard.thickness)
             volume_id = 2
             surface_id = 2
-            moab_core = add_stl_to_moab_core(
+            moab_core = add_triangles_to_moab_core(
                 moab_core=moab_core,
                 surface_id=surface_id,
                 volume_id=volume_id,
                 material_name=self.graveyard.material_tag,
                 tags=moab_tags,
-                stl_filename=self.graveyard.stl_filename
+                vertices=vertices,
+                triangles=triangles
             )
 
         all_sets = moab_core.get_entities_by_handle(0)
@@ -1692,27 +2233,40 @@ class Shape:
             The new points with spline connections
         """
 
-        new_points = []
+        points = self.points
+
+        # finds the three points of every circle edge
+        circle_starts = []
         counter = 0
-        while counter < len(self.points):
+        while counter < len(points):
+            if points[counter][2] == 'circle':
+                circle_starts.append(counter)
+                counter = counter + 3
+            else:
+                counter = counter + 1
 
-            if self.points[counter][2] == 'circle':
-                p_0 = self.points[counter][:2]
-                p_1 = self.points[counter + 1][:2]
-                p_2 = self.points[counter + 2][:2]
+        arcs = [
+            [point[:2] for point in points[start:start + 3]]
+            for start in circle_starts
+        ]
+        polylines = dict(zip(
+            circle_starts,
+            paramak.utils.facet_circular_arcs(arcs, tolerance=tolerance)
+        ))
 
-                points = paramak.utils.convert_circle_to_spline(
-                    p_0, p_1, p_2, tolerance=tolerance
-                )
+        new_points = []
+        counter = 0
+        while counter < len(points):
 
+            if counter in polylines:
                 # the last point needs to have the connection type of p2
-                for point in points[:-1]:
+                for point in polylines[counter][:-1].tolist():
                     new_points.append((point[0], point[1], 'spline'))
 
-                new_points.append(self.points[counter + 2])
+                new_points.append(points[counter + 2])
                 counter = counter + 3
             else:
-                new_points.append(self.points[counter])
+                new_points.append(points[counter])
                 counter = counter + 1
         self.points = new_points[:-1]
         return new_points[:-1]
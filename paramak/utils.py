@@ -1,24 +1,196 @@
 
+import asyncio
+import heapq
+import json
 import math
-import os
 import shutil
+import struct
 import subprocess
+import threading
+import warnings
 from collections.abc import Iterable
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from hashlib import blake2b
 from os import fdopen, remove
 from pathlib import Path
 from shutil import copymode, move
-from tempfile import mkstemp
+from tempfile import mkdtemp, mkstemp
 from typing import List, Optional, Tuple, Union
+from xml.sax.saxutils import quoteattr
 
 import cadquery as cq
 import numpy as np
 import plotly.graph_objects as go
 from cadquery import importers
+from OCP.BOPAlgo import BOPAlgo_Builder
+from OCP.BRepTools import BRepTools
 from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+from OCP.TopTools import TopTools_ListIteratorOfListOfShape
 from remove_dagmc_tags import remove_tags
 
 import paramak
+from paramak import geometry_2d
+
+
+@contextmanager
+def intermediate_folder(output_folder: Optional[str] = None):
+    """Provides the folder to write the intermediate files of an export to,
+    such as stl files, so that exports running at the same time do not
+    overwrite each others files in the current working directory.
+
+    Args:
+        output_folder: the folder to write the files to, which is created if
+            it does not exist and kept afterwards. Defaults to None which
+            provides a new temporary folder that is removed afterwards.
+
+    Yields:
+        pathlib.Path: the folder to write the files to
+    """
+
+    if output_folder is not None:
+        folder = Path(output_folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        yield folder
+        return
+
+    folder = mkdtemp(prefix='paramak_export_')
+    try:
+        yield Path(folder)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def run_job(
+        command: List[str],
+        working_directory: Optional[str] = None,
+        timeout: Optional[float] = None,
+        check: Optional[bool] = True,
+        verbose: Optional[bool] = True,
+        log_filename: Optional[str] = 'job.log',
+) -> subprocess.CompletedProcess:
+    """Runs an executable with a list of arguments (without a shell) in its
+    own working directory. The combined stdout and stderr of the job is
+    streamed line by line to a log file in the working directory and
+    optionally printed as it arrives. Several jobs can be run at once with
+    run_jobs or from asyncio with run_job_async.
+
+    Args:
+        command: the executable and its arguments.
+        working_directory: the directory to run the job in, which is created
+            if it does not exist and kept afterwards. Defaults to None which
+            runs the job in a new temporary directory that is removed once
+            the job finishes, so any files the job should keep must be given
+            as absolute paths.
+        timeout: the number of seconds after which the job is killed and a
+            subprocess.TimeoutExpired error is raised. Defaults to None which
+            waits until the job finishes.
+        check: raise a subprocess.CalledProcessError if the job returns a non
+            zero exit code.
+        verbose: print the output of the job as it arrives.
+        log_filename: the filename of the log file in the working directory.
+
+    Returns:
+        subprocess.CompletedProcess: the arguments, return code and output of
+        the job
+    """
+
+    temporary_directory = working_directory is None
+    if temporary_directory:
+        working_directory = mkdtemp(prefix='paramak_job_')
+    Path(working_directory).mkdir(parents=True, exist_ok=True)
+
+    output_lines = []
+
+    try:
+        process = subprocess.Popen(
+            [str(argument) for argument in command],
+            cwd=working_directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+
+        def stream_output():
+            with open(Path(working_directory) / log_filename, 'w') as log_file:
+                for line in process.stdout:
+                    log_file.write(line)
+                    log_file.flush()
+                    output_lines.append(line)
+                    if verbose:
+                        print(line, end='')
+
+        reader = threading.Thread(target=stream_output, daemon=True)
+        reader.start()
+
+        try:
+            return_code = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            reader.join()
+
+    finally:
+        if temporary_directory:
+            shutil.rmtree(working_directory, ignore_errors=True)
+
+    output = ''.join(output_lines)
+    if check and return_code != 0:
+        raise subprocess.CalledProcessError(return_code, command, output)
+
+    return subprocess.CompletedProcess(command, return_code, stdout=output)
+
+
+def run_jobs(
+        commands: List[List[str]],
+        max_workers: Optional[int] = None,
+        **kwargs
+) -> List[subprocess.CompletedProcess]:
+    """Runs several executables at once, each in its own working directory,
+    using a pool of threads, see run_job.
+
+    Args:
+        commands: the executable and arguments of each job.
+        max_workers: the maximum number of jobs to run at once. Defaults to
+            None which uses the concurrent.futures default.
+        kwargs: the keyword arguments passed to run_job for every job. A
+            working_directory should not be given as the jobs would share it.
+
+    Returns:
+        list of subprocess.CompletedProcess: the results of the jobs in the
+        order of the commands
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_job, command, **kwargs)
+            for command in commands
+        ]
+        return [future.result() for future in futures]
+
+
+async def run_job_async(
+        command: List[str],
+        **kwargs
+) -> subprocess.CompletedProcess:
+    """Runs an executable in its own working directory without blocking the
+    asyncio event loop, see run_job. Several jobs can be run at once with
+    asyncio.gather.
+
+    Args:
+        command: the executable and its arguments.
+        kwargs: the keyword arguments passed to run_job.
+
+    Returns:
+        subprocess.CompletedProcess: the arguments, return code and output of
+        the job
+    """
+
+    return await asyncio.get_running_loop().run_in_executor(
+        None, partial(run_job, command, **kwargs))
 
 
 def trelis_command_to_create_dagmc_h5m(
@@ -33,10 +205,14 @@ def trelis_command_to_create_dagmc_h5m(
         trelis_filename: str = 'dagmc.trelis',
         geometry_details_filename: str = 'geometry_details.json',
         surface_reflectivity_name: str = 'reflective',
+        working_directory: Optional[str] = None,
+        timeout: Optional[float] = None,
 ) -> List[str]:
     """Runs the Trelis executable command with the
     make_faceteted_neutronics_model.py script which produces a non water tight
-    DAGMC h5m file.
+    DAGMC h5m file. Trelis is run with run_job in its own working directory
+    with a copy of the manifest that has absolute geometry filenames, so
+    several Trelis jobs can be run at once.
 
     Arguments:
         faceting_tolerance: the tolerance to use when faceting surfaces.
@@ -63,6 +239,10 @@ def trelis_command_to_create_dagmc_h5m(
         surface_reflectivity_name: The tag to assign to the reflective boundary
             in the resulting DAGMC geometry Shift requires "spec.reflect" and
             MCNP requires "boundary:Reflecting".
+        working_directory: the directory to run Trelis in. Defaults to None
+            which uses a temporary directory that is removed afterwards.
+        timeout: the number of seconds after which Trelis is stopped.
+            Defaults to None which waits until Trelis finishes.
 
     Returns:
         The filename of the h5m file created
@@ -75,6 +255,7 @@ def trelis_command_to_create_dagmc_h5m(
     filenames_extensions = ['.h5m', '.trelis', '.cub', '.json']
 
     path_output_filenames = []
+    absolute_output_filenames = []
 
     for output_file, extension in zip(output_filenames, filenames_extensions):
 
@@ -87,50 +268,74 @@ def trelis_command_to_create_dagmc_h5m(
             path_filename.parents[0].mkdir(parents=True, exist_ok=True)
 
             path_output_filenames.append(str(path_filename))
+            absolute_output_filenames.append(str(path_filename.absolute()))
+        else:
+            absolute_output_filenames.append(None)
 
-    shutil.copy(
-        src=Path(__file__).parent.absolute() / Path('parametric_neutronics') /
-        'make_faceteted_neutronics_model.py',
-        dst=Path().absolute()
-    )
+    if not Path(manifest_filename).is_file():
+        raise FileNotFoundError(
+            "The manifest file {} was not found".format(manifest_filename))
+
+    script_filename = Path(__file__).parent.absolute() / \
+        Path('parametric_neutronics') / 'make_faceteted_neutronics_model.py'
 
-    if not Path("make_faceteted_neutronics_model.py").is_file():
+    if not script_filename.is_file():
         raise FileNotFoundError(
             "The make_faceteted_neutronics_model.py was not found in the \
             directory")
 
-    os.system('rm dagmc_not_watertight.h5m')
+    if working_directory is None:
+        job_directory = mkdtemp(prefix='paramak_trelis_')
+    else:
+        job_directory = working_directory
+        Path(job_directory).mkdir(parents=True, exist_ok=True)
+
+    # the geometry files are found relative to the manifest file
+    with open(manifest_filename) as manifest_file:
+        manifest = json.load(manifest_file)
+    for entry in manifest:
+        if geometry_key_name in entry:
+            entry[geometry_key_name] = str(
+                (Path(manifest_filename).parent /
+                 entry[geometry_key_name]).absolute())
+    job_manifest_filename = Path(job_directory) / 'manifest.json'
+    with open(job_manifest_filename, 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    if Path(absolute_output_filenames[0]).is_file():
+        Path(absolute_output_filenames[0]).unlink()
 
     if batch:
-        trelis_cmd = 'trelis -batch -nographics'
+        trelis_cmd = ['trelis', '-batch', '-nographics']
     else:
-        trelis_cmd = 'trelis'
-
-    os.system(
-        trelis_cmd +
-        " make_faceteted_neutronics_model.py \"faceting_tolerance='" +
-        str(faceting_tolerance) +
-        "'\" \"merge_tolerance='" +
-        str(merge_tolerance) +
-        "'\" \"material_key_name='" +
-        str(material_key_name) +
-        "'\" \"geometry_key_name='" +
-        str(geometry_key_name) +
-        "'\" \"h5m_filename='" +
-        str(h5m_filename) +
-        "'\" \"manifest_filename='" +
-        str(manifest_filename) +
-        "'\" \"cubit_filename='" +
-        str(cubit_filename) +
-        "'\" \"trelis_filename='" +
-        str(trelis_filename) +
-        "'\" \"geometry_details_filename='" +
-        str(geometry_details_filename) +
-        "'\" \"surface_reflectivity_name='" +
-        str(surface_reflectivity_name) +
-        "'\"")
-
-    os.system('rm make_faceteted_neutronics_model.py')
+        trelis_cmd = ['trelis']
+
+    script_arguments = {
+        'faceting_tolerance': faceting_tolerance,
+        'merge_tolerance': merge_tolerance,
+        'material_key_name': material_key_name,
+        'geometry_key_name': geometry_key_name,
+        'h5m_filename': absolute_output_filenames[0],
+        'manifest_filename': job_manifest_filename,
+        'cubit_filename': absolute_output_filenames[2],
+        'trelis_filename': absolute_output_filenames[1],
+        'geometry_details_filename': absolute_output_filenames[3],
+        'surface_reflectivity_name': surface_reflectivity_name,
+    }
+
+    try:
+        run_job(
+            trelis_cmd + [str(script_filename)] + [
+                "{}='{}'".format(key, value)
+                for key, value in script_arguments.items()
+            ],
+            working_directory=job_directory,
+            timeout=timeout,
+            check=False,
+        )
+    finally:
+        if working_directory is None:
+            shutil.rmtree(job_directory, ignore_errors=True)
 
     if not Path(h5m_filename).is_file():
         raise FileNotFoundError(
@@ -143,14 +348,19 @@ def trelis_command_to_create_dagmc_h5m(
 def make_watertight(
         input_filename: str = "dagmc_not_watertight.h5m",
         output_filename: str = "dagmc.h5m",
+        timeout: Optional[float] = None,
 ) -> str:
     """Runs the DAGMC make_watertight executable that seals the facetets of
     the geometry with specified input and output h5m files. Not needed for
-    h5m file produced with pymoab method.
+    h5m file produced with pymoab method. The executable is run with run_job
+    in its own temporary working directory so several files can be made
+    watertight at once.
 
     Arguments:
         input_filename: the non watertight h5m file to make watertight.
         output_filename: the filename of the watertight h5m file.
+        timeout: the number of seconds after which make_watertight is
+            stopped. Defaults to None which waits until it finishes.
 
     Returns:
         The filename of the h5m file created
@@ -159,16 +369,20 @@ def make_watertight(
     if not Path(input_filename).is_file():
         raise FileNotFoundError("Failed to find {}".format(input_filename))
 
-    os.system('rm {}'.format(output_filename))
+    if Path(output_filename).is_file():
+        Path(output_filename).unlink()
 
     try:
-        output = subprocess.check_output(
-            "make_watertight {} -o {}".format(input_filename, output_filename),
-            shell=True,
-            universal_newlines=True,
+        run_job(
+            [
+                'make_watertight',
+                Path(input_filename).absolute(),
+                '-o',
+                Path(output_filename).absolute(),
+            ],
+            timeout=timeout,
         )
-        print(output)
-    except BaseException:
+    except (OSError, subprocess.CalledProcessError):
         raise NameError(
             "make_watertight failed, check DAGMC is install and the DAGMC/bin "
             "folder is in the path directory (Linux and Mac) or set as an "
@@ -230,6 +444,587 @@ def export_vtk(
     return str(path_filename)
 
 
+def write_vtu(
+        filename: str,
+        vertices: np.ndarray,
+        triangles: np.ndarray,
+        cell_data: Optional[dict] = None,
+        field_data: Optional[dict] = None,
+) -> str:
+    """Writes a triangulated surface to a VTK XML UnstructuredGrid (vtu) file
+    with the arrays stored as raw binary appended data. The bytes are written
+    directly from the numpy arrays without converting each value to text. If
+    the filename does not end with .vtu then .vtu will be added.
+
+    Args:
+        filename: the filename of the vtu file.
+        vertices: the vertex coordinates with shape (N, 3).
+        triangles: the vertex indices of each triangle with shape (M, 3).
+        cell_data: a dictionary of array names and numpy arrays with one
+            value per triangle.
+        field_data: a dictionary of array names and strings which are stored
+            once for the whole file (for example the material_tag).
+
+    Returns:
+        filename of the vtu file produced
+    """
+
+    path_filename = Path(filename)
+    if path_filename.suffix != ".vtu":
+        path_filename = path_filename.with_suffix(".vtu")
+
+    vertices = np.ascontiguousarray(vertices, dtype='<f8').reshape(-1, 3)
+    triangles = np.ascontiguousarray(triangles, dtype='<i8').reshape(-1, 3)
+    if cell_data is None:
+        cell_data = {}
+    if field_data is None:
+        field_data = {}
+
+    number_of_triangles = len(triangles)
+    offsets = np.arange(3, 3 * number_of_triangles + 1, 3, dtype='<i8')
+    # 5 is the VTK_TRIANGLE cell type
+    cell_types = np.full(number_of_triangles, 5, dtype='u1')
+
+    vtk_types = {'f': 'Float', 'i': 'Int', 'u': 'UInt'}
+
+    arrays = []
+    xml_arrays = {'points': [], 'cells': [], 'cell_data': []}
+    offset = 0
+
+    def add_array(section, name, array, number_of_components=1):
+        nonlocal offset
+        array = np.ascontiguousarray(array)
+        array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+        vtk_type = '{}{}'.format(
+            vtk_types[array.dtype.kind], 8 * array.dtype.itemsize)
+        xml_arrays[section].append(
+            '<DataArray type="{}" Name={} NumberOfComponents="{}" '
+            'format="appended" offset="{}"/>'.format(
+                vtk_type, quoteattr(name), number_of_components, offset))
+        arrays.append(array)
+        # each appended array is preceded by a UInt64 header of its length
+        offset += 8 + array.nbytes
+
+    add_array('points', 'Points', vertices, 3)
+    add_array('cells', 'connectivity', triangles)
+    add_array('cells', 'offsets', offsets)
+    add_array('cells', 'types', cell_types)
+    for name, values in cell_data.items():
+        values = np.asarray(values)
+        if len(values) != number_of_triangles:
+            raise ValueError(
+                "cell_data {} has {} values but there are {} triangles".format(
+                    name, len(values), number_of_triangles))
+        add_array('cell_data', name, values)
+
+    xml_field_data = []
+    for name, value in field_data.items():
+        # VTK string arrays are written as the character codes of each
+        # string followed by a null terminator
+        codes = ' '.join(str(code) for code in str(value).encode()) + ' 0'
+        xml_field_data.append(
+            '<DataArray type="String" Name={} NumberOfTuples="1" '
+            'format="ascii">{}</DataArray>'.format(quoteattr(name), codes))
+
+    header = [
+        '<?xml version="1.0"?>',
+        '<VTKFile type="UnstructuredGrid" version="1.0" '
+        'byte_order="LittleEndian" header_type="UInt64">',
+        '<UnstructuredGrid>',
+    ]
+    if xml_field_data:
+        header += ['<FieldData>'] + xml_field_data + ['</FieldData>']
+    header += [
+        '<Piece NumberOfPoints="{}" NumberOfCells="{}">'.format(
+            len(vertices), number_of_triangles),
+        '<Points>', *xml_arrays['points'], '</Points>',
+        '<Cells>', *xml_arrays['cells'], '</Cells>',
+        '<CellData>', *xml_arrays['cell_data'], '</CellData>',
+        '</Piece>',
+        '</UnstructuredGrid>',
+        '<AppendedData encoding="raw">',
+    ]
+
+    path_filename.parents[0].mkdir(parents=True, exist_ok=True)
+
+    with open(path_filename, 'wb') as vtu_file:
+        vtu_file.write('\n'.join(header).encode() + b'\n_')
+        for array in arrays:
+            vtu_file.write(np.array(array.nbytes, dtype='<u8').tobytes())
+            vtu_file.write(array.tobytes())
+        vtu_file.write(b'\n</AppendedData>\n</VTKFile>\n')
+
+    return str(path_filename)
+
+
+def export_vtm(
+        blocks: List[dict],
+        filename: Optional[str] = 'geometry.vtm',
+        parallel: Optional[bool] = False,
+        max_workers: Optional[int] = None,
+) -> str:
+    """Writes triangulated surfaces to a VTK XML MultiBlock (vtm) file which
+    can be opened in ParaView. Each block is written to a binary vtu file in
+    a folder next to the vtm file (with the same name as the vtm file minus
+    the suffix). The material of each triangle is stored as the integer
+    "material_id" cell data, which indexes the list of material tags in the
+    order they first appear in the blocks, and the material tag of each block
+    is also stored as the string "material_tag" field data. If the filename
+    does not end with .vtm then .vtm will be added.
+
+    Args:
+        blocks: a list of dictionaries, one per block, with the "vertices"
+            (N, 3) and "triangles" (M, 3) numpy arrays and optionally the
+            "name" and "material_tag" of the block.
+        filename: the filename of the vtm file.
+        parallel: write the vtu files for the blocks concurrently using a
+            pool of threads.
+        max_workers: the maximum number of threads to use when parallel is
+            True. Defaults to None which uses the concurrent.futures default.
+
+    Returns:
+        filename of the vtm file produced
+    """
+
+    path_filename = Path(filename)
+    if path_filename.suffix != ".vtm":
+        path_filename = path_filename.with_suffix(".vtm")
+
+    block_folder = path_filename.parent / path_filename.stem
+
+    material_tags = []
+    for block in blocks:
+        if block.get("material_tag") not in material_tags:
+            material_tags.append(block.get("material_tag"))
+
+    def write_block(index, block):
+        number_of_triangles = len(block["triangles"])
+        material_id = material_tags.index(block.get("material_tag"))
+        return write_vtu(
+            filename=block_folder / 'block_{}.vtu'.format(index),
+            vertices=block["vertices"],
+            triangles=block["triangles"],
+            cell_data={
+                "material_id": np.full(
+                    number_of_triangles, material_id, dtype=np.int32),
+                "block_id": np.full(
+                    number_of_triangles, index, dtype=np.int32),
+            },
+            field_data={"material_tag": block.get("material_tag")},
+        )
+
+    if parallel:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            block_filenames = list(
+                executor.map(write_block, range(len(blocks)), blocks))
+    else:
+        block_filenames = [
+            write_block(index, block) for index, block in enumerate(blocks)
+        ]
+
+    datasets = []
+    for index, (block, block_filename) in enumerate(
+            zip(blocks, block_filenames)):
+        name = block.get("name")
+        if name is None:
+            name = 'block_{}'.format(index)
+        datasets.append(
+            '<DataSet index="{}" name={} file={}/>'.format(
+                index,
+                quoteattr(str(name)),
+                quoteattr(
+                    Path(block_filename).relative_to(
+                        path_filename.parent).as_posix())))
+
+    lines = [
+        '<?xml version="1.0"?>',
+        '<VTKFile type="vtkMultiBlockDataSet" version="1.0" '
+        'byte_order="LittleEndian" header_type="UInt64">',
+        '<vtkMultiBlockDataSet>',
+        *datasets,
+        '</vtkMultiBlockDataSet>',
+        '</VTKFile>',
+    ]
+
+    path_filename.parents[0].mkdir(parents=True, exist_ok=True)
+    with open(path_filename, 'w') as vtm_file:
+        vtm_file.write('\n'.join(lines) + '\n')
+
+    return str(path_filename)
+
+
+def deduplicate_vertices(
+        vertices: np.ndarray,
+        triangles: np.ndarray,
+        quantization: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merges vertices that share the same coordinates and removes the
+    triangles that become degenerate as a result. Optionally the vertices are
+    first snapped to a grid so that vertices closer than the grid spacing are
+    also merged.
+
+    Args:
+        vertices: the vertex coordinates with shape (N, 3).
+        triangles: the vertex indices of each triangle with shape (M, 3).
+        quantization: the spacing of the grid that the vertices are snapped
+            to. Defaults to None which only merges identical vertices.
+
+    Returns:
+        numpy array of the unique vertices and numpy array of the remapped
+        triangle vertex indices
+    """
+
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+    if quantization is not None:
+        vertices = np.round(vertices / quantization) * quantization
+
+    unique_vertices, inverse = np.unique(
+        vertices, axis=0, return_inverse=True)
+    triangles = inverse.reshape(-1)[triangles]
+
+    degenerate = (triangles[:, 0] == triangles[:, 1]) | \
+        (triangles[:, 1] == triangles[:, 2]) | \
+        (triangles[:, 0] == triangles[:, 2])
+
+    return unique_vertices, triangles[~degenerate]
+
+
+def rotation_matrix(
+        angle: float,
+        rotation_axis: Tuple[Tuple[float, float, float],
+                             Tuple[float, float, float]] = (
+            (0, 0, -1), (0, 0, 1)),
+) -> np.ndarray:
+    """Returns the 4x4 transformation matrix for a rotation about an axis.
+
+    Args:
+        angle: the angle of rotation in degrees, following the right hand
+            rule about the direction of the axis.
+        rotation_axis: two points that define the axis of rotation.
+
+    Returns:
+        numpy array with shape (4, 4)
+    """
+
+    start = np.array(rotation_axis[0], dtype=float)
+    direction = np.array(rotation_axis[1], dtype=float) - start
+    direction /= np.linalg.norm(direction)
+
+    angle = math.radians(angle)
+    cross = np.array([
+        [0, -direction[2], direction[1]],
+        [direction[2], 0, -direction[0]],
+        [-direction[1], direction[0], 0],
+    ])
+    rotation = np.eye(3) + math.sin(angle) * cross + \
+        (1 - math.cos(angle)) * cross @ cross
+
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation
+    matrix[:3, 3] = start - rotation @ start
+
+    return matrix
+
+
+def tessellate_instances(
+        solid,
+        tolerance: float = 1e-1,
+        angular_tolerance: float = 0.1,
+        rotation_axis: Tuple[Tuple[float, float, float],
+                             Tuple[float, float, float]] = (
+            (0, 0, -1), (0, 0, 1)),
+) -> List[dict]:
+    """Triangulates the solids in a compound, only triangulating one of each
+    set of solids that are rotated copies of each other about the rotation
+    axis (such as the copies made with the Shape.azimuth_placement_angle).
+    Solids are identified as copies when their volume, area and distance of
+    their center of mass from the axis match and their bounding boxes agree
+    to within the faceting tolerance once rotated.
+
+    Args:
+        solid (CadQuery.Workplane or CadQuery.Shape): the solid or compound to
+            triangulate.
+        tolerance: the linear deflection tolerance of the faceting.
+        angular_tolerance: the angular deflection tolerance of the faceting in
+            radians.
+        rotation_axis: two points that define the axis of rotation of the
+            copies.
+
+    Returns:
+        A list of dictionaries, one for each unique solid, with the
+        "vertices" (N, 3) and "triangles" (M, 3) numpy arrays and a list of
+        4x4 "matrices" that place each copy of the solid
+    """
+
+    shape = get_cq_shape(solid)
+    if isinstance(shape, cq.Compound):
+        solids = shape.Solids()
+    else:
+        solids = [shape]
+
+    start = np.array(rotation_axis[0], dtype=float)
+    direction = np.array(rotation_axis[1], dtype=float) - start
+    direction /= np.linalg.norm(direction)
+
+    def bounding_box(solid):
+        box = solid.BoundingBox()
+        return np.array(
+            [box.xmin, box.ymin, box.zmin, box.xmax, box.ymax, box.zmax])
+
+    prototypes = []
+    for solid in solids:
+        volume, area = solid.Volume(), solid.Area()
+        offset = np.array(solid.Center().toTuple()) - start
+        height = offset @ direction
+        radial = offset - height * direction
+        radius = np.linalg.norm(radial)
+        box = bounding_box(solid)
+        size = np.linalg.norm(box[3:] - box[:3])
+
+        for prototype in prototypes:
+            if not np.allclose(
+                    [volume, area, height, radius],
+                    [prototype["volume"], prototype["area"],
+                     prototype["height"], prototype["radius"]],
+                    rtol=1e-6, atol=1e-9 * size):
+                continue
+            angle = math.degrees(math.atan2(
+                direction @ np.cross(prototype["radial"], radial),
+                prototype["radial"] @ radial))
+            rotated = prototype["solid"].rotate(
+                cq.Vector(*rotation_axis[0]),
+                cq.Vector(*rotation_axis[1]),
+                angle)
+            if np.allclose(bounding_box(rotated), box, rtol=0,
+                           atol=max(tolerance, 1e-6 * size)):
+                prototype["matrices"].append(
+                    rotation_matrix(angle, rotation_axis))
+                break
+        else:
+            vertices, triangles = tessellate_solid(
+                solid, tolerance, angular_tolerance)
+            prototypes.append({
+                "solid": solid,
+                "volume": volume,
+                "area": area,
+                "height": height,
+                "radius": radius,
+                "radial": radial,
+                "vertices": vertices,
+                "triangles": triangles,
+                "matrices": [np.eye(4)],
+            })
+
+    return [
+        {
+            "vertices": prototype["vertices"],
+            "triangles": prototype["triangles"],
+            "matrices": prototype["matrices"],
+        }
+        for prototype in prototypes
+    ]
+
+
+def export_glb(
+        meshes: List[dict],
+        filename: Optional[str] = 'geometry.glb',
+        quantize: Optional[bool] = True,
+        merge_tolerance: Optional[float] = None,
+) -> str:
+    """Writes triangulated surfaces to a binary glTF (glb) file which can be
+    viewed in most 3D viewers and web browsers. Each mesh is written once and
+    placed by a node for every one of its transformation matrices so that
+    repeated parts are instanced rather than duplicated. The geometry is
+    rotated so that the Z axis points up in viewers that use the glTF Y up
+    convention. If the filename does not end with .glb then .glb will be
+    added.
+
+    Args:
+        meshes: a list of dictionaries with the "vertices" (N, 3) and
+            "triangles" (M, 3) numpy arrays and optionally a "name", a
+            "color" (RGB or RGBA tuple of floats between 0 and 1) and a list
+            of 4x4 "matrices" that place each instance of the mesh.
+            Dictionaries with the same name are grouped under one node.
+        filename: the filename of the glb file.
+        quantize: store the vertex positions as 16 bit integers relative to
+            the bounding box of each mesh (using the KHR_mesh_quantization
+            extension) instead of 32 bit floats.
+        merge_tolerance: vertices closer than this distance are merged.
+            Defaults to None which only merges identical vertices.
+
+    Returns:
+        filename of the glb file produced
+    """
+
+    path_filename = Path(filename)
+    if path_filename.suffix != ".glb":
+        path_filename = path_filename.with_suffix(".glb")
+
+    buffer_chunks = []
+    buffer_length = 0
+    gltf = {
+        "asset": {"version": "2.0", "generator": "paramak"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        # rotates the Z up geometry to the glTF Y up convention
+        "nodes": [{"name": path_filename.stem,
+                   "rotation": [-math.sqrt(0.5), 0, 0, math.sqrt(0.5)],
+                   "children": []}],
+        "meshes": [],
+        "materials": [],
+        "accessors": [],
+        "bufferViews": [],
+    }
+    if quantize:
+        gltf["extensionsUsed"] = ["KHR_mesh_quantization"]
+        gltf["extensionsRequired"] = ["KHR_mesh_quantization"]
+
+    def add_buffer_view(array, target, byte_stride=None):
+        nonlocal buffer_length
+        data = np.ascontiguousarray(array).tobytes()
+        buffer_view = {
+            "buffer": 0,
+            "byteOffset": buffer_length,
+            "byteLength": len(data),
+            "target": target,
+        }
+        if byte_stride is not None:
+            buffer_view["byteStride"] = byte_stride
+        # buffer views are padded to keep the data 4 byte aligned
+        padding = -len(data) % 4
+        buffer_chunks.append(data + b'\x00' * padding)
+        buffer_length += len(data) + padding
+        gltf["bufferViews"].append(buffer_view)
+        return len(gltf["bufferViews"]) - 1
+
+    def add_accessor(accessor):
+        gltf["accessors"].append(accessor)
+        return len(gltf["accessors"]) - 1
+
+    materials = {}
+    group_nodes = {}
+    for index, mesh in enumerate(meshes):
+        vertices, triangles = deduplicate_vertices(
+            mesh["vertices"], mesh["triangles"], merge_tolerance)
+        if len(triangles) == 0:
+            continue
+
+        name = mesh.get("name")
+        if name is None:
+            name = 'mesh_{}'.format(index)
+
+        color = mesh.get("color")
+        if color is None:
+            color = (0.5, 0.5, 0.5)
+        color = tuple(color)
+        if color not in materials:
+            material = {
+                "pbrMetallicRoughness": {
+                    "baseColorFactor": list(color[:3]) + [
+                        color[3] if len(color) == 4 else 1.],
+                    "metallicFactor": 0.,
+                    "roughnessFactor": 0.8,
+                },
+                "doubleSided": True,
+            }
+            if len(color) == 4 and color[3] < 1:
+                material["alphaMode"] = "BLEND"
+            gltf["materials"].append(material)
+            materials[color] = len(gltf["materials"]) - 1
+
+        minimum = vertices.min(axis=0)
+        maximum = vertices.max(axis=0)
+        dequantization = np.eye(4)
+        if quantize:
+            scale = (maximum - minimum) / 65535
+            scale[scale == 0] = 1.
+            quantized = np.zeros((len(vertices), 4), dtype='<u2')
+            quantized[:, :3] = np.round((vertices - minimum) / scale)
+            # vertex attributes are padded to 4 components for alignment
+            position_view = add_buffer_view(quantized, 34962, byte_stride=8)
+            position_accessor = add_accessor({
+                "bufferView": position_view,
+                "componentType": 5123,
+                "count": len(vertices),
+                "type": "VEC3",
+                "min": quantized[:, :3].min(axis=0).tolist(),
+                "max": quantized[:, :3].max(axis=0).tolist(),
+            })
+            dequantization[:3, :3] = np.diag(scale)
+            dequantization[:3, 3] = minimum
+        else:
+            position_view = add_buffer_view(
+                vertices.astype('<f4'), 34962)
+            position_accessor = add_accessor({
+                "bufferView": position_view,
+                "componentType": 5126,
+                "count": len(vertices),
+                "type": "VEC3",
+                "min": vertices.astype('<f4').min(axis=0).tolist(),
+                "max": vertices.astype('<f4').max(axis=0).tolist(),
+            })
+
+        if len(vertices) < 65536:
+            indices, component_type = triangles.astype('<u2'), 5123
+        else:
+            indices, component_type = triangles.astype('<u4'), 5125
+        indices_view = add_buffer_view(indices, 34963)
+        indices_accessor = add_accessor({
+            "bufferView": indices_view,
+            "componentType": component_type,
+            "count": indices.size,
+            "type": "SCALAR",
+        })
+
+        gltf["meshes"].append({
+            "name": name,
+            "primitives": [{
+                "attributes": {"POSITION": position_accessor},
+                "indices": indices_accessor,
+                "material": materials[color],
+            }],
+        })
+        mesh_index = len(gltf["meshes"]) - 1
+
+        if name not in group_nodes:
+            gltf["nodes"].append({"name": name, "children": []})
+            group_nodes[name] = len(gltf["nodes"]) - 1
+            gltf["nodes"][0]["children"].append(group_nodes[name])
+
+        for matrix in mesh.get("matrices", [np.eye(4)]):
+            matrix = np.asarray(matrix, dtype=float) @ dequantization
+            node = {"mesh": mesh_index}
+            if not np.allclose(matrix, np.eye(4)):
+                # glTF matrices are stored in column major order
+                node["matrix"] = matrix.flatten(order='F').tolist()
+            gltf["nodes"].append(node)
+            gltf["nodes"][group_nodes[name]]["children"].append(
+                len(gltf["nodes"]) - 1)
+
+    gltf["buffers"] = [{"byteLength": buffer_length}]
+    if not gltf["materials"]:
+        del gltf["materials"]
+
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode()
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    binary_chunk = b''.join(buffer_chunks)
+
+    path_filename.parents[0].mkdir(parents=True, exist_ok=True)
+
+    with open(path_filename, 'wb') as glb_file:
+        glb_file.write(struct.pack(
+            '<III', 0x46546C67, 2,
+            12 + 8 + len(json_chunk) + 8 + len(binary_chunk)))
+        glb_file.write(struct.pack('<II', len(json_chunk), 0x4E4F534A))
+        glb_file.write(json_chunk)
+        glb_file.write(struct.pack('<II', len(binary_chunk), 0x004E4942))
+        glb_file.write(binary_chunk)
+
+    return str(path_filename)
+
+
 def define_moab_core_and_tags():
     """Creates a MOAB Core instance which can be built up by adding sets of
     triangles to the instance
@@ -284,15 +1079,15 @@ def define_moab_core_and_tags():
     return moab_core, tags
 
 
-def add_stl_to_moab_core(
+def _add_volume_to_moab_core(
         moab_core,
         surface_id: int,
         volume_id: int,
         material_name: str,
-        tags,
-        stl_filename: str):
-    """Computes the m and c coefficients of the equation (y=mx+c) for
-    a straight line from two points.
+        tags):
+    """Creates the surface and volume sets of a DAGMC volume with the
+    category, dimension, sense and id tags needed by DAGMC and adds the volume
+    to a material group.
 
     Args:
         moab_core (pymoab.core.Core):
@@ -302,11 +1097,9 @@ def add_stl_to_moab_core(
             will be prepended with "mat:" unless it is "reflective" which is
             a special case and therefore will remain as is.
         tags (pymoab tag_handle): the MOAB tags
-        stl_filename (str): the filename of the stl file to load into the moab
-            core
 
     Returns:
-        (pymoab Core): An updated pymoab.core.Core() instance
+        (pymoab EntityHandle): the surface set to add the triangles to
     """
 
     surface_set = moab_core.create_meshset()
@@ -333,9 +1126,6 @@ def add_stl_to_moab_core(
     sense_data = [volume_set, np.uint64(0)]
     moab_core.tag_set_data(tags['surf_sense'], surface_set, sense_data)
 
-    # load the stl triangles/vertices into the surface set
-    moab_core.load_file(stl_filename, surface_set)
-
     group_set = moab_core.create_meshset()
     moab_core.tag_set_data(tags['category'], group_set, "Group")
 
@@ -355,9 +1145,279 @@ def add_stl_to_moab_core(
     # add the volume to this group set
     moab_core.add_entity(group_set, volume_set)
 
+    return surface_set
+
+
+def add_stl_to_moab_core(
+        moab_core,
+        surface_id: int,
+        volume_id: int,
+        material_name: str,
+        tags,
+        stl_filename: str):
+    """Loads the triangles of an stl file into a pymoab.core.Core() instance
+    as a DAGMC volume with a single surface.
+
+    Args:
+        moab_core (pymoab.core.Core):
+        surface_id (int): the id number to apply to the surface
+        volume_id (int): the id numbers to apply to the volumes
+        material_name (str): the material tag name to add. the value provided
+            will be prepended with "mat:" unless it is "reflective" which is
+            a special case and therefore will remain as is.
+        tags (pymoab tag_handle): the MOAB tags
+        stl_filename (str): the filename of the stl file to load into the moab
+            core
+
+    Returns:
+        (pymoab Core): An updated pymoab.core.Core() instance
+    """
+
+    surface_set = _add_volume_to_moab_core(
+        moab_core, surface_id, volume_id, material_name, tags)
+
+    # load the stl triangles/vertices into the surface set
+    moab_core.load_file(stl_filename, surface_set)
+
+    return moab_core
+
+
+def add_triangles_to_moab_core(
+        moab_core,
+        surface_id: int,
+        volume_id: int,
+        material_name: str,
+        tags,
+        vertices: np.ndarray,
+        triangles: np.ndarray):
+    """Adds triangles directly to a pymoab.core.Core() instance as a DAGMC
+    volume with a single surface, without writing or reading any files. The
+    triangles should be ordered counterclockwise when viewed from outside of
+    the volume so that their normals point out of the volume.
+
+    Args:
+        moab_core (pymoab.core.Core):
+        surface_id (int): the id number to apply to the surface
+        volume_id (int): the id numbers to apply to the volumes
+        material_name (str): the material tag name to add. the value provided
+            will be prepended with "mat:" unless it is "reflective" which is
+            a special case and therefore will remain as is.
+        tags (pymoab tag_handle): the MOAB tags
+        vertices (numpy.ndarray): the 3D coordinates of the vertices with a
+            shape of (N, 3)
+        triangles (numpy.ndarray): the indices of the three vertices of each
+            triangle with a shape of (M, 3)
+
+    Returns:
+        (pymoab Core): An updated pymoab.core.Core() instance
+    """
+
+    from pymoab import types
+
+    surface_set = _add_volume_to_moab_core(
+        moab_core, surface_id, volume_id, material_name, tags)
+
+    vertex_handles = moab_core.create_vertices(
+        np.asarray(vertices, dtype='float64').flatten())
+    vertex_handles = np.array(list(vertex_handles), dtype=np.uint64)
+
+    triangle_handles = moab_core.create_elements(
+        types.MBTRI, vertex_handles[np.asarray(triangles)])
+
+    moab_core.add_entities(surface_set, vertex_handles)
+    moab_core.add_entities(surface_set, triangle_handles)
+
     return moab_core
 
 
+def hollow_cube_triangles(
+        length: float,
+        thickness: Optional[float] = 10.
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the 24 triangles of the surface of a hollow cube centred on the
+    origin, matching the paramak.HollowCube used as a DAGMC graveyard. The
+    triangles of the outer cube face outwards and the triangles of the inner
+    cube face into the hollow, so every triangle faces out of the shell.
+
+    Args:
+        length: the length of the sides of the hollow inside the cube.
+        thickness: the outer cube has sides of length + thickness.
+
+    Returns:
+        numpy arrays of the vertices with a shape of (16, 3) and of the
+        vertex indices of the triangles with a shape of (24, 3)
+    """
+
+    # the corner index is x + 2y + 4z with x, y and z being 0 or 1
+    corners = np.array(
+        [[x, y, z] for z in (-1, 1) for y in (-1, 1) for x in (-1, 1)])
+
+    # the corners of each face counterclockwise when viewed from outside
+    quads = np.array([
+        [0, 4, 6, 2], [1, 3, 7, 5],
+        [0, 1, 5, 4], [2, 6, 7, 3],
+        [0, 2, 3, 1], [4, 5, 7, 6]])
+    outward_triangles = np.concatenate(
+        (quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+
+    vertices = np.concatenate((
+        corners * (length + thickness) / 2,
+        corners * length / 2))
+    triangles = np.concatenate((
+        outward_triangles,
+        outward_triangles[:, ::-1] + 8))
+
+    return vertices, triangles
+
+
+def sector_wedge_triangles(
+        height: float,
+        radius: float,
+        start_angle: float,
+        end_angle: float,
+        tolerance: Optional[float] = 1e-3,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the triangles of the surface of a wedge shaped sector of a
+    cylinder centred on the z axis, matching the paramak.CuttingWedge made by
+    Reactor.make_sector_wedge. The curved side is faceted so that it deviates
+    from the cylinder by less than the tolerance and every triangle faces out
+    of the wedge.
+
+    Args:
+        height: the height of the wedge which is centred on z=0.
+        radius: the radius of the wedge.
+        start_angle: the azimuthal angle (degrees) that the wedge starts at.
+        end_angle: the azimuthal angle (degrees) that the wedge ends at,
+            counterclockwise about the z axis from the start_angle.
+        tolerance: the maximum distance between the faceted side and the
+            cylinder.
+
+    Returns:
+        numpy arrays of the vertices with a shape of (N, 3) and of the vertex
+        indices of the triangles with a shape of (M, 3)
+    """
+
+    sweep = math.radians(end_angle - start_angle)
+    step = 2 * math.acos(1 - min(tolerance / radius, 1.))
+    number_of_segments = max(math.ceil(sweep / step), 2)
+
+    angles = np.radians(start_angle) + np.linspace(
+        0, sweep, number_of_segments + 1)
+    arc = np.column_stack(
+        (radius * np.cos(angles), radius * np.sin(angles)))
+
+    # vertex 0 and 1 are on the axis, then the bottom and top of the arc
+    vertices = np.concatenate((
+        [[0, 0, -height / 2], [0, 0, height / 2]],
+        np.column_stack((arc, np.full(len(arc), -height / 2))),
+        np.column_stack((arc, np.full(len(arc), height / 2)))))
+
+    segments = np.arange(number_of_segments)
+    bottom = 2 + segments
+    top = bottom + number_of_segments + 1
+    axis_bottom = np.zeros(number_of_segments, dtype=int)
+    axis_top = np.ones(number_of_segments, dtype=int)
+
+    end_bottom, end_top = 2 + number_of_segments, 3 + 2 * number_of_segments
+
+    triangles = np.concatenate((
+        # the curved side
+        np.column_stack((bottom, bottom + 1, top + 1)),
+        np.column_stack((bottom, top + 1, top)),
+        # the top and bottom
+        np.column_stack((axis_top, top, top + 1)),
+        np.column_stack((axis_bottom, bottom + 1, bottom)),
+        # the flat sides at the start and end angles
+        [[0, 2, top[0]], [0, top[0], 1],
+         [0, 1, end_top], [0, end_top, end_bottom]]))
+
+    return vertices, triangles
+
+
+def add_csg_surface(
+        surfaces: List[dict],
+        surface_type: str,
+        **coefficients: float,
+) -> int:
+    """Adds a surface to a list of constructive solid geometry (CSG) surfaces
+    unless the same surface is already in the list. The surface types and
+    coefficients follow the names used by OpenMC, for example a 'z-cylinder'
+    with x0, y0 and r coefficients or a 'plane' with a, b, c and d
+    coefficients.
+
+    Args:
+        surfaces: the list of surfaces to add to, where each surface is a
+            dictionary with id, type and coefficients keys.
+        surface_type: the type of the surface.
+        coefficients: the coefficients of the surface.
+
+    Returns:
+        the id of the surface, which starts at 1
+    """
+
+    coefficients = {key: float(value) for key, value in coefficients.items()}
+
+    for surface in surfaces:
+        if surface["type"] == surface_type and all(
+                math.isclose(surface["coefficients"][key], value,
+                             abs_tol=1e-9)
+                for key, value in coefficients.items()):
+            return surface["id"]
+
+    surface_id = len(surfaces) + 1
+    surfaces.append({
+        "id": surface_id,
+        "type": surface_type,
+        "coefficients": coefficients,
+    })
+
+    return surface_id
+
+
+def csg_sector_region(
+        surfaces: List[dict],
+        start_angles: List[float],
+        rotation_angle: float,
+) -> str:
+    """Finds the CSG region of azimuthal sectors about the z axis, bounded by
+    planes through the z axis. Each sector starts at one of the start_angles
+    and extends counterclockwise by the rotation_angle. Sectors up to 180
+    degrees are the intersection of two half spaces and larger sectors are
+    the union of two half spaces.
+
+    Args:
+        surfaces: the list of surfaces to add the planes to, see
+            add_csg_surface.
+        start_angles: the azimuthal angles (degrees) that the sectors start
+            at.
+        rotation_angle: the azimuthal angle (degrees) of each sector.
+
+    Returns:
+        the region in the OpenMC region syntax
+    """
+
+    sectors = []
+    for start_angle in start_angles:
+        # the positive side of each plane is counterclockwise of the angle
+        start, end = (
+            add_csg_surface(
+                surfaces,
+                'plane',
+                a=-math.sin(math.radians(angle)),
+                b=math.cos(math.radians(angle)),
+                c=0,
+                d=0,
+            )
+            for angle in (start_angle, start_angle + rotation_angle)
+        )
+        if rotation_angle <= 180:
+            sectors.append(f"({start} -{end})")
+        else:
+            sectors.append(f"({start} | -{end})")
+
+    return "(" + " | ".join(sectors) + ")"
+
+
 def transform_curve(edge, tolerance: float = 1e-3):
     """Converts a curved edge into a series of straight lines (facetets) with
     the provided tolerance.
@@ -382,6 +1442,300 @@ def transform_curve(edge, tolerance: float = 1e-3):
     return cq.Wire.makePolygon(verts)
 
 
+def get_cq_shape(solid):
+    """Returns the CadQuery Shape (Solid or Compound) held by a
+    paramak.Shape.solid attribute which can be either a CadQuery Workplane or
+    a CadQuery Shape.
+
+    Args:
+        solid (CadQuery.Workplane or CadQuery.Shape): the solid to convert.
+
+    Returns:
+        CadQuery.Shape: the solid or compound of solids
+    """
+
+    if isinstance(solid, cq.Workplane):
+        values = solid.vals()
+        if len(values) == 1:
+            return values[0]
+        return cq.Compound.makeCompound(values)
+    return solid
+
+
+def tessellate_solid(
+        solid,
+        tolerance: float = 1e-1,
+        angular_tolerance: float = 0.1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Triangulates the surfaces of a solid with the provided tolerances and
+    returns the vertices and triangles as numpy arrays. Any existing
+    triangulation of the solid is discarded first so that the tolerances are
+    always respected.
+
+    Args:
+        solid (CadQuery.Workplane or CadQuery.Shape): the solid to triangulate.
+        tolerance: the linear deflection tolerance of the faceting.
+        angular_tolerance: the angular deflection tolerance of the faceting in
+            radians.
+
+    Returns:
+        numpy array of vertices with shape (N, 3) and numpy array of triangle
+        vertex indices with shape (M, 3)
+    """
+
+    shape = get_cq_shape(solid)
+
+    BRepTools.Clean_s(shape.wrapped)
+    vertices, triangles = shape.tessellate(tolerance, angular_tolerance)
+
+    vertices = np.array(
+        [vertex.toTuple() for vertex in vertices], dtype=float
+    ).reshape(-1, 3)
+    triangles = np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+    return vertices, triangles
+
+
+def read_stl(filename: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Reads the triangles of an ascii or binary stl file. The triangles of
+    stl files do not share vertices so each triangle has its own three
+    vertices.
+
+    Args:
+        filename: the filename of the stl file to read.
+
+    Returns:
+        numpy array of vertices with shape (3M, 3) and numpy array of triangle
+        vertex indices with shape (M, 3)
+    """
+
+    data = Path(filename).read_bytes()
+
+    # binary stl files have an 80 byte header, the number of triangles and
+    # 50 bytes for each triangle
+    if len(data) >= 84:
+        number_of_triangles = struct.unpack("<I", data[80:84])[0]
+        if len(data) == 84 + 50 * number_of_triangles:
+            records = np.frombuffer(
+                data,
+                dtype=np.dtype([
+                    ("normal", "<f4", (3,)),
+                    ("vertices", "<f4", (3, 3)),
+                    ("attribute", "<u2"),
+                ]),
+                count=number_of_triangles,
+                offset=84)
+            vertices = records["vertices"].reshape(-1, 3).astype(float)
+            return vertices, np.arange(len(vertices)).reshape(-1, 3)
+
+    tokens = np.array(data.decode("ascii", errors="ignore").split())
+    starts = np.flatnonzero(tokens == "vertex")
+    vertices = tokens[starts[:, np.newaxis] + (1, 2, 3)].astype(float)
+
+    return vertices.reshape(-1, 3), np.arange(len(vertices)).reshape(-1, 3)
+
+
+def check_mesh(
+        vertices: np.ndarray,
+        triangles: np.ndarray,
+        volume: Optional[float] = None,
+        merge_tolerance: Optional[float] = 1e-6,
+        volume_tolerance: Optional[float] = 0.01,
+) -> dict:
+    """Checks that triangulated surfaces enclose a volume without gaps, such
+    as those produced by tessellate_solid. Vertices closer together than the
+    merge_tolerance are merged first as the triangles of neighbouring faces
+    do not share vertices. Each edge is then hashed to an integer and counted
+    so that open edges (used by one triangle), non-manifold edges (used by
+    more than two triangles) and inconsistently oriented edges (used twice
+    in the same direction) are found. The volume enclosed by the triangles is
+    found with the divergence theorem and compared to the provided volume.
+
+    Args:
+        vertices: the vertices of the triangles with a shape of (N, 3).
+        triangles: the indices of the three vertices of each triangle with a
+            shape of (M, 3).
+        volume: the volume that the triangles should enclose, such as the
+            Shape.volume. Defaults to None which skips the volume comparison.
+        merge_tolerance: the distance within which vertices are merged.
+        volume_tolerance: the largest acceptable relative difference between
+            the enclosed volume and the volume.
+
+    Returns:
+        dict: the number of triangles and of degenerate triangles, open
+        edges, non-manifold edges and inconsistent edges, the
+        "signed_volume" enclosed by the triangles, the relative
+        "volume_error" (None when the volume is not provided), "watertight"
+        which is True when there are no open or non-manifold edges and "valid"
+        which is True when the mesh is also consistently oriented outwards
+        with an acceptable volume_error
+    """
+
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+    # merges the vertices that are duplicated between faces
+    _, vertex_ids = np.unique(
+        np.round(vertices / merge_tolerance).astype(np.int64),
+        axis=0,
+        return_inverse=True)
+    merged_triangles = vertex_ids.reshape(-1)[triangles]
+
+    degenerate = (
+        (merged_triangles[:, 0] == merged_triangles[:, 1])
+        | (merged_triangles[:, 1] == merged_triangles[:, 2])
+        | (merged_triangles[:, 2] == merged_triangles[:, 0]))
+    merged_triangles = merged_triangles[~degenerate]
+
+    starts = merged_triangles.reshape(-1)
+    ends = np.roll(merged_triangles, -1, axis=1).reshape(-1)
+    edge_keys = np.minimum(starts, ends) * len(vertices) + \
+        np.maximum(starts, ends)
+    _, edge_ids, edge_counts = np.unique(
+        edge_keys, return_inverse=True, return_counts=True)
+
+    # an edge used once in each direction by two triangles has a total
+    # direction of zero
+    directions = np.bincount(
+        edge_ids.reshape(-1),
+        weights=np.where(starts < ends, 1, -1),
+        minlength=len(edge_counts))
+
+    corners = vertices[triangles]
+    signed_volume = float(np.einsum(
+        'ij,ij->', corners[:, 0],
+        np.cross(corners[:, 1], corners[:, 2])) / 6)
+
+    volume_error = None
+    if volume is not None:
+        volume_error = abs(signed_volume - volume) / volume
+
+    number_of_open_edges = int(np.count_nonzero(edge_counts == 1))
+    number_of_non_manifold_edges = int(np.count_nonzero(edge_counts > 2))
+    number_of_inconsistent_edges = int(
+        np.count_nonzero((edge_counts == 2) & (directions != 0)))
+    watertight = number_of_open_edges == 0 and \
+        number_of_non_manifold_edges == 0
+
+    return {
+        "number_of_triangles": len(triangles),
+        "number_of_degenerate_triangles": int(np.count_nonzero(degenerate)),
+        "number_of_open_edges": number_of_open_edges,
+        "number_of_non_manifold_edges": number_of_non_manifold_edges,
+        "number_of_inconsistent_edges": number_of_inconsistent_edges,
+        "signed_volume": signed_volume,
+        "volume_error": volume_error,
+        "watertight": watertight,
+        "valid": (
+            watertight
+            and number_of_inconsistent_edges == 0
+            and signed_volume > 0
+            and (volume_error is None or volume_error <= volume_tolerance)),
+    }
+
+
+def find_adaptive_faceting_tolerances(
+        solids: list,
+        triangle_budget: Optional[int] = None,
+        relative_tolerance: Optional[float] = None,
+        max_angular_tolerance: float = 0.5,
+        max_iterations: int = 10,
+) -> List[dict]:
+    """Finds a linear and angular faceting tolerance for each solid from its
+    size and curvature. The linear tolerance is the relative_tolerance
+    multiplied by the bounding box diagonal of the solid, so every solid is
+    faceted with the same relative accuracy. The angular tolerance is the
+    angle at which a chord deviates from an arc by the linear tolerance, for
+    an arc with a radius of 3 * volume / area (which is the radius of a sphere
+    or a cylinder and the half thickness of a thin shell). This refines small
+    or highly curved features of a solid more than its flat or gently curved
+    features.
+
+    When a triangle_budget is provided the relative_tolerance is scaled
+    (using the approximation that the number of triangles is inversely
+    proportional to the tolerance) until the total number of triangles is
+    within the budget. If a relative_tolerance is also provided it is only
+    relaxed if required to meet the budget.
+
+    Args:
+        solids: the CadQuery solids (Workplanes, Solids or Compounds).
+        triangle_budget: the maximum total number of triangles.
+        relative_tolerance: the linear tolerance as a fraction of the size of
+            each solid. Defaults to None which uses 1e-3 as the starting
+            value when a triangle_budget is provided.
+        max_angular_tolerance: the largest angular tolerance (radians) to
+            use.
+        max_iterations: the maximum number of times the solids are
+            triangulated when searching for the triangle_budget.
+
+    Returns:
+        A list of dictionaries, one for each solid, with the "tolerance",
+        "angular_tolerance" and resulting number of "triangles"
+    """
+
+    if triangle_budget is None and relative_tolerance is None:
+        raise ValueError(
+            "Either a triangle_budget or a relative_tolerance must be "
+            "provided to find adaptive faceting tolerances")
+
+    shapes = [get_cq_shape(solid) for solid in solids]
+
+    sizes = np.array([shape.BoundingBox().DiagonalLength for shape in shapes])
+    radii = np.array([3 * shape.Volume() / shape.Area() for shape in shapes])
+    radii = np.maximum(radii, np.finfo(float).tiny)
+
+    def facet_all(relative_tolerance):
+        tolerances = relative_tolerance * sizes
+        ratios = np.clip(tolerances / radii, 0., 1.)
+        angular_tolerances = np.minimum(
+            2 * np.arccos(1 - ratios), max_angular_tolerance)
+        triangles = np.array([
+            len(tessellate_solid(shape, tolerance, angular_tolerance)[1])
+            for shape, tolerance, angular_tolerance in zip(
+                shapes, tolerances, angular_tolerances)
+        ])
+        return tolerances, angular_tolerances, triangles
+
+    search_both_ways = relative_tolerance is None
+    if relative_tolerance is None:
+        relative_tolerance = 1e-3
+
+    result = facet_all(relative_tolerance)
+
+    if triangle_budget is not None:
+        best_result = None
+        for _ in range(max_iterations):
+            total = result[2].sum()
+            if total <= triangle_budget:
+                if best_result is None or total > best_result[2].sum():
+                    best_result = result
+                if not search_both_ways or total >= 0.9 * triangle_budget:
+                    break
+            relative_tolerance *= max(total, 1) / triangle_budget
+            result = facet_all(relative_tolerance)
+
+        total = result[2].sum()
+        if total <= triangle_budget and (
+                best_result is None or total > best_result[2].sum()):
+            best_result = result
+
+        if best_result is None:
+            warnings.warn(
+                "The triangle_budget of {} could not be met, the solids "
+                "require {} triangles".format(triangle_budget, total))
+        else:
+            result = best_result
+
+    return [
+        {
+            "tolerance": float(tolerance),
+            "angular_tolerance": float(angular_tolerance),
+            "triangles": int(triangles),
+        }
+        for tolerance, angular_tolerance, triangles in zip(*result)
+    ]
+
+
 def facet_wire(
         wire,
         facet_splines: bool = True,
@@ -431,6 +1785,254 @@ def facet_wire(
     return edges
 
 
+def facet_circular_arc(
+        point_a: Tuple[float, float],
+        point_b: Tuple[float, float],
+        point_c: Tuple[float, float],
+        tolerance: float = 1e-3,
+) -> np.ndarray:
+    """Facets the circular arc that starts at point_a, passes through point_b
+    and ends at point_c into a polyline. The angular step between points is
+    the largest step for which the chords deviate from the arc by less than
+    the tolerance. If the points are collinear the three points are returned.
+
+    Args:
+        point_a: the 2D coordinates of the start of the arc.
+        point_b: the 2D coordinates of a point on the arc.
+        point_c: the 2D coordinates of the end of the arc.
+        tolerance: the maximum distance between the arc and the polyline.
+
+    Returns:
+        numpy array of the 2D polyline coordinates with shape (N, 2)
+    """
+
+    points = np.array([point_a, point_b, point_c], dtype=float)[:, :2]
+
+    return facet_circular_arcs([points], tolerance=tolerance)[0]
+
+
+def facet_circular_arcs(
+        arcs: Union[np.ndarray, List[List[Tuple[float, float]]]],
+        tolerance: float = 1e-3,
+) -> List[np.ndarray]:
+    """Facets many circular arcs into polylines in one vectorised call. Each
+    arc is described by three points, the start of the arc, a point on the
+    arc and the end of the arc. The circumcentre and radius of every arc are
+    found at once and the angular step of each arc is the largest step for
+    which the chords deviate from the arc by less than the tolerance. Arcs
+    with collinear points are returned as the three points.
+
+    Args:
+        arcs: the 2D coordinates of the three points of each arc with a shape
+            of (n, 3, 2).
+        tolerance: the maximum distance between the arcs and the polylines.
+
+    Returns:
+        list of numpy arrays of the 2D polyline coordinates, one for each arc
+    """
+
+    points = np.asarray(arcs, dtype=float).reshape(-1, 3, 2)
+    if len(points) == 0:
+        return []
+
+    centres, radii = geometry_2d.circle_centres(
+        points[:, 0], points[:, 1], points[:, 2],
+        collinear_tolerance=5e-13)
+    # collinear points are returned unchanged so any circle can be used
+    collinear = np.isinf(radii)
+    centres[collinear], radii[collinear] = 0., 1.
+
+    angles = np.arctan2(
+        points[:, :, 1] - centres[:, np.newaxis, 1],
+        points[:, :, 0] - centres[:, np.newaxis, 0])
+    sweeps = (angles[:, 2] - angles[:, 0]) % (2 * np.pi)
+    # arcs that pass through the second point when travelling clockwise
+    clockwise = (angles[:, 1] - angles[:, 0]) % (2 * np.pi) > sweeps
+    sweeps[clockwise] -= 2 * np.pi
+
+    with np.errstate(divide='ignore'):
+        steps = 2 * np.arccos(1 - np.minimum(tolerance / radii, 1.))
+    number_of_steps = np.maximum(
+        np.ceil(np.abs(sweeps) / steps).astype(int), 2)
+
+    # all the polyline points are found together and then split into arcs
+    arc_index = np.repeat(np.arange(len(points)), number_of_steps + 1)
+    first_points = np.cumsum(number_of_steps + 1) - (number_of_steps + 1)
+    fractions = (np.arange(len(arc_index)) - first_points[arc_index]) / \
+        number_of_steps[arc_index]
+    arc_angles = angles[arc_index, 0] + sweeps[arc_index] * fractions
+    polylines = centres[arc_index] + radii[arc_index, np.newaxis] * \
+        np.column_stack([np.cos(arc_angles), np.sin(arc_angles)])
+
+    polylines[first_points] = points[:, 0]
+    polylines[first_points + number_of_steps] = points[:, 2]
+
+    polylines = np.split(polylines, first_points[1:])
+
+    return [
+        arc_points if is_collinear else polyline
+        for polyline, arc_points, is_collinear in zip(
+            polylines, points, collinear)
+    ]
+
+
+def facet_points(
+        points: List[tuple],
+        tolerance: float = 1e-3,
+        facet_splines: bool = True,
+        facet_circles: bool = True,
+) -> np.ndarray:
+    """Converts the points (with connection types) of a Shape into a polyline
+    by faceting the circle and spline connections. Straight and circle
+    connections are faceted with numpy, spline connections are interpolated
+    in the same way as Shape.create_solid and faceted by OCC. The results are
+    cached so faceting the same points again is free.
+
+    Args:
+        points: a list of tuples with the x, z coordinates and connection
+            type of each point, such as Shape.points.
+        tolerance: the maximum distance between the curved connections and
+            the polyline.
+        facet_splines: If True then spline connections will be faceted.
+            Otherwise the points are connected by straight lines.
+        facet_circles: If True then circle connections will be faceted.
+            Otherwise the points are connected by straight lines.
+
+    Returns:
+        read only numpy array of the polyline coordinates with shape (N, 2)
+    """
+
+    return _facet_points(
+        tuple(tuple(point) for point in points),
+        float(tolerance),
+        facet_splines,
+        facet_circles,
+    )
+
+
+@lru_cache(maxsize=256)
+def _facet_points(points, tolerance, facet_splines, facet_circles):
+
+    coordinates = np.array([point[:2] for point in points], dtype=float)
+    connections = [
+        point[2] if len(point) == 3 else 'straight' for point in points[:-1]
+    ]
+
+    # groups together common connection types as in Shape.create_solid
+    groups = []
+    start = 0
+    for index in range(1, len(connections) + 1):
+        if index == len(connections) or \
+                connections[index] != connections[start]:
+            groups.append((connections[start], start, index))
+            start = index
+
+    polylines = [coordinates[:1]]
+    for connection, start, end in groups:
+        group = coordinates[start:end + 1]
+        if connection == 'circle' and facet_circles and len(group) >= 3:
+            polyline = facet_circular_arc(*group[:3], tolerance=tolerance)
+        elif connection == 'spline' and facet_splines and len(group) >= 3:
+            edge = cq.Edge.makeSpline(
+                [cq.Vector(x, z, 0) for x, z in group])
+            curve = edge._geomAdaptor()
+            facets = GCPnts_QuasiUniformDeflection(
+                curve, tolerance,
+                curve.FirstParameter(), curve.LastParameter())
+            polyline = np.array([
+                (facets.Value(i + 1).X(), facets.Value(i + 1).Y())
+                for i in range(facets.NbPoints())
+            ])
+        else:
+            polyline = group
+        polylines.append(polyline[1:])
+
+    polyline = np.concatenate(polylines)
+    polyline.setflags(write=False)
+
+    return polyline
+
+
+def simplify_polyline(
+        points: Union[np.ndarray, List[tuple]],
+        tolerance: Optional[float] = None,
+        max_points: Optional[int] = None,
+) -> np.ndarray:
+    """Finds the points to keep when simplifying a polyline with the
+    Douglas-Peucker algorithm. The point furthest from the simplified
+    polyline is repeatedly added until it is within the tolerance of the
+    simplified polyline or the simplified polyline has max_points points. The
+    first and last points are always kept. Closed polylines (where the first
+    and last points are the same) are first split at the point furthest from
+    the start.
+
+    Args:
+        points: the polyline coordinates, only the first two values of each
+            point are used.
+        tolerance: the maximum distance between the removed points and the
+            simplified polyline.
+        max_points: the maximum number of points in the simplified polyline.
+
+    Returns:
+        numpy array of the sorted indices of the points to keep
+    """
+
+    if tolerance is None and max_points is None:
+        raise ValueError(
+            "Either a tolerance or max_points must be provided to simplify "
+            "a polyline")
+
+    coordinates = np.array([point[:2] for point in points], dtype=float)
+    number_of_points = len(coordinates)
+    if number_of_points <= 2:
+        return np.arange(number_of_points)
+
+    def furthest_point(start, end):
+        between = coordinates[start + 1:end] - coordinates[start]
+        if len(between) == 0:
+            return None
+        direction = coordinates[end] - coordinates[start]
+        length_squared = np.dot(direction, direction)
+        # distances to the segment between the start and end points
+        if length_squared == 0:
+            along = np.zeros(len(between))
+        else:
+            along = np.clip(between @ direction / length_squared, 0, 1)
+        offsets = between - along[:, np.newaxis] * direction
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        index = int(np.argmax(distances))
+        return (-distances[index], start + 1 + index, start, end)
+
+    keep = np.zeros(number_of_points, dtype=bool)
+    keep[[0, -1]] = True
+    segments = [(0, number_of_points - 1)]
+    if np.array_equal(coordinates[0], coordinates[-1]):
+        split = int(np.argmax(
+            np.hypot(*(coordinates - coordinates[0]).T)))
+        keep[split] = True
+        segments = [(0, split), (split, number_of_points - 1)]
+
+    queue = []
+    for start, end in segments:
+        candidate = furthest_point(start, end)
+        if candidate is not None:
+            heapq.heappush(queue, candidate)
+
+    while queue:
+        if max_points is not None and keep.sum() >= max_points:
+            break
+        negative_distance, index, start, end = heapq.heappop(queue)
+        if tolerance is not None and -negative_distance <= tolerance:
+            break
+        keep[index] = True
+        for segment in [(start, index), (index, end)]:
+            candidate = furthest_point(*segment)
+            if candidate is not None:
+                heapq.heappush(queue, candidate)
+
+    return np.flatnonzero(keep)
+
+
 def coefficients_of_line_from_points(
         point_a: Tuple[float, float], point_b: Tuple[float, float]) -> Tuple[float, float]:
     """Computes the m and c coefficients of the equation (y=mx+c) for
@@ -444,11 +2046,8 @@ def coefficients_of_line_from_points(
         m coefficient and c coefficient
     """
 
-    points = [point_a, point_b]
-    x_coords, y_coords = zip(*points)
-    coord_array = np.vstack([x_coords, np.ones(len(x_coords))]).T
-    m, c = np.linalg.lstsq(coord_array, y_coords, rcond=None)[0]
-    return m, c
+    m, c = geometry_2d.line_coefficients(point_a, point_b)
+    return float(m), float(c)
 
 
 def cut_solid(solid, cutter):
@@ -463,15 +2062,78 @@ def cut_solid(solid, cutter):
         Shape: The original shape cut with the cutter shape(s)
     """
 
-    # Allows for multiple cuts to be applied
+    # Allows for multiple cuts to be applied in a single boolean operation
     if isinstance(cutter, Iterable):
-        for cutting_solid in cutter:
-            solid = solid.cut(cutting_solid.solid)
-    else:
-        solid = solid.cut(cutter.solid)
+        tools = [get_cq_shape(cutting_solid.solid) for cutting_solid in cutter]
+        if len(tools) == 0:
+            return solid
+        if isinstance(solid, cq.Workplane):
+            return solid.newObject(
+                [get_cq_shape(solid).cut(*tools).clean()])
+        return solid.cut(*tools)
+
+    solid = solid.cut(cutter.solid)
     return solid
 
 
+def split_solid(
+        solid,
+        cells: list,
+        run_parallel: bool = True,
+) -> List[List[cq.Shape]]:
+    """Splits a solid into the parts inside each of a set of cells (such as
+    segmentation wedges) with a single General Fuse operation, rather than
+    intersecting the solid with each cell in turn. The cells should not
+    overlap each other and parts of the solid outside of every cell are
+    discarded.
+
+    Args:
+        solid (CadQuery.Workplane or CadQuery.Shape): the solid to split.
+        cells (list of CadQuery.Workplane or CadQuery.Shape): the solids that
+            the solid is split between.
+        run_parallel: use the OCC parallel mode for the General Fuse.
+
+    Returns:
+        A list containing a list of the parts of the solid inside each cell
+    """
+
+    arguments = get_cq_shape(solid).Solids()
+    cells = [get_cq_shape(cell) for cell in cells]
+
+    builder = BOPAlgo_Builder()
+    for argument in arguments + cells:
+        builder.AddArgument(argument.wrapped)
+    builder.SetRunParallel(run_parallel)
+    builder.Perform()
+
+    if builder.HasErrors():
+        raise ValueError(
+            "The General Fuse operation used to split the solid failed")
+
+    def images(shape):
+        modified = []
+        iterator = TopTools_ListIteratorOfListOfShape(
+            builder.Modified(shape.wrapped))
+        while iterator.More():
+            modified.append(iterator.Value())
+            iterator.Next()
+        if len(modified) == 0 and not builder.IsDeleted(shape.wrapped):
+            modified.append(shape.wrapped)
+        return modified
+
+    # parts common to the solid and a cell are shared by the images of both
+    parts = [part for argument in arguments for part in images(argument)]
+    split_parts = []
+    for cell in cells:
+        cell_parts = images(cell)
+        split_parts.append([
+            cq.Shape.cast(part) for part in parts
+            if any(part.IsSame(cell_part) for cell_part in cell_parts)
+        ])
+
+    return split_parts
+
+
 def diff_between_angles(angle_a: float, angle_b: float) -> float:
     """Calculates the difference between two angles angle_a and angle_b
 
@@ -501,10 +2163,7 @@ def distance_between_two_points(point_a: Tuple[float, float],
         float: distance between A and B
     """
 
-    xa, ya = point_a
-    xb, yb = point_b
-    u_vec = [xb - xa, yb - ya]
-    return np.linalg.norm(u_vec)
+    return float(geometry_2d.distances(point_a, point_b))
 
 
 def extend(point_a: Tuple[float, float], point_b: Tuple[float, float],
@@ -519,14 +2178,8 @@ def extend(point_a: Tuple[float, float], point_b: Tuple[float, float],
         float, float: point C coordinates
     """
 
-    xa, ya = point_a
-    xb, yb = point_b
-    u_vec = [xb - xa, yb - ya]
-    u_vec /= np.linalg.norm(u_vec)
-
-    xc = xa + L * u_vec[0]
-    yc = ya + L * u_vec[1]
-    return xc, yc
+    xc, yc = geometry_2d.extend_points(point_a, point_b, L)
+    return float(xc), float(yc)
 
 
 def find_center_point_of_circle(
@@ -546,25 +2199,12 @@ def find_center_point_of_circle(
         None if 3 points on a line are input and the radius
     """
 
-    temp = point_b[0] * point_b[0] + point_b[1] * point_b[1]
-    bc = (point_a[0] * point_a[0] + point_a[1] * point_a[1] - temp) / 2
-    cd = (temp - point_3[0] * point_3[0] - point_3[1] * point_3[1]) / 2
-    det = (point_a[0] - point_b[0]) * (point_b[1] - point_3[1]) - (
-        point_b[0] - point_3[0]
-    ) * (point_a[1] - point_b[1])
+    centre, radius = geometry_2d.circle_centres(point_a, point_b, point_3)
 
-    if abs(det) < 1.0e-6:
+    if np.isinf(radius):
         return (None, np.inf)
 
-    # Center of circle
-    cx = (bc * (point_b[1] - point_3[1]) -
-          cd * (point_a[1] - point_b[1])) / det
-    cy = ((point_a[0] - point_b[0]) * cd -
-          (point_b[0] - point_3[0]) * bc) / det
-
-    radius = np.sqrt((cx - point_a[0]) ** 2 + (cy - point_a[1]) ** 2)
-
-    return (cx, cy), radius
+    return (float(centre[0]), float(centre[1])), float(radius)
 
 
 def intersect_solid(solid, intersecter):
@@ -601,12 +2241,8 @@ def rotate(origin: Tuple[float, float], point: Tuple[float, float],
         float, float: rotated point coordinates.
     """
 
-    ox, oy = origin
-    px, py = point
-
-    qx = ox + math.cos(angle) * (px - ox) - math.sin(angle) * (py - oy)
-    qy = oy + math.sin(angle) * (px - ox) + math.cos(angle) * (py - oy)
-    return qx, qy
+    qx, qy = geometry_2d.rotate_points(origin, point, angle)
+    return float(qx), float(qy)
 
 
 def union_solid(solid, joiner):
@@ -640,6 +2276,37 @@ def calculate_wedge_cut(self):
     return cutting_wedge
 
 
+def find_angular_extent(solid) -> Optional[Tuple[float, float]]:
+    """Finds the range of azimuthal angles (about the Z axis) covered by the
+    bounding box of a solid. The angles are measured anticlockwise from the
+    X axis when viewed from above (the same direction as positive
+    azimuth_placement_angle and rotation_angle values).
+
+    Args:
+        solid (CadQuery.Workplane or CadQuery.Shape): the solid.
+
+    Returns:
+        the minimum and maximum angles in degrees, or None if the bounding
+        box contains the Z axis (in which case the solid may cover every
+        angle)
+    """
+
+    box = get_cq_shape(solid).BoundingBox()
+    if box.xmin <= 0 <= box.xmax and box.ymin <= 0 <= box.ymax:
+        return None
+
+    corners = np.array([
+        (box.xmin, box.ymin), (box.xmin, box.ymax),
+        (box.xmax, box.ymin), (box.xmax, box.ymax),
+    ])
+    centre = corners.mean(axis=0)
+    centre_angle = np.degrees(np.arctan2(centre[1], centre[0]))
+    angles = np.degrees(np.arctan2(corners[:, 1], corners[:, 0]))
+    angles = (angles - centre_angle + 180) % 360 - 180 + centre_angle
+
+    return float(angles.min()), float(angles.max())
+
+
 def add_thickness(x: List[float], y: List[float], thickness: float,
                   dy_dx: List[float] = None):
     """Computes outer curve points based on thickness
@@ -655,38 +2322,10 @@ def add_thickness(x: List[float], y: List[float], thickness: float,
         (list, list): R and Z lists for outer curve points
     """
 
-    if dy_dx is None:
-        dy_dx = np.diff(y) / np.diff(x)
-
-    x_outer, y_outer = [], []
-    for i in range(len(dy_dx)):
-        if dy_dx[i] == float('-inf'):
-            nx, ny = -1, 0
-        elif dy_dx[i] == float('inf'):
-            nx, ny = 1, 0
-        else:
-            nx = -dy_dx[i]
-            ny = 1
-        if i != len(dy_dx) - 1:
-            if x[i] < x[i + 1]:
-                convex = False
-            else:
-                convex = True
-
-        if convex:
-            nx *= -1
-            ny *= -1
-        # normalise normal vector
-        normal_vector_norm = (nx ** 2 + ny ** 2) ** 0.5
-        nx /= normal_vector_norm
-        ny /= normal_vector_norm
-        # calculate outer points
-        val_x_outer = x[i] + thickness * nx
-        val_y_outer = y[i] + thickness * ny
-        x_outer.append(val_x_outer)
-        y_outer.append(val_y_outer)
+    outer_points = geometry_2d.offset_curve(
+        x, y, thickness=thickness, gradients=dy_dx)
 
-    return x_outer, y_outer
+    return outer_points[:, 0].tolist(), outer_points[:, 1].tolist()
 
 
 def get_hash(shape, ignored_keys: List) -> str:
@@ -709,7 +2348,16 @@ def get_hash(shape, ignored_keys: List) -> str:
             if key in shape_dict.keys():
                 shape_dict[key] = None
 
-    hash_object.update(str(list(shape_dict.values())).encode("utf-8"))
+    # the text of large numpy arrays is abbreviated so their bytes are used
+    values = []
+    for value in shape_dict.values():
+        if isinstance(value, np.ndarray) and value.dtype.kind != "O":
+            hash_object.update(str((value.shape, value.dtype)).encode("utf-8"))
+            hash_object.update(np.ascontiguousarray(value).tobytes())
+            value = None
+        values.append(value)
+
+    hash_object.update(str(values).encode("utf-8"))
     value = hash_object.hexdigest()
     return value
 
@@ -1016,11 +2664,12 @@ def convert_circle_to_spline(
         p_1: Tuple[float, float],
         p_2: Tuple[float, float],
         tolerance: Optional[float] = 0.1
-) -> List[Tuple[float, float, str]]:
+) -> List[Tuple[float, float]]:
     """Converts three points on the edge of a circle into a series of points
-    on the edge of the circle. This is done by creating a circle edge from the
-    the points provided (p_0, p_1, p_2), facets the circle with the provided
-    tolerance to extracts the points on the faceted edge and returns them.
+    on the edge of the circle. The circle through the points provided (p_0,
+    p_1, p_2) is faceted with the provided tolerance and the points on the
+    faceted edge are returned. Use facet_circular_arcs to convert many
+    circles in one call.
 
     Args:
         p_0: coordinates of the first point
@@ -1032,19 +2681,9 @@ def convert_circle_to_spline(
         The new points
     """
 
-    # work plane is arbitrarily selected and has no impact of function
-    solid = cq.Workplane('XZ').center(0, 0)
-    solid = solid.moveTo(p_0[0], p_0[1]).threePointArc(p_1, p_2)
-    edge = solid.vals()[0]
-
-    new_edge = paramak.utils.transform_curve(edge, tolerance=tolerance)
+    points = facet_circular_arc(p_0, p_1, p_2, tolerance=tolerance)
 
-    points = paramak.utils.extract_points_from_edges(
-        edges=new_edge,
-        view_plane='XZ'
-    )
-
-    return points
+    return [tuple(point) for point in points.tolist()]
 
 
 class FaceAreaSelector(cq.Selector):
@@ -1,10 +1,12 @@
 
 import json
+import math
 import os
 import unittest
 from pathlib import Path
 
 import cadquery as cq
+import numpy as np
 import paramak
 import pytest
 
@@ -1020,6 +1022,29 @@ class TestReactor(unittest.TestCase):
         assert Path("test_html.html").exists() is True
         os.system("rm test_html.html")
 
+    def test_export_html_has_one_trace_per_shape(self):
+        """Exports a html graph of a reactor and checks there is a trace for
+        each shape and that max_points limits the points in each trace"""
+
+        test_shape = paramak.RotateMixedShape(
+            points=[
+                (100, 0, 'straight'),
+                (200, 0, 'circle'),
+                (250, 50, 'circle'),
+                (200, 100, 'straight'),
+                (100, 100, 'straight'),
+            ],
+            name='mixed_shape')
+        test_reactor = paramak.Reactor([test_shape, self.test_shape2])
+
+        fig = test_reactor.export_html(filename=None, tolerance=1e-3)
+        assert len(fig.data) == 2
+        assert fig.data[0].name == 'mixed_shape'
+
+        fig = test_reactor.export_html(
+            filename=None, tolerance=1e-3, max_points=10)
+        assert len(fig.data[0].x) <= 10
+
     def test_export_3d_html(self):
         """Checks the 3d html file is exported by the export_html_3d method
         with the correct filename"""
@@ -1226,7 +1251,7 @@ class TestReactor(unittest.TestCase):
     def test_export_h5m_with_pymoab_without_plasma(self):
         """exports a h5m file with pymoab without the plasma"""
 
-        os.system('rm *.stl')
+        os.system('rm -r *.stl no_plasma with_plasma')
 
         test_shape1 = paramak.RotateStraightShape(
             points=[(0, 0), (0, 20), (20, 20)],
@@ -1238,13 +1263,21 @@ class TestReactor(unittest.TestCase):
 
         my_reactor = paramak.Reactor([test_shape1, test_shape2])
         my_reactor.export_h5m_with_pymoab(
-            include_plasma=False, filename='no_plasma.h5m')
+            include_plasma=False, filename='no_plasma.h5m',
+            output_folder='no_plasma')
 
-        assert Path('RotateStraightShape.stl').is_file()
-        assert Path('plasma.stl').is_file() is False
+        assert Path('no_plasma/RotateStraightShape.stl').is_file()
+        assert Path('no_plasma/plasma.stl').is_file() is False
         my_reactor.export_h5m_with_pymoab(
-            include_plasma=True, filename='with_plasma.h5m')
-        assert Path('plasma.stl').is_file()
+            include_plasma=True, filename='with_plasma.h5m',
+            output_folder='with_plasma')
+        assert Path('with_plasma/plasma.stl').is_file()
+        # without an output_folder nothing but the h5m file is written
+        my_reactor.export_h5m_with_pymoab(
+            include_plasma=True, filename='default_folder.h5m')
+        assert Path('default_folder.h5m').is_file()
+        assert Path('RotateStraightShape.stl').is_file() is False
+        assert Path('plasma.stl').is_file() is False
         assert Path('with_plasma.h5m').stat().st_size > Path(
             'no_plasma.h5m').stat().st_size
 
@@ -1285,6 +1318,66 @@ class TestReactor(unittest.TestCase):
         self.test_reactor.export_vtk(filename='suffixless_filename')
         assert Path('suffixless_filename.vtk').is_file()
 
+    def test_triangulations(self):
+        """Triangulates the reactor in memory and checks there is an entry for
+        each shape and the graveyard when requested"""
+
+        triangulations = self.test_reactor_2.triangulations()
+        assert len(triangulations) == 2
+        for triangulation in triangulations:
+            assert triangulation["vertices"].shape[1] == 3
+            assert triangulation["triangles"].shape[1] == 3
+
+        triangulations = self.test_reactor_2.triangulations(
+            include_graveyard=True)
+        assert len(triangulations) == 3
+        assert triangulations[-1]["material_tag"] == "graveyard"
+
+    def test_export_vtm(self):
+        """Creates a vtm file directly from the triangulated shapes and checks
+        that the file and a vtu file for each shape exist"""
+
+        os.system('rm -r reactor reactor.vtm')
+
+        filename = self.test_reactor_2.export_vtm()
+        assert filename == 'reactor.vtm'
+        assert Path('reactor.vtm').is_file()
+        assert Path('reactor/block_0.vtu').is_file()
+        assert Path('reactor/block_1.vtu').is_file()
+
+        self.test_reactor_2.export_vtm(
+            filename='reactor_with_graveyard', include_graveyard=True,
+            parallel=True)
+        assert Path('reactor_with_graveyard.vtm').is_file()
+        assert Path('reactor_with_graveyard/block_2.vtu').is_file()
+
+    def test_export_glb(self):
+        """Creates a glb file of the reactor and checks the file exists"""
+
+        os.system('rm *.glb')
+
+        filename = self.test_reactor_2.export_glb()
+        assert filename == 'reactor.glb'
+        assert Path('reactor.glb').is_file()
+
+        self.test_reactor_2.export_glb(
+            filename='unquantized_reactor', quantize=False)
+        assert Path('unquantized_reactor.glb').is_file()
+
+    def test_triangulations_instanced(self):
+        """Triangulates a reactor containing a shape with several azimuth
+        placement angles and checks the copies are instanced"""
+
+        test_shape = paramak.ExtrudeStraightShape(
+            points=[(100, 0), (100, 20), (120, 20), (120, 0)],
+            distance=10,
+            azimuth_placement_angle=[0, 120, 240])
+        test_reactor = paramak.Reactor([test_shape])
+
+        triangulations = test_reactor.triangulations(instanced=True)
+        assert len(triangulations) == 1
+        assert len(triangulations[0]["matrices"]) == 3
+
     def test_export_vtk_without_h5m_raises_error(self):
         """exports a h5m file when shapes_and_components is set to a string"""
 
@@ -1294,6 +1387,322 @@ class TestReactor(unittest.TestCase):
 
         self.assertRaises(ValueError, check_correct_error_is_rasied)
 
+    def test_adaptive_faceting_tolerances_scale_with_size(self):
+        """Finds adaptive faceting tolerances for a small and a large shape and
+        checks that the larger shape is given the larger tolerance and that
+        the number of triangles is reported for each shape"""
+
+        small_shape = paramak.RotateStraightShape(
+            points=[(10, 0), (10, 2), (12, 2), (12, 0)],
+            stl_filename='small.stl')
+        large_shape = paramak.RotateStraightShape(
+            points=[(100, 0), (100, 200), (300, 200), (300, 0)],
+            stl_filename='large.stl')
+        test_reactor = paramak.Reactor(
+            [small_shape, large_shape],
+            relative_faceting_tolerance=1e-3)
+
+        tolerances = test_reactor.adaptive_faceting_tolerances()
+
+        assert len(tolerances) == 2
+        assert tolerances[0]['stl_filename'] == 'small.stl'
+        assert tolerances[0]['tolerance'] < tolerances[1]['tolerance']
+        for entry in tolerances:
+            assert entry['triangles'] > 0
+            assert entry['angular_tolerance'] > 0
+
+    def test_adaptive_faceting_tolerances_with_triangle_budget(self):
+        """Finds adaptive faceting tolerances with a triangle budget and checks
+        the total number of triangles is within the budget"""
+
+        test_shape = paramak.RotateSplineShape(
+            points=[(100, 0), (200, 100), (300, 0), (200, -100)])
+        test_reactor = paramak.Reactor([test_shape], triangle_budget=2000)
+
+        tolerances = test_reactor.adaptive_faceting_tolerances()
+        total = sum([entry['triangles'] for entry in tolerances])
+        assert total <= 2000
+
+        finer_tolerances = test_reactor.adaptive_faceting_tolerances(
+            triangle_budget=20000)
+        assert finer_tolerances[0]['tolerance'] < tolerances[0]['tolerance']
+
+    def test_export_stl_with_relative_faceting_tolerance(self):
+        """Exports stl files with adaptive faceting and checks the files are
+        produced"""
+
+        os.system('rm *.stl')
+        test_reactor = paramak.Reactor(
+            [self.test_shape, self.test_shape2],
+            relative_faceting_tolerance=1e-2)
+        filenames = test_reactor.export_stl(include_graveyard=False)
+        assert len(filenames) == 2
+        for filename in filenames:
+            assert Path(filename).is_file()
+
+    def test_triangle_budget_setting_checking(self):
+        """Attempts to set the triangle_budget and relative_faceting_tolerance
+        to incorrect values which should raise errors"""
+
+        def incorrect_triangle_budget_type():
+            self.test_reactor.triangle_budget = 1.5
+        self.assertRaises(TypeError, incorrect_triangle_budget_type)
+
+        def incorrect_triangle_budget_size():
+            self.test_reactor.triangle_budget = 0
+        self.assertRaises(ValueError, incorrect_triangle_budget_size)
+
+        def incorrect_relative_faceting_tolerance_size():
+            self.test_reactor.relative_faceting_tolerance = -1e-3
+        self.assertRaises(
+            ValueError, incorrect_relative_faceting_tolerance_size)
+
+    def test_material_at(self):
+        """Finds the material tags of the shapes containing points, with the
+        first shape taking precedence where the shapes overlap"""
+
+        inner_shape = paramak.RotateStraightShape(
+            points=[(0, -10), (10, -10), (10, 10), (0, 10)],
+            material_tag='inner_mat')
+        outer_shape = paramak.RotateStraightShape(
+            points=[(0, -20), (20, -20), (20, 20), (0, 20)],
+            material_tag='outer_mat')
+        test_reactor = paramak.Reactor([inner_shape, outer_shape])
+
+        materials = test_reactor.material_at(
+            [(5, 0, 0), (0, 15, 0), (0, 0, 30)])
+
+        assert materials.tolist() == ['inner_mat', 'outer_mat', None]
+
+    def test_export_voxel_map(self):
+        """Exports a voxel map of a reactor in several slabs and checks the
+        materials of voxels inside and outside of the shapes"""
+
+        os.system('rm voxel_map.npz')
+
+        inner_shape = paramak.RotateStraightShape(
+            points=[(0, -10), (10, -10), (10, 10), (0, 10)],
+            material_tag='inner_mat')
+        outer_shape = paramak.RotateStraightShape(
+            points=[(10, -10), (20, -10), (20, 10), (10, 10)],
+            material_tag='outer_mat')
+        test_reactor = paramak.Reactor([inner_shape, outer_shape])
+
+        filename = test_reactor.export_voxel_map(
+            filename='voxel_map',
+            resolution=(10, 10, 5),
+            bounds=((-25, -25, -15), (25, 25, 15)),
+            chunk_size=200,
+            parallel=True,
+        )
+
+        assert filename == 'voxel_map.npz'
+        voxel_map = np.load(filename)
+        material_ids = voxel_map['material_ids']
+        material_tags = voxel_map['material_tags']
+
+        assert material_ids.shape == (10, 10, 5)
+        assert material_tags.tolist() == ['', 'inner_mat', 'outer_mat']
+        # voxel centres at (2.5, 2.5, 0), (17.5, 2.5, 0) and (22.5, 22.5, 0)
+        assert material_tags[material_ids[5, 5, 2]] == 'inner_mat'
+        assert material_tags[material_ids[8, 5, 2]] == 'outer_mat'
+        assert material_tags[material_ids[9, 9, 2]] == ''
+        # the top and bottom layers are outside of the shapes
+        assert np.all(material_ids[:, :, [0, 4]] == 0)
+
+        def incorrect_resolution():
+            test_reactor.export_voxel_map(resolution=(10, 10))
+        self.assertRaises(ValueError, incorrect_resolution)
+
+    def test_export_voxel_map_in_parallel(self):
+        """Exports voxel maps of a reactor with a parametric component and
+        an extruded shape in parallel and in series and checks the maps are
+        the same, after checking the shapes are prepared to be shared by the
+        threads"""
+
+        os.system('rm voxel_map_parallel.npz voxel_map_series.npz')
+
+        shield = paramak.CenterColumnShieldCylinder(
+            height=20, inner_radius=5, outer_radius=10,
+            material_tag='shield_mat')
+        box = paramak.ExtrudeStraightShape(
+            points=[(15, -5), (25, -5), (25, 5), (15, 5)], distance=10,
+            material_tag='box_mat')
+        test_reactor = paramak.Reactor([shield, box])
+
+        # the shapes are prepared before the threads start
+        test_reactor._prepare_queried_shapes([shield, box], tolerance=1e-3)
+        assert shield.points_hash_value is not None
+        assert box.hash_value is not None
+
+        voxel_map_arguments = {
+            'resolution': (12, 12, 6),
+            'bounds': ((-30, -30, -15), (30, 30, 15)),
+            'chunk_size': 144,
+        }
+        parallel_map = np.load(test_reactor.export_voxel_map(
+            filename='voxel_map_parallel', parallel=True, max_workers=6,
+            **voxel_map_arguments))
+
+        series_map = np.load(test_reactor.export_voxel_map(
+            filename='voxel_map_series', **voxel_map_arguments))
+
+        material_ids = parallel_map['material_ids']
+        material_tags = parallel_map['material_tags']
+        assert np.array_equal(material_ids, series_map['material_ids'])
+        # voxel centres at (7.5, 2.5, 2.5) and (17.5, 2.5, 2.5)
+        assert material_tags[material_ids[7, 6, 3]] == 'shield_mat'
+        assert material_tags[material_ids[9, 6, 3]] == 'box_mat'
+
+        os.system('rm voxel_map_parallel.npz voxel_map_series.npz')
+
+    def test_export_csg(self):
+        """Exports a reactor with a revolved rectangle, a poloidal field coil
+        set and a revolved triangle and checks that only the triangle is left
+        to DAGMC in the hybrid manifest"""
+
+        os.system('rm csg.json hybrid_manifest.json')
+
+        vessel = paramak.RotateStraightShape(
+            points=[(0, -10), (20, -10), (20, 10), (0, 10)],
+            material_tag='vessel_mat',
+            name='vessel')
+        coils = paramak.PoloidalFieldCoilSet(
+            heights=[2, 2],
+            widths=[2, 2],
+            center_points=[(30, 5), (30, -5)],
+            material_tag='coil_mat',
+            name='coils')
+        triangle = paramak.RotateStraightShape(
+            points=[(40, 0), (50, 0), (45, 5)],
+            material_tag='triangle_mat',
+            stp_filename='triangle.stp',
+            name='triangle')
+        test_reactor = paramak.Reactor([vessel, coils, triangle])
+
+        filenames = test_reactor.export_csg()
+
+        assert filenames == ('csg.json', 'hybrid_manifest.json')
+        with open('csg.json') as f:
+            csg = json.load(f)
+        with open('hybrid_manifest.json') as f:
+            manifest = json.load(f)
+
+        assert [c["material_tag"] for c in csg["cells"]] == [
+            'vessel_mat', 'coil_mat']
+        # each coil is a separate rectangle
+        assert csg["cells"][1]["region"].count("|") == 1
+        assert manifest["csg_cells"] == ['vessel', 'coils']
+        assert [d["material_tag"] for d in manifest["dagmc"]] == [
+            'triangle_mat', 'graveyard']
+
+    def test_check_overlaps(self):
+        """Checks the overlaps and clearances of revolved shapes, that
+        touching shapes are valid and that shapes in separate azimuthal
+        sectors are not compared"""
+
+        inner_shape = paramak.RotateStraightShape(
+            points=[(10, -10), (20, -10), (20, 10), (10, 10)],
+            name='inner')
+        touching_shape = paramak.RotateStraightShape(
+            points=[(20, -10), (30, -10), (30, 10), (20, 10)],
+            name='touching')
+        overlapping_shape = paramak.RotateStraightShape(
+            points=[(15, 5), (25, 5), (25, 15), (15, 15)],
+            name='overlapping')
+        test_reactor = paramak.Reactor(
+            [inner_shape, touching_shape, overlapping_shape])
+
+        with pytest.warns(UserWarning):
+            reports = test_reactor.check_overlaps()
+
+        assert [r["names"] for r in reports] == [
+            ('inner', 'touching'), ('inner', 'overlapping'),
+            ('touching', 'overlapping')]
+        assert [r["valid"] for r in reports] == [True, False, False]
+        assert reports[0]["clearance"] == 0
+        assert reports[1]["overlap_area"] == pytest.approx(25)
+
+        # the overlapping shape is rotated away from the inner shape
+        inner_shape.rotation_angle = 90
+        overlapping_shape.rotation_angle = 90
+        overlapping_shape.azimuth_placement_angle = 180
+        touching_shape.points = [(25, 12), (30, 12), (30, 30), (25, 30)]
+
+        with pytest.warns(UserWarning):
+            reports = test_reactor.check_overlaps(min_clearance=6)
+        assert [r["names"] for r in reports] == [
+            ('inner', 'touching'), ('touching', 'overlapping')]
+        assert reports[0]["clearance"] == pytest.approx(math.hypot(5, 2))
+        assert reports[1]["clearance"] == 0
+        assert [r["valid"] for r in reports] == [False, True]
+
+    def test_cast_rays(self):
+        """Casts rays outwards from the centre of a reactor with an inner and
+        an outer cylinder and checks the shapes, distances and normals of the
+        first hits"""
+
+        inner_shape = paramak.RotateStraightShape(
+            points=[(10, -10), (20, -10), (20, 10), (10, 10)],
+            material_tag='inner_mat',
+            name='inner')
+        outer_shape = paramak.RotateStraightShape(
+            points=[(30, -10), (40, -10), (40, 10), (30, 10)],
+            material_tag='outer_mat',
+            name='outer')
+        test_reactor = paramak.Reactor([inner_shape, outer_shape])
+
+        hits = test_reactor.cast_rays(
+            origins=[(0, 0, 0), (0, 0, 0), (25, 0, 0), (0, 0, 0)],
+            directions=[(1, 0, 0), (0, 1, 0), (1, 0, 0), (0, 0, 1)],
+            parallel=True)
+
+        assert hits["names"].tolist() == ['inner', 'inner', 'outer', None]
+        assert hits["material_tags"].tolist() == [
+            'inner_mat', 'inner_mat', 'outer_mat', None]
+        assert hits["distances"][:3] == pytest.approx([10, 10, 5], rel=1e-3)
+        assert np.isinf(hits["distances"][3])
+        assert hits["points"][0] == pytest.approx((10, 0, 0), rel=1e-3)
+        # the inner faces of the cylinders face towards the z axis
+        assert hits["normals"][0] == pytest.approx((-1, 0, 0), abs=0.05)
+        assert np.all(np.isnan(hits["points"][3]))
+
+    def test_export_h5m_with_pymoab_checks_meshes(self):
+        """Exports a h5m file with the meshes checked as the stl files are
+        added, checks the stl files written are valid and that an incorrect
+        mesh_check raises a ValueError"""
+
+        os.system("rm -r checked_stl_files checked.h5m")
+
+        self.test_reactor_2.export_h5m_with_pymoab(
+            filename="checked.h5m",
+            output_folder="checked_stl_files",
+            mesh_check="raise",
+        )
+
+        assert Path("checked.h5m").is_file()
+        for entry in self.test_reactor_2.shapes_and_components:
+            vertices, triangles = paramak.utils.read_stl(
+                Path("checked_stl_files") / entry.stl_filename)
+            assert paramak.utils.check_mesh(
+                vertices, triangles)["valid"] is True
+
+        def incorrect_mesh_check():
+            self.test_reactor_2.export_h5m_with_pymoab(mesh_check="error")
+
+        self.assertRaises(ValueError, incorrect_mesh_check)
+
+        os.system("rm -r checked_stl_files checked.h5m")
+
+    def test_check_meshes(self):
+        """Checks the meshes of the shapes in a reactor are valid"""
+
+        reports = self.test_reactor_2.check_meshes(tolerance=0.01)
+
+        assert len(reports) == 2
+        assert reports[0]["name"] == self.test_shape.name
+        assert all(report["valid"] for report in reports)
+
 
 if __name__ == "__main__":
     unittest.main()
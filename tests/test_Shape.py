@@ -1,8 +1,11 @@
 
 import json
+import math
 import os
 import unittest
+from decimal import Decimal
 from pathlib import Path
+import numpy as np
 from numpy.testing._private.utils import assert_
 
 import paramak
@@ -281,6 +284,146 @@ class TestShape(unittest.TestCase):
 
         self.assertRaises(ValueError, incorrect_y_point_value_type)
 
+    def test_points_from_array(self):
+        """Sets the points of a shape with a numpy array and checks the list
+        of tuples view and the array backed coordinates and connections."""
+
+        test_shape = paramak.RotateStraightShape(
+            points=np.array([[0, 0], [0, 20], [20, 20], [20, 0]]))
+
+        assert test_shape.points == [
+            (0, 0, "straight"),
+            (0, 20, "straight"),
+            (20, 20, "straight"),
+            (20, 0, "straight"),
+            (0, 0, "straight"),
+        ]
+        assert test_shape.point_coordinates.shape == (5, 2)
+        assert test_shape.point_connections.tolist() == [0, 0, 0, 0, 0]
+        assert test_shape.volume == pytest.approx(math.pi * 20**2 * 20)
+
+        def incorrect_array_shape():
+            test_shape.points = np.array([[0, 0, 0], [0, 20, 0]])
+
+        self.assertRaises(ValueError, incorrect_array_shape)
+
+    def test_csg_region(self):
+        """Finds the CSG regions of a revolved rectangle with and without a
+        hole in the middle, and of a partial rotation, and checks shapes with
+        curved or sloped edges have no CSG region"""
+
+        surfaces = []
+        test_shape = paramak.RotateStraightShape(
+            points=[(0, -10), (20, -10), (20, 10), (0, 10)])
+        assert test_shape.csg_region(surfaces) == "((1 -2 -3))"
+        assert [s["type"] for s in surfaces] == [
+            'z-plane', 'z-plane', 'z-cylinder']
+        assert surfaces[2]["coefficients"] == {"x0": 0, "y0": 0, "r": 20}
+
+        # the planes and outer cylinder are shared with the first shape
+        test_shape.points = [(10, -10), (20, -10), (20, 10), (10, 10)]
+        test_shape.rotation_angle = 90
+        assert test_shape.csg_region(surfaces) == \
+            "((1 -2 -3 4)) ((5 -6))"
+        assert len(surfaces) == 6
+        assert surfaces[5]["coefficients"]["a"] == pytest.approx(-1)
+
+        test_shape = paramak.RotateMixedShape(
+            points=[(10, -10, 'straight'), (20, 0, 'straight'),
+                    (10, 10, 'straight')])
+        assert test_shape.csg_region(surfaces) is None
+        test_shape = paramak.RotateMixedShape(
+            points=[(10, -10, 'circle'), (20, 0, 'circle'),
+                    (10, 10, 'straight')])
+        assert test_shape.csg_region(surfaces) is None
+
+    def test_contains(self):
+        """Checks which points are inside a revolved shape, found from its 2D
+        points, and inside an extruded shape, found with OCC."""
+
+        test_shape = paramak.RotateStraightShape(
+            points=[(10, -10), (20, -10), (20, 10), (10, 10)],
+            rotation_angle=90,
+            azimuth_placement_angle=[0, 180])
+
+        points = [
+            (15, 1, 0),     # inside the first copy
+            (-15, -1, 5),   # inside the second copy
+            (-1, 15, 0),    # in the gap between the copies
+            (5, 1, 0),      # inside the central hole
+            (15, 1, 20),    # above the shape
+        ]
+        assert test_shape.contains(points).tolist() == [
+            True, True, False, False, False]
+
+        test_shape.rotation_angle = 360
+        assert test_shape.contains(points).tolist() == [
+            True, True, True, False, False]
+
+        test_shape = paramak.ExtrudeStraightShape(
+            points=[(10, -10), (20, -10), (20, 10), (10, 10)],
+            distance=10)
+
+        assert test_shape.contains(
+            [(15, 0, 0), (15, 10, 0), (25, 0, 0)]).tolist() == [
+            True, False, False]
+
+    def test_check_mesh(self):
+        """Triangulates a shape and checks the mesh is watertight and encloses
+        the volume of the shape."""
+
+        test_shape = paramak.RotateStraightShape(
+            points=[(10, -10), (20, -10), (20, 10), (10, 10)],
+            rotation_angle=180)
+
+        report = test_shape.check_mesh(tolerance=0.01)
+
+        assert report["watertight"] is True
+        assert report["number_of_inconsistent_edges"] == 0
+        assert report["valid"] is True
+
+    def test_points_of_other_number_types(self):
+        """Sets the points of a shape with python number types that are not
+        int or float and checks they are accepted as before, while strings
+        are still rejected."""
+
+        test_shape = paramak.RotateStraightShape(
+            points=[(Decimal(10), 0), (20, 0), (20, 10)])
+
+        assert test_shape.points == [
+            (10, 0, "straight"),
+            (20, 0, "straight"),
+            (20, 10, "straight"),
+            (10, 0, "straight"),
+        ]
+        assert test_shape.point_coordinates.dtype == float
+
+        test_shape.points = np.array(
+            [[Decimal(10), 0], [20, 0], [20, 10]], dtype=object)
+        assert test_shape.point_coordinates.tolist() == [
+            [10, 0], [20, 0], [20, 10], [10, 0]]
+
+        def string_point_value():
+            test_shape.points = [("10", 0), (20, 0), (20, 10)]
+
+        self.assertRaises(ValueError, string_point_value)
+
+    def test_points_list_is_built_when_read(self):
+        """Sets the points of a shape with an array and checks the list of
+        tuples view is only built when the points are read, and that the
+        solid is rebuilt when the points change."""
+
+        test_shape = paramak.RotateStraightShape(
+            points=np.array([[0, 0], [0, 20], [20, 20], [20, 0]]))
+
+        assert test_shape._points is None
+        assert test_shape.volume == pytest.approx(math.pi * 20**2 * 20)
+
+        test_shape.points = np.array([[0, 0], [0, 10], [20, 10], [20, 0]])
+        assert test_shape._points is None
+        assert test_shape.volume == pytest.approx(math.pi * 20**2 * 10)
+        assert test_shape.points[1] == (0, 10, "straight")
+
     def test_create_limits(self):
         """Creates a Shape object and checks that the create_limits function
         returns the expected values for x_min, x_max, z_min and z_max."""
@@ -805,6 +948,24 @@ class TestShape(unittest.TestCase):
         self.my_shape.export_vtk(filename='suffixless_filename')
         assert Path('suffixless_filename.vtk').is_file
 
+    def test_export_vtm(self):
+        """Creates a vtm file directly from the triangulated shape and checks
+        the file exists"""
+
+        os.system('rm -r shape shape.vtm')
+
+        self.my_shape.export_vtm()
+        assert Path('shape.vtm').is_file()
+        assert Path('shape/block_0.vtu').is_file()
+
+    def test_export_glb(self):
+        """Creates a glb file of the shape and checks the file exists"""
+
+        os.system('rm shape.glb')
+
+        self.my_shape.export_glb()
+        assert Path('shape.glb').is_file()
+
     def test_export_vtk_without_h5m_raises_error(self):
         """exports a h5m file when shapes_and_components is set to a string"""
 
@@ -0,0 +1,92 @@
+
+import unittest
+
+import numpy as np
+import pytest
+from paramak.bounding_volume_hierarchy import (BoundingVolumeHierarchy,
+                                               morton_codes)
+
+
+def cube_triangles(lower, upper):
+    """Finds the vertices and outward facing triangles of a box"""
+
+    vertices = np.array(
+        [[x, y, z] for x in (lower[0], upper[0]) for y in (lower[1], upper[1])
+         for z in (lower[2], upper[2])], dtype=float)
+    triangles = np.array([
+        [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5],
+        [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],
+        [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]])
+    return vertices, triangles
+
+
+class TestBoundingVolumeHierarchy(unittest.TestCase):
+
+    def setUp(self):
+        # two unit boxes along the x axis
+        vertices_a, triangles_a = cube_triangles((0, 0, 0), (1, 1, 1))
+        vertices_b, triangles_b = cube_triangles((3, 0, 0), (4, 1, 1))
+        self.vertices = np.concatenate((vertices_a, vertices_b))
+        self.triangles = np.concatenate((triangles_a, triangles_b + 8))
+        self.test_hierarchy = BoundingVolumeHierarchy(
+            self.vertices, self.triangles, leaf_size=2)
+
+    def test_morton_codes(self):
+        """Checks that nearby points have nearby Morton codes and that the
+        codes of the corners of a cube are ordered along the Morton curve"""
+
+        corners = [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+        codes = morton_codes(corners)
+        assert codes.tolist() == sorted(codes.tolist())
+        assert codes[0] == 0
+        assert codes[-1] == 2 ** 30 - 1
+
+    def test_cast_rays(self):
+        """Casts rays at the boxes and checks the first triangle hit, including
+        rays that start inside a box, rays along box faces and rays that
+        miss"""
+
+        distances, triangle_indices = self.test_hierarchy.cast_rays(
+            origins=[[-1, 0.5, 0.5], [2, 0.5, 0.5], [0.5, 0.5, 0.5],
+                     [-1, 0, 0.5], [-1, 2, 0.5], [5, 0.5, 0.5]],
+            directions=[[1, 0, 0], [1, 0, 0], [0, 0, 1], [1, 0, 0],
+                        [1, 0, 0], [1, 0, 0]])
+
+        assert distances[:4] == pytest.approx([1, 1, 0.5, 1])
+        assert np.all(np.isinf(distances[4:]))
+        assert triangle_indices[4:].tolist() == [-1, -1]
+        # the second ray hits the -x face of the second box
+        assert self.vertices[self.triangles[triangle_indices[1]], 0] == \
+            pytest.approx([3, 3, 3])
+
+        distances, _ = self.test_hierarchy.cast_rays(
+            origins=[-1, 0.5, 0.5], directions=[1, 0, 0], max_distance=0.5)
+        assert np.isinf(distances[0])
+
+    def test_cast_rays_in_parallel(self):
+        """Casts random rays in chunks in parallel and checks the distances
+        match testing every triangle against every ray"""
+
+        rng = np.random.default_rng(1)
+        origins = rng.uniform(-2, 6, (500, 3))
+        directions = rng.normal(size=(500, 3))
+
+        distances, _ = self.test_hierarchy.cast_rays(
+            origins, directions, chunk_size=100, parallel=True)
+
+        all_triangles = np.tile(np.arange(len(self.triangles)), len(origins))
+        all_distances = self.test_hierarchy._triangles_hit(
+            np.repeat(origins, len(self.triangles), axis=0),
+            np.repeat(directions, len(self.triangles), axis=0),
+            all_triangles).reshape(len(origins), -1).min(axis=1)
+
+        assert distances == pytest.approx(all_distances)
+
+    def test_incorrect_leaf_size(self):
+        """Checks that an error is raised when the leaf_size is not a
+        positive integer"""
+
+        def incorrect_leaf_size():
+            BoundingVolumeHierarchy(self.vertices, self.triangles, leaf_size=0)
+
+        self.assertRaises(ValueError, incorrect_leaf_size)
@@ -0,0 +1,189 @@
+
+import math
+import unittest
+
+import numpy as np
+import pytest
+from paramak.geometry_2d import (circle_centres, distances, extend_points,
+                                 line_coefficients, offset_curve,
+                                 point_segment_distances, points_in_polygon,
+                                 polygon_clearance, polygon_overlap_area,
+                                 rectilinear_rectangles, rotate_points)
+from paramak.utils import rotate
+
+
+class TestGeometry2D(unittest.TestCase):
+
+    def test_rotate_points(self):
+        """Rotates many points about an origin in one call and checks they
+        match the points rotated one at a time"""
+
+        points = np.array([[1, 0], [2, 0], [3, 4]])
+        angles = np.array([math.pi / 2, math.pi, 0.3])
+
+        rotated = rotate_points((1, 1), points, angles)
+
+        assert rotated.shape == (3, 2)
+        for point, angle, rotated_point in zip(points, angles, rotated):
+            assert rotated_point == pytest.approx(rotate((1, 1), point, angle))
+        assert rotated[0] == pytest.approx((2, 1))
+
+        # one point rotated by many angles
+        rotated = rotate_points((0, 0), (1, 0), np.radians([0, 90, 180]))
+        assert rotated == pytest.approx(np.array([[1, 0], [0, 1], [-1, 0]]))
+
+    def test_distances_and_extend_points(self):
+        """Finds distances between pairs of points and extends lines between
+        pairs of points"""
+
+        points_a = np.array([[0, 0], [1, 1]])
+        points_b = np.array([[3, 4], [1, 3]])
+
+        assert distances(points_a, points_b) == pytest.approx([5, 2])
+
+        extended = extend_points(points_a, points_b, [10, -1])
+        assert extended == pytest.approx(np.array([[6, 8], [1, 0]]))
+
+    def test_line_coefficients(self):
+        """Finds the gradients and intercepts of lines including a vertical
+        line"""
+
+        gradients, intercepts = line_coefficients(
+            [[0, 1], [1, 1], [2, 0]], [[1, 3], [2, 1], [2, 5]])
+
+        assert gradients[:2] == pytest.approx([2, 0])
+        assert intercepts[:2] == pytest.approx([1, 1])
+        assert gradients[2] == np.inf
+        assert np.isnan(intercepts[2])
+
+    def test_circle_centres(self):
+        """Finds the centres and radii of circles through sets of three
+        points including a set of collinear points"""
+
+        centres, radii = circle_centres(
+            [[10, 0], [0, 0]], [[0, 10], [1, 1]], [[-10, 0], [2, 2]])
+
+        assert centres[0] == pytest.approx((0, 0))
+        assert radii[0] == pytest.approx(10)
+        assert np.all(np.isnan(centres[1]))
+        assert radii[1] == np.inf
+
+    def test_offset_curve(self):
+        """Offsets straight lines and a circular arc and checks the offset
+        points against offsets found by hand"""
+
+        # a horizontal line travelling towards +x is offset upwards and the
+        # last point is not offset
+        offset_points = offset_curve([0, 1, 2, 3], [0, 0, 0, 0], thickness=2)
+        assert offset_points == pytest.approx(
+            np.array([[0, 2], [1, 2], [2, 2]]))
+
+        # a diagonal line travelling towards -x is offset towards -y
+        offset_points = offset_curve(
+            [4, 3, 2, 1, 0], [4, 3, 2, 1, 0], thickness=math.sqrt(2))
+        assert offset_points == pytest.approx(
+            np.array([[5, 3], [4, 2], [3, 1], [2, 0]]))
+
+        # an anticlockwise arc travels towards -x over the top of the circle
+        # so it is offset towards the centre, which shrinks the radius
+        angles = np.linspace(0.1, math.pi - 0.1, 20)
+        x, y = 10 * np.cos(angles), 10 * np.sin(angles)
+        offset_points = offset_curve(
+            x, y, thickness=2, gradients=-1 / np.tan(angles))
+        assert offset_points.shape == (20, 2)
+        assert offset_points == pytest.approx(
+            8 * np.column_stack((np.cos(angles), np.sin(angles))))
+
+    def test_points_in_polygon(self):
+        """Finds which points are inside a square, an L shaped polygon in
+        either direction and a self intersecting polygon"""
+
+        points = np.array(
+            [[0.5, 0.5], [1.5, 0.5], [0.5, 1.5], [1.5, 1.5], [-1, 0.5]])
+
+        square = [[0, 0], [2, 0], [2, 2], [0, 2]]
+        assert points_in_polygon(points, square).tolist() == [
+            True, True, True, True, False]
+
+        l_shape = [[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2], [0, 0]]
+        assert points_in_polygon(points, l_shape).tolist() == [
+            True, True, True, False, False]
+        assert points_in_polygon(points, l_shape[::-1]).tolist() == [
+            True, True, True, False, False]
+
+        # a figure of eight made of two triangles meeting at (1, 1)
+        figure_of_eight = [[0, 0], [2, 2], [2, 0], [0, 2]]
+        assert points_in_polygon(
+            [[1, 0.5], [1, 1.5], [0.5, 1], [1.5, 1]],
+            figure_of_eight).tolist() == [False, False, True, True]
+
+    def test_rectilinear_rectangles(self):
+        """Splits an L shaped polygon and a C shaped polygon into rectangles
+        that cover the same area"""
+
+        l_shape = [[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2]]
+        assert rectilinear_rectangles(l_shape).tolist() == [
+            [0, 1, 1, 2], [0, 2, 0, 1]]
+
+        # the inner and outer edges of a vacuum vessel profile
+        c_shape = [[0, 2], [3, 2], [3, -2], [0, -2], [0, -3], [5, -3],
+                   [5, 3], [0, 3], [0, 2]]
+        rectangles = rectilinear_rectangles(c_shape)
+        assert rectangles.tolist() == [
+            [0, 5, -3, -2], [0, 5, 2, 3], [3, 5, -2, 2]]
+        areas = (rectangles[:, 1] - rectangles[:, 0]) * \
+            (rectangles[:, 3] - rectangles[:, 2])
+        assert areas.sum() == pytest.approx(5 * 6 - 3 * 4)
+
+    def test_point_segment_distances(self):
+        """Finds the distances between points and segments, including a point
+        beyond the end of a segment and a zero length segment"""
+
+        assert point_segment_distances(
+            [[0, 1], [3, 4]], [[-1, 0], [2, 2]], [[1, 0], [2, 2]]) == \
+            pytest.approx(np.array([[1, math.hypot(2, 1)],
+                                    [math.hypot(2, 4), math.hypot(1, 2)]]))
+
+    def test_polygon_overlap_area(self):
+        """Finds the overlap areas of squares, an L shaped polygon and two
+        circles, including polygons that only touch and nested polygons"""
+
+        square = [[0, 0], [2, 0], [2, 2], [0, 2]]
+
+        assert polygon_overlap_area(
+            square, [[1, 1], [3, 1], [3, 3], [1, 3]]) == pytest.approx(1)
+        # touching along an edge in opposite directions
+        assert polygon_overlap_area(
+            square, [[2, 0], [3, 0], [3, 2], [2, 2]]) == 0
+        # sharing edges in the same direction and nested
+        assert polygon_overlap_area(
+            square, [[0, 0], [1, 0], [1, 2], [0, 2]]) == pytest.approx(2)
+        assert polygon_overlap_area(square, square[::-1]) == pytest.approx(4)
+
+        l_shape = [[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2]]
+        assert polygon_overlap_area(
+            l_shape, [[0.5, 0.5], [1.5, 0.5], [1.5, 1.5], [0.5, 1.5]]) == \
+            pytest.approx(0.75)
+
+        angles = np.linspace(0, 2 * math.pi, 1000, endpoint=False)
+        circle = np.column_stack((np.cos(angles), np.sin(angles)))
+        lens_area = 2 * math.acos(0.5) - math.sqrt(3) / 2
+        assert polygon_overlap_area(circle, circle + (1, 0)) == \
+            pytest.approx(lens_area, rel=1e-4)
+
+    def test_polygon_clearance(self):
+        """Finds the smallest distance between the edges of separate, touching
+        and crossing polygons"""
+
+        square = [[0, 0], [2, 0], [2, 2], [0, 2]]
+
+        assert polygon_clearance(
+            square, [[3, 3], [4, 3], [4, 4], [3, 4]]) == \
+            pytest.approx(math.sqrt(2))
+        # the nearest point of the triangle is in the middle of an edge
+        assert polygon_clearance(
+            square, [[1, 3], [3, 5], [-1, 5]]) == pytest.approx(1)
+        assert polygon_clearance(
+            square, [[2, 1], [3, 1], [3, 3], [2, 3]]) == 0
+        assert polygon_clearance(
+            square, [[1, 1], [3, 1], [3, 3], [1, 3]]) == 0
@@ -3,6 +3,7 @@ import unittest
 
 import paramak
 import pytest
+from paramak.utils import get_cq_shape
 
 
 class TestCoolantChannelRingCurved(unittest.TestCase):
@@ -57,3 +58,22 @@ class TestCoolantChannelRingCurved(unittest.TestCase):
         assert self.test_shape.azimuth_placement_angle == [
             10, 70, 130, 190, 250, 310
         ]
+
+    def test_many_channels_volume(self):
+        """Creates a CoolantChannelRingCurved with many clear channels and
+        checks that the volume scales with the number of channels."""
+
+        self.test_shape.channel_radius = 1
+        self.test_shape.number_of_coolant_channels = 3
+        test_volume = self.test_shape.volume
+
+        self.test_shape.number_of_coolant_channels = 120
+
+        assert self.test_shape.radius == 1
+        assert self.test_shape.channels_are_disjoint() is True
+        assert len(get_cq_shape(self.test_shape.solid).Solids()) == 120
+        assert self.test_shape.volume == pytest.approx(test_volume * 40)
+
+        # channels of the original radius would overlap so they are fused
+        self.test_shape.channel_radius = 10
+        assert self.test_shape.channels_are_disjoint() is False
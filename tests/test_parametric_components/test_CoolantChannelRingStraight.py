@@ -4,6 +4,7 @@ import unittest
 
 import paramak
 import pytest
+from paramak.utils import get_cq_shape
 
 
 class TestCoolantChannelRingStraight(unittest.TestCase):
@@ -67,3 +68,25 @@ class TestCoolantChannelRingStraight(unittest.TestCase):
         assert self.test_shape.azimuth_placement_angle == [
             10, 55, 100, 145, 190, 235, 280, 325
         ]
+
+    def test_many_channels_volume(self):
+        """Creates a CoolantChannelRingStraight with many clear channels and
+        checks that the channels are gathered into a compound with the
+        correct volume, and that touching channels are fused together."""
+
+        self.test_shape.workplane = "XY"
+        self.test_shape.rotation_axis = "Z"
+        self.test_shape.channel_radius = 1
+        self.test_shape.number_of_coolant_channels = 150
+
+        assert self.test_shape.radius == 1
+        assert self.test_shape.channels_are_disjoint() is True
+        assert len(get_cq_shape(self.test_shape.solid).Solids()) == 150
+        assert self.test_shape.volume == pytest.approx(
+            math.pi * (1 ** 2) * 100 * 150)
+
+        self.test_shape.channel_radius = 10
+        self.test_shape.number_of_coolant_channels = 30
+
+        assert self.test_shape.channels_are_disjoint() is False
+        assert self.test_shape.volume < math.pi * (10 ** 2) * 100 * 30
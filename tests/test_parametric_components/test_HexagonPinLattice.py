@@ -0,0 +1,127 @@
+
+import math
+import os
+import unittest
+from pathlib import Path
+
+import paramak
+import pytest
+from OCP.BRep import BRep_Tool
+from OCP.TopLoc import TopLoc_Location
+from paramak.utils import get_cq_shape, read_stl
+
+
+class TestHexagonPinLattice(unittest.TestCase):
+
+    def setUp(self):
+        self.test_shape = paramak.HexagonPinLattice(
+            length_of_side=5, distance=42., pitch=10, number_of_rings=3)
+
+    def test_setting_parameters(self):
+        """Checks that the default parameters and user parameters are set"""
+
+        assert self.test_shape.length_of_side == 5
+        assert self.test_shape.distance == 42.
+        assert self.test_shape.pitch == 10
+        assert self.test_shape.number_of_rings == 3
+        assert self.test_shape.center_point == (0, 0)
+        assert self.test_shape.stp_filename == "HexagonPinLattice.stp"
+        assert self.test_shape.stl_filename == "HexagonPinLattice.stl"
+        assert self.test_shape.name == "hexagon_pin_lattice"
+        assert self.test_shape.material_tag == "hexagon_pin_mat"
+
+    def test_pin_centers(self):
+        """Checks the number of pins in each ring and that neighbouring pins
+        are one pitch apart"""
+
+        for rings in [1, 2, 3, 6]:
+            self.test_shape.number_of_rings = rings
+            assert len(self.test_shape.pin_centers) == 1 + 3 * rings * (
+                rings - 1)
+
+        self.test_shape.center_point = (100, 20)
+        centers = self.test_shape.pin_centers
+        assert centers[0] == (100, 20)
+        for center in centers[1:7]:
+            assert math.hypot(
+                center[0] - 100, center[1] - 20) == pytest.approx(10)
+        assert len(set((round(x, 6), round(y, 6)) for x, y in centers)) == \
+            len(centers)
+
+    def test_volume(self):
+        """Checks the volume of the lattice is the volume of a pin multiplied
+        by the number of pins"""
+
+        hexagon_face_area = (3 * math.sqrt(3) / 2) * math.pow(5, 2)
+
+        solids = get_cq_shape(self.test_shape.solid).Solids()
+
+        assert len(solids) == 19
+        for solid in solids:
+            assert solid.Volume() == pytest.approx(hexagon_face_area * 42.)
+        assert self.test_shape.volume == pytest.approx(
+            hexagon_face_area * 42. * 19)
+
+    def test_pins_are_instances_of_one_solid(self):
+        """Checks that the pins share the geometry of a single pin"""
+
+        solids = self.test_shape.solid.val().Solids()
+
+        assert len(solids) == 19
+        for solid in solids[1:]:
+            assert solid.wrapped.IsPartner(solids[0].wrapped)
+
+    def test_export_stp(self):
+        """Exports the lattice as an stp assembly and checks the file holds
+        one pin solid that is referenced at each of the 19 pin locations"""
+
+        os.system("rm test_hexagon_pin_lattice.stp")
+        self.test_shape.export_stp("test_hexagon_pin_lattice.stp")
+        assert Path("test_hexagon_pin_lattice.stp").exists() is True
+
+        with open("test_hexagon_pin_lattice.stp") as stp_file:
+            contents = stp_file.read()
+        assert contents.count("MANIFOLD_SOLID_BREP") == 1
+        assert contents.count("NEXT_ASSEMBLY_USAGE_OCCURRENCE") == 19
+        os.system("rm test_hexagon_pin_lattice.stp")
+
+    def test_export_stl_reuses_pin_triangulation(self):
+        """Exports the lattice as an stl file, as the pymoab route of the h5m
+        export does, and checks that every pin face shares the triangulation
+        of the matching face of the central pin"""
+
+        os.system("rm test_hexagon_pin_lattice.stl")
+        self.test_shape.export_stl("test_hexagon_pin_lattice.stl")
+
+        solids = get_cq_shape(self.test_shape.solid).Solids()
+        pin_triangulations = [
+            [BRep_Tool.Triangulation_s(face.wrapped, TopLoc_Location())
+             for face in solid.Faces()]
+            for solid in solids
+        ]
+        for triangulations in pin_triangulations:
+            assert len(triangulations) == 8
+            for triangulation, central_triangulation in zip(
+                    triangulations, pin_triangulations[0]):
+                assert triangulation is not None
+                assert triangulation is central_triangulation
+
+        pin_triangles = sum(
+            t.NbTriangles() for t in pin_triangulations[0])
+        _, triangles = read_stl("test_hexagon_pin_lattice.stl")
+        assert len(triangles) == 19 * pin_triangles
+        os.system("rm test_hexagon_pin_lattice.stl")
+
+    def test_incorrect_arguments(self):
+        """Checks that ValueErrors are raised for a pitch that would overlap
+        the pins and for an invalid number of rings"""
+
+        def overlapping_pins():
+            self.test_shape.pitch = 8
+            self.test_shape.solid
+
+        def incorrect_number_of_rings():
+            self.test_shape.number_of_rings = 0
+
+        self.assertRaises(ValueError, overlapping_pins)
+        self.assertRaises(ValueError, incorrect_number_of_rings)
@@ -4,6 +4,7 @@ import unittest
 import pytest
 from pathlib import Path
 
+import numpy as np
 import paramak
 
 
@@ -232,3 +233,90 @@ class TestPlasma(unittest.TestCase):
         test_plasma_volume = test_plasma.volume
         test_plasma.rotation_angle = 180
         assert test_plasma.volume == pytest.approx(test_plasma_volume * 0.5)
+
+    def test_plasma_simplification_tolerance(self):
+        """Creates plasmas with many points and checks that points are only
+        removed when a simplification_tolerance is set, and that the
+        simplified plasma has a similar volume"""
+
+        test_plasma = paramak.Plasma(num_points=400)
+        test_plasma_volume = test_plasma.volume
+
+        assert len(test_plasma.points) == 401
+        assert test_plasma.number_of_removed_points == 0
+
+        test_plasma.simplification_tolerance = 0.5
+
+        assert test_plasma.number_of_removed_points > 300
+        assert len(test_plasma.points) == \
+            401 - test_plasma.number_of_removed_points
+        assert test_plasma.volume == pytest.approx(
+            test_plasma_volume, rel=0.01)
+
+        def negative_simplification_tolerance():
+            test_plasma.simplification_tolerance = -1
+
+        self.assertRaises(ValueError, negative_simplification_tolerance)
+
+    def test_plasma_simplification_tolerance_of_spline(self):
+        """Simplifies the points of a plasma with a large tolerance and checks
+        that every original point is within the tolerance of the spline
+        through the kept points, not just of the polyline through them"""
+
+        test_plasma = paramak.Plasma(num_points=400)
+        original_points = np.array(test_plasma.points)[:-1, :2].astype(float)
+
+        for tolerance in [2, 20, 60]:
+            test_plasma.simplification_tolerance = tolerance
+            spline = paramak.utils.facet_points(
+                test_plasma.points, tolerance=0.01)
+            deviations = paramak.geometry_2d.point_segment_distances(
+                original_points, spline[:-1], spline[1:]).min(axis=1)
+
+            assert test_plasma.number_of_removed_points > 0
+            assert deviations.max() <= tolerance
+
+    def test_sample_source_positions(self):
+        """Samples source positions in a plasma revolved in two sectors and
+        checks they are inside the plasma and sectors, and that the weights
+        of the emissivity profile are largest near the plasma center"""
+
+        os.system("rm plasma_source.npz")
+
+        test_plasma = paramak.Plasma(
+            rotation_angle=90, azimuth_placement_angle=[0, 180])
+
+        positions, weights = test_plasma.sample_source_positions(
+            10000, emissivity_exponent=2, seed=1,
+            filename="plasma_source.npz")
+
+        assert positions.shape == (10000, 3)
+        assert weights.sum() == pytest.approx(1)
+        assert test_plasma.contains(positions).all()
+        azimuths = np.degrees(np.arctan2(positions[:, 1], positions[:, 0]))
+        assert np.all((azimuths % 360 <= 90) | (azimuths % 360 >= 180))
+        distances_to_center = np.hypot(
+            np.hypot(positions[:, 0], positions[:, 1]) - 450, positions[:, 2])
+        assert distances_to_center[np.argmax(weights)] < 50
+
+        saved = np.load("plasma_source.npz")
+        assert np.array_equal(saved["positions"], positions)
+
+        # the same seed samples the same positions with equal weights
+        same_positions, same_weights = test_plasma.sample_source_positions(
+            10000, seed=1)
+        assert np.array_equal(same_positions, positions)
+        assert same_weights == pytest.approx(1 / 10000)
+        os.system("rm plasma_source.npz")
+
+    def test_sample_source_positions_number_of_samples(self):
+        """Checks that an error is raised when the number of source positions
+        to sample is not a positive integer"""
+
+        test_plasma = paramak.Plasma()
+
+        for number_of_samples in [0, -1, 2.5, True]:
+            self.assertRaises(
+                ValueError,
+                test_plasma.sample_source_positions,
+                number_of_samples)
@@ -134,3 +134,11 @@ class TestPoloidalFieldCoilSet(unittest.TestCase):
             ValueError,
             make_PoloidalFieldCoilSet_incorrect_width_length
         )
+
+    def test_contains(self):
+        """Checks that points inside each coil are inside the
+        PoloidalFieldCoilSet and points between the coils are not."""
+
+        assert self.test_shape.contains(
+            [(100, 0, 100), (0, 205, 200), (150, 0, 150),
+             (300, 0, 200)]).tolist() == [True, True, False, False]
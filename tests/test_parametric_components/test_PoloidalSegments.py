@@ -1,7 +1,11 @@
 
+import math
+import os
 import unittest
 
+import numpy as np
 import paramak
+import pytest
 
 
 class TestPoloidalSegments(unittest.TestCase):
@@ -96,3 +100,94 @@ class TestPoloidalSegments(unittest.TestCase):
         )
 
         assert test_shape.solid is not None
+
+    def test_segment_volumes_sum_to_shape_volume(self):
+        """Segments a ring and checks that the volumes of the segments add up
+        to the volume of the ring and are equal in size."""
+
+        test_shape_to_segment = paramak.PoloidalFieldCoil(
+            height=100,
+            width=100,
+            center_point=(500, 500)
+        )
+
+        test_shape = paramak.PoloidalSegments(
+            shape_to_segment=test_shape_to_segment,
+            center_point=(500, 500),
+            number_of_segments=4,
+        )
+
+        volumes = [solid.Volume() for solid in test_shape.solid.Solids()]
+        assert sum(volumes) == pytest.approx(test_shape_to_segment.volume)
+        assert min(volumes) == pytest.approx(max(volumes), rel=0.2)
+
+    def test_segment_areas(self):
+        """Finds the areas and volumes of the segments of a ring from its
+        profile and checks they add up to the area and volume of the ring and
+        match the volumes of the segment solids."""
+
+        test_shape_to_segment = paramak.PoloidalFieldCoil(
+            height=100,
+            width=100,
+            center_point=(500, 500)
+        )
+
+        test_shape = paramak.PoloidalSegments(
+            shape_to_segment=test_shape_to_segment,
+            center_point=(500, 500),
+            number_of_segments=4,
+        )
+
+        table = test_shape.segment_areas()
+
+        assert table["segment"].tolist() == [0, 1, 2, 3]
+        assert table["end_angle"].tolist() == [90, 180, 270, 360]
+        assert table["area"].sum() == pytest.approx(test_shape_to_segment.area)
+        assert table["volume"].sum() == pytest.approx(
+            test_shape_to_segment.volume)
+        volumes = [solid.Volume() for solid in test_shape.solid.Solids()]
+        assert sorted(table["volume"]) == pytest.approx(sorted(volumes))
+        # the outside of the coil faces away from the center point
+        assert table["facing_area"].tolist() == [0, 0, 0, 0]
+
+    def test_segment_areas_of_first_wall(self):
+        """Finds the areas of a square first wall around the center point
+        that face the center point and exports them to CSV and npy files."""
+
+        os.system('rm segment_areas.csv segment_areas.npy')
+
+        # the outer and inner edges of the wall are joined by a thin slit
+        test_shape_to_segment = paramak.RotateStraightShape(
+            points=[(300, -300), (600, -300), (600, 300), (300, 300),
+                    (300, 0), (320, 0), (320, 280), (580, 280), (580, -280),
+                    (320, -280), (320, 0), (300, 0)])
+
+        test_shape = paramak.PoloidalSegments(
+            shape_to_segment=test_shape_to_segment,
+            center_point=(450, 0),
+            number_of_segments=8,
+        )
+
+        table = test_shape.segment_areas()
+
+        inner_area = 2 * math.pi * (
+            2 * 260 * 450 + 560 * 320 + 560 * 580)
+        assert table["facing_area"].sum() == pytest.approx(inner_area)
+        # the first segment faces the wall at r=580 from z=0 to z=130
+        assert table["facing_centroid_r"][0] == pytest.approx(580)
+        assert table["facing_centroid_z"][0] == pytest.approx(65)
+
+        assert test_shape.export_segment_areas() == 'segment_areas.csv'
+        saved = np.loadtxt('segment_areas.csv', delimiter=',', skiprows=1)
+        assert saved[:, 4] == pytest.approx(table["facing_area"])
+        test_shape.export_segment_areas('segment_areas.npy')
+        assert np.array_equal(np.load('segment_areas.npy'), table)
+        os.system('rm segment_areas.csv segment_areas.npy')
+
+    def test_segment_areas_without_shape_to_segment(self):
+        """Checks an error is raised when finding the segment areas without a
+        shape_to_segment."""
+
+        test_shape = paramak.PoloidalSegments(center_point=(500, 500))
+
+        self.assertRaises(ValueError, test_shape.segment_areas)
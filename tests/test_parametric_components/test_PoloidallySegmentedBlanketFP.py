@@ -1,7 +1,17 @@
 
+import math
 import unittest
 
+import numpy as np
 import paramak
+import pytest
+from paramak.parametric_components.blanket_poloidal_segment import (
+    compute_lengths_from_angles, segments_optimiser)
+
+
+def circle_distribution(theta):
+    """A picklable distribution of points on a circle of radius 100"""
+    return 100 * np.cos(np.radians(theta)), 100 * np.sin(np.radians(theta))
 
 
 class TestBlanketFP(unittest.TestCase):
@@ -128,3 +138,35 @@ class TestBlanketFP(unittest.TestCase):
             segments_gap=3
         )
         assert blanket.solid is not None
+
+    def test_compute_lengths_from_angles(self):
+        """Checks the lengths are the same for a distribution that accepts
+        arrays of angles and one that only accepts single angles"""
+
+        def scalar_distribution(theta):
+            return (100 * math.cos(math.radians(theta)),
+                    100 * math.sin(math.radians(theta)))
+
+        angles = [0, 90, 180]
+        lengths = compute_lengths_from_angles(angles, circle_distribution)
+        scalar_lengths = compute_lengths_from_angles(
+            angles, scalar_distribution)
+
+        assert lengths == pytest.approx([100 * 2 ** 0.5] * 2)
+        assert scalar_lengths == pytest.approx(lengths)
+
+    def test_segments_optimiser_in_process_pool(self):
+        """Optimises the segments with a process pool and checks that the
+        segment lengths are within the limits"""
+
+        angles = segments_optimiser(
+            length_limits=(50, 80),
+            nb_segments_limits=(2, 8),
+            distribution=circle_distribution,
+            angles=(0, 180),
+            max_workers=2)
+
+        lengths = compute_lengths_from_angles(angles, circle_distribution)
+        assert angles[0] == 0
+        assert angles[-1] == 180
+        assert all(50 <= length <= 80 for length in lengths)
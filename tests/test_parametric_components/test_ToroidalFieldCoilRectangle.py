@@ -166,6 +166,54 @@ class TestToroidalFieldCoilRectangle(unittest.TestCase):
         self.test_shape.rotation_angle = 180
         assert self.test_shape.volume == pytest.approx(test_volume * 0.5)
 
+    def test_sector_volume_with_many_coils(self):
+        """Creates tf coils in a 90 degree sector and checks that only the
+        coils within the sector remain and that the volume is a quarter of the
+        full volume."""
+
+        self.test_shape.number_of_coils = 8
+        self.test_shape.with_inner_leg = False
+
+        self.test_shape.rotation_angle = 360
+        test_volume = self.test_shape.volume
+        self.test_shape.rotation_angle = 90
+        assert self.test_shape.volume == pytest.approx(test_volume * 0.25)
+        assert len(self.test_shape.solid.val().Solids()) == 3
+
+    def test_csg_region(self):
+        """Finds the CSG region of a coil, which is the union of rectangles of
+        the profile between the planes either side of the coil, and of a set
+        of coils cut to a sector"""
+
+        surfaces = []
+        assert self.test_shape.csg_region(surfaces) == \
+            "((1 -2 ((3 -4 5 -6) | (3 -4 7 -8) | (9 -4 6 -7) | (3 -10 6 -7))))"
+        assert [surface["coefficients"]["d"] for surface in surfaces
+                if surface["type"] == "plane"] == [-15, 15, 100, 850, 800, 150]
+        assert [surface["coefficients"]["z0"] for surface in surfaces
+                if surface["type"] == "z-plane"] == [-750, -700, 700, 750]
+
+        self.test_shape.number_of_coils = 4
+        self.test_shape.rotation_angle = 90
+        surfaces = []
+        region = self.test_shape.csg_region(surfaces)
+
+        # the coil at 90 degrees is bounded by planes normal to the y axis
+        coil_planes = [surface["coefficients"] for surface in surfaces
+                       if surface["type"] == "plane"][6:12]
+        for coefficients in coil_planes[2:]:
+            assert coefficients["a"] == pytest.approx(0)
+            assert coefficients["b"] == pytest.approx(1)
+        # four rectangles for each of the four coils
+        assert region.count(" | (") == 4 * 4 - 1
+        assert region.endswith(" ((29 -30))")
+        assert len(surfaces) == 30
+
+        # boolean operations are left to DAGMC
+        self.test_shape.cut = paramak.RotateStraightShape(
+            points=[(0, -10), (20, -10), (20, 10), (0, 10)])
+        assert self.test_shape.csg_region(surfaces) is None
+
     def test_ToroidalFieldCoilRectangle_incorrect_horizonal_start_point(self):
         """Checks that an error is raised when a ToroidalFieldCoilRectangle is made
         with an incorrect horizontal_start_point."""
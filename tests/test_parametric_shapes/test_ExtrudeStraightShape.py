@@ -91,6 +91,21 @@ class TestExtrudeStraightShape(unittest.TestCase):
         assert self.test_shape.volume == pytest.approx(
             test_volume * 0.5, rel=0.01)
 
+    def test_rotation_angle_with_single_azimuth_placement_angle(self):
+        """Creates an ExtrudeStraightShape with a single non zero
+        azimuth_placement_angle and a rotation_angle < 360 and checks that the
+        sector is kept from the azimuth_placement_angle so the copy that
+        straddles the start of the sector is cut in half."""
+
+        test_shape = ExtrudeStraightShape(
+            points=[(100, 0), (100, 20), (120, 20), (120, 0)],
+            distance=20,
+            azimuth_placement_angle=180,
+            rotation_angle=90
+        )
+
+        assert test_shape.volume == pytest.approx(20 * 20 * 20 / 2)
+
     def test_extrude_both(self):
         """Creates an ExtrudeStraightShape with extrude_both = True and False and checks
         that the volumes are correct."""
@@ -1,5 +1,8 @@
 
+import asyncio
 import os
+import subprocess
+import sys
 import unittest
 from pathlib import Path
 
@@ -85,6 +88,50 @@ class TestUtilityFunctions(unittest.TestCase):
             missing_dagmc_not_watertight_file
         )
 
+    def test_run_job(self):
+        """Runs a job in its own working directory, then runs jobs that fail
+        and that take longer than the timeout"""
+
+        os.system('rm -r test_job')
+
+        result = paramak.utils.run_job(
+            [sys.executable, '-c', 'import os; print(os.getcwd())'],
+            working_directory='test_job',
+            verbose=False,
+        )
+
+        assert result.returncode == 0
+        assert Path(result.stdout.strip()) == Path('test_job').absolute()
+        assert Path('test_job/job.log').read_text() == result.stdout
+
+        def failing_job():
+            paramak.utils.run_job(
+                [sys.executable, '-c', 'raise SystemExit(3)'], verbose=False)
+        self.assertRaises(subprocess.CalledProcessError, failing_job)
+
+        def slow_job():
+            paramak.utils.run_job(
+                [sys.executable, '-c', 'import time; time.sleep(10)'],
+                timeout=0.5)
+        self.assertRaises(subprocess.TimeoutExpired, slow_job)
+
+    def test_run_jobs_concurrently(self):
+        """Runs several jobs with a pool of threads and with asyncio and
+        checks each job has its own working directory"""
+
+        command = [sys.executable, '-c', 'import os; print(os.getcwd())']
+
+        results = paramak.utils.run_jobs([command] * 3, verbose=False)
+        assert len({result.stdout for result in results}) == 3
+
+        async def run_async_jobs():
+            return await asyncio.gather(*[
+                paramak.utils.run_job_async(command, verbose=False)
+                for _ in range(3)])
+
+        results = asyncio.run(run_async_jobs())
+        assert len({result.stdout for result in results}) == 3
+
     def test_moab_instance_creation(self):
         """passes three points on a circle to the function and checks that the
         radius and center of the circle is calculated correctly"""
@@ -263,6 +310,370 @@ class TestUtilityFunctions(unittest.TestCase):
             point_a, point_b, point_3) == (
             None, np.inf)
 
+    def test_tessellate_solid(self):
+        """Tessellates a solid and checks the arrays returned have the correct
+        shapes and that a finer tolerance produces more triangles"""
+
+        test_shape = paramak.RotateStraightShape(
+            points=[(10, 0), (10, 20), (20, 20), (20, 0)])
+
+        # a large angular_tolerance leaves the linear tolerance to decide
+        # the size of the triangles
+        vertices, triangles = paramak.utils.tessellate_solid(
+            test_shape.solid, tolerance=1, angular_tolerance=1)
+
+        assert vertices.shape[1] == 3
+        assert triangles.shape[1] == 3
+        assert triangles.max() < len(vertices)
+
+        _, finer_triangles = paramak.utils.tessellate_solid(
+            test_shape.solid, tolerance=0.01, angular_tolerance=1)
+
+        assert len(finer_triangles) > len(triangles)
+
+    def test_find_adaptive_faceting_tolerances_without_targets(self):
+        """Checks that a ValueError is raised if neither a triangle_budget or
+        relative_tolerance are provided"""
+
+        test_shape = paramak.RotateStraightShape(
+            points=[(10, 0), (10, 20), (20, 20), (20, 0)])
+
+        def no_targets():
+            paramak.utils.find_adaptive_faceting_tolerances(
+                solids=[test_shape.solid])
+
+        self.assertRaises(ValueError, no_targets)
+
+    def test_export_vtm(self):
+        """Writes two triangulated blocks to a vtm file and checks the vtm
+        file and the binary vtu files for each block are produced"""
+
+        os.system('rm -r test_blocks test_blocks.vtm')
+
+        vertices = np.array(
+            [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+        triangles = np.array([[0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]])
+        blocks = [
+            {"name": "first", "material_tag": "mat1",
+             "vertices": vertices, "triangles": triangles},
+            {"name": "second", "material_tag": "mat2",
+             "vertices": vertices + 2, "triangles": triangles},
+        ]
+
+        filename = paramak.utils.export_vtm(
+            blocks=blocks, filename='test_blocks', parallel=True)
+
+        assert filename == 'test_blocks.vtm'
+        assert Path('test_blocks.vtm').is_file()
+        assert Path('test_blocks/block_0.vtu').is_file()
+        assert Path('test_blocks/block_1.vtu').is_file()
+        assert 'name="second"' in Path('test_blocks.vtm').read_text()
+        assert b'Name="material_id"' in Path(
+            'test_blocks/block_1.vtu').read_bytes()
+
+    def test_write_vtu_with_incorrect_cell_data(self):
+        """Checks that a ValueError is raised if the cell_data does not have
+        one value per triangle"""
+
+        def incorrect_cell_data():
+            paramak.utils.write_vtu(
+                filename='incorrect.vtu',
+                vertices=np.zeros((3, 3)),
+                triangles=np.array([[0, 1, 2]]),
+                cell_data={"material_id": np.array([1, 2])})
+
+        self.assertRaises(ValueError, incorrect_cell_data)
+
+    def test_deduplicate_vertices(self):
+        """Checks that repeated vertices are merged and that triangles which
+        become degenerate are removed"""
+
+        vertices = np.array(
+            [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1e-4, 0]], dtype=float)
+        triangles = np.array([[0, 1, 2], [1, 3, 2]])
+
+        new_vertices, new_triangles = paramak.utils.deduplicate_vertices(
+            vertices, triangles)
+        assert len(new_vertices) == 4
+        assert len(new_triangles) == 2
+
+        new_vertices, new_triangles = paramak.utils.deduplicate_vertices(
+            vertices, triangles, quantization=1e-2)
+        assert len(new_vertices) == 3
+        assert len(new_triangles) == 1
+
+    def test_tessellate_instances(self):
+        """Tessellates a shape with several azimuth_placement_angles and
+        checks that only one copy is triangulated and the others are placed
+        with transformation matrices"""
+
+        test_shape = paramak.ExtrudeStraightShape(
+            points=[(100, 0), (100, 20), (120, 20), (120, 0)],
+            distance=10,
+            azimuth_placement_angle=[0, 90, 180, 270])
+
+        instances = paramak.utils.tessellate_instances(
+            test_shape.solid,
+            rotation_axis=test_shape.get_rotation_axis()[0])
+
+        assert len(instances) == 1
+        assert len(instances[0]["matrices"]) == 4
+
+    def test_export_glb(self):
+        """Writes a mesh with two instances to a glb file and checks the file
+        starts with the glTF magic number"""
+
+        os.system('rm test_mesh.glb')
+
+        vertices = np.array(
+            [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+        triangles = np.array([[0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]])
+        meshes = [{
+            "name": "tetrahedron",
+            "color": (1, 0, 0),
+            "vertices": vertices,
+            "triangles": triangles,
+            "matrices": [np.eye(4), paramak.utils.rotation_matrix(90)],
+        }]
+
+        filename = paramak.utils.export_glb(meshes, filename='test_mesh')
+
+        assert filename == 'test_mesh.glb'
+        assert Path('test_mesh.glb').read_bytes()[:4] == b'glTF'
+
+    def test_facet_circular_arc(self):
+        """Facets a semicircle and checks the points lie on the circle and
+        start and end at the provided points"""
+
+        points = paramak.utils.facet_circular_arc(
+            (10, 0), (0, 10), (-10, 0), tolerance=1e-2)
+
+        assert points.shape[1] == 2
+        assert np.allclose(np.hypot(points[:, 0], points[:, 1]), 10)
+        assert np.allclose(points[0], (10, 0))
+        assert np.allclose(points[-1], (-10, 0))
+        assert all(points[:, 1] >= 0)
+
+        finer_points = paramak.utils.facet_circular_arc(
+            (10, 0), (0, 10), (-10, 0), tolerance=1e-4)
+        assert len(finer_points) > len(points)
+
+    def test_facet_circular_arcs(self):
+        """Facets several arcs in one call and checks the polylines against
+        the known circles, including an arc with collinear points"""
+
+        arcs = [
+            [(10, 0), (0, 10), (-10, 0)],
+            [(200, 0), (250, 50), (200, 100)],
+            [(0, 0), (1, 1), (2, 2)],
+        ]
+        centres = [(0, 0), (200, 50)]
+        radii = [10, 50]
+
+        polylines = paramak.utils.facet_circular_arcs(arcs, tolerance=1e-2)
+
+        assert len(polylines) == 3
+        for arc, polyline, centre, radius in zip(
+                arcs, polylines, centres, radii):
+            assert polyline[0] == pytest.approx(arc[0])
+            assert polyline[-1] == pytest.approx(arc[2])
+            # every point is on the circle
+            assert np.hypot(
+                polyline[:, 0] - centre[0],
+                polyline[:, 1] - centre[1]) == pytest.approx(radius)
+            # the middle of every chord is within the tolerance of the arc
+            middles = (polyline[1:] + polyline[:-1]) / 2
+            sagittas = radius - np.hypot(
+                middles[:, 0] - centre[0], middles[:, 1] - centre[1])
+            assert np.all(sagittas <= 1e-2)
+            assert np.all(sagittas >= 0)
+
+        # the arcs pass through the second point rather than the other way
+        assert np.all(polylines[0][:, 1] >= -1e-9)
+        assert np.all(polylines[1][:, 0] >= 200 - 1e-9)
+        assert np.allclose(polylines[2], arcs[2])
+
+    def test_facet_points(self):
+        """Facets points with straight, circle and spline connections and
+        checks the polyline is closed and has more points than the input"""
+
+        points = [
+            (100, 0, 'straight'),
+            (200, 0, 'circle'),
+            (250, 50, 'circle'),
+            (200, 100, 'spline'),
+            (150, 120, 'spline'),
+            (100, 100, 'straight'),
+            (100, 0, 'straight'),
+        ]
+
+        polyline = paramak.utils.facet_points(points, tolerance=1e-1)
+
+        assert polyline.shape[1] == 2
+        assert len(polyline) > len(points)
+        assert np.allclose(polyline[0], polyline[-1])
+
+    def test_simplify_polyline(self):
+        """Simplifies a faceted circle to a point budget and to a tolerance
+        and checks the first and last points are kept"""
+
+        angles = np.linspace(0, 2 * np.pi, 1001)
+        points = np.column_stack([np.cos(angles), np.sin(angles)])
+
+        indices = paramak.utils.simplify_polyline(points, max_points=20)
+        assert len(indices) == 20
+        assert indices[0] == 0
+        assert indices[-1] == 1000
+
+        indices = paramak.utils.simplify_polyline(points, tolerance=1e-2)
+        assert 10 < len(indices) < 100
+
+        def no_targets():
+            paramak.utils.simplify_polyline(points)
+
+        self.assertRaises(ValueError, no_targets)
+
+    def test_find_angular_extent(self):
+        """Finds the angular extent of solids either side of the X axis and
+        a solid around the Z axis"""
+
+        test_shape = paramak.ExtrudeStraightShape(
+            points=[(100, 0), (100, 20), (120, 20), (120, 0)],
+            distance=20)
+        start, end = paramak.utils.find_angular_extent(test_shape.solid)
+        assert start == pytest.approx(-5.71, abs=0.01)
+        assert end == pytest.approx(5.71, abs=0.01)
+
+        test_shape.azimuth_placement_angle = 180
+        start, end = paramak.utils.find_angular_extent(test_shape.solid)
+        assert start == pytest.approx(174.29, abs=0.01)
+        assert end == pytest.approx(185.71, abs=0.01)
+
+        test_shape = paramak.RotateStraightShape(
+            points=[(100, 0), (100, 20), (120, 20), (120, 0)])
+        assert paramak.utils.find_angular_extent(test_shape.solid) is None
+
+    def test_split_solid(self):
+        """Splits a solid between two cells which each cover part of it and
+        checks the parts inside each cell are returned"""
+
+        test_shape = paramak.ExtrudeStraightShape(
+            points=[(0, 0), (0, 20), (20, 20), (20, 0)],
+            distance=20)
+        left_cell = paramak.ExtrudeStraightShape(
+            points=[(-10, -10), (-10, 30), (10, 30), (10, -10)],
+            distance=40)
+        right_cell = paramak.ExtrudeStraightShape(
+            points=[(10, -10), (10, 30), (15, 30), (15, -10)],
+            distance=40)
+
+        parts = paramak.utils.split_solid(
+            test_shape.solid, [left_cell.solid, right_cell.solid])
+
+        assert len(parts) == 2
+        assert len(parts[0]) == 1
+        assert parts[0][0].Volume() == pytest.approx(10 * 20 * 20)
+        assert parts[1][0].Volume() == pytest.approx(5 * 20 * 20)
+
+    def test_hollow_cube_and_sector_wedge_triangles(self):
+        """Finds the triangles of a graveyard and a sector wedge and checks
+        the surfaces are closed and face outwards by checking every edge is
+        shared by two triangles in opposite directions and the enclosed
+        volumes are positive"""
+
+        def enclosed_volume(vertices, triangles):
+            corners = vertices[triangles]
+            edges = np.concatenate(
+                (triangles[:, [0, 1]], triangles[:, [1, 2]],
+                 triangles[:, [2, 0]]))
+            edges = set(map(tuple, edges))
+            assert len(edges) == 3 * len(triangles)
+            assert all((end, start) in edges for start, end in edges)
+            return np.einsum(
+                'ij,ij->i', corners[:, 0],
+                np.cross(corners[:, 1], corners[:, 2])).sum() / 6
+
+        vertices, triangles = paramak.utils.hollow_cube_triangles(
+            length=100, thickness=10)
+        assert triangles.shape == (24, 3)
+        assert enclosed_volume(vertices, triangles) == pytest.approx(
+            110**3 - 100**3)
+
+        vertices, triangles = paramak.utils.sector_wedge_triangles(
+            height=200, radius=50, start_angle=90, end_angle=360,
+            tolerance=0.1)
+        assert enclosed_volume(vertices, triangles) == pytest.approx(
+            np.pi * 50**2 * 200 * 0.75, rel=1e-2)
+        # no vertices are in the sector between 0 and 90 degrees
+        assert not np.any(
+            (vertices[:, 0] > 1e-9) & (vertices[:, 1] > 1e-9))
+
+    def test_check_mesh(self):
+        """Checks a closed mesh with unshared vertices, a mesh with a missing
+        triangle and a mesh with a flipped triangle"""
+
+        vertices, triangles = paramak.utils.hollow_cube_triangles(
+            length=100, thickness=10)
+
+        # each triangle with its own vertices as produced by tessellate_solid
+        unshared_vertices = vertices[triangles].reshape(-1, 3)
+        unshared_triangles = np.arange(len(unshared_vertices)).reshape(-1, 3)
+        report = paramak.utils.check_mesh(
+            unshared_vertices, unshared_triangles, volume=110**3 - 100**3)
+        assert report["watertight"] is True
+        assert report["valid"] is True
+        assert report["signed_volume"] == pytest.approx(110**3 - 100**3)
+
+        report = paramak.utils.check_mesh(vertices, triangles[1:])
+        assert report["number_of_open_edges"] == 3
+        assert report["watertight"] is False
+
+        flipped_triangles = triangles.copy()
+        flipped_triangles[0] = flipped_triangles[0, ::-1]
+        report = paramak.utils.check_mesh(vertices, flipped_triangles)
+        assert report["number_of_inconsistent_edges"] == 3
+        assert report["watertight"] is True
+        assert report["valid"] is False
+
+    def test_read_stl(self):
+        """Writes the triangles of a hollow cube to ascii and binary stl files
+        and checks the triangles read back enclose the volume of the cube"""
+
+        os.system("rm test_ascii.stl test_binary.stl")
+
+        vertices, triangles = paramak.utils.hollow_cube_triangles(
+            length=100, thickness=10)
+        corners = vertices[triangles]
+
+        with open("test_ascii.stl", "w") as stl_file:
+            stl_file.write("solid hollow_cube\n")
+            for triangle in corners:
+                stl_file.write("facet normal 0 0 0\nouter loop\n")
+                for vertex in triangle:
+                    stl_file.write("vertex {} {} {}\n".format(*vertex))
+                stl_file.write("endloop\nendfacet\n")
+            stl_file.write("endsolid hollow_cube\n")
+
+        records = np.zeros(len(corners), dtype=[
+            ("normal", "<f4", (3,)),
+            ("vertices", "<f4", (3, 3)),
+            ("attribute", "<u2")])
+        records["vertices"] = corners
+        with open("test_binary.stl", "wb") as stl_file:
+            stl_file.write(bytes(80))
+            stl_file.write(np.uint32(len(corners)).tobytes())
+            stl_file.write(records.tobytes())
+
+        for filename in ["test_ascii.stl", "test_binary.stl"]:
+            stl_vertices, stl_triangles = paramak.utils.read_stl(filename)
+            assert stl_triangles.shape == triangles.shape
+            assert stl_vertices[stl_triangles] == pytest.approx(corners)
+            report = paramak.utils.check_mesh(
+                stl_vertices, stl_triangles, volume=110**3 - 100**3)
+            assert report["valid"] is True
+
+        os.system("rm test_ascii.stl test_binary.stl")
+
     # these tests only work if trelis is avaialbe
     # def test_make_watertight_cmd(self):
     #     """exports a h5m and makes it watertight, checks the the watertight